@@ -0,0 +1,29 @@
+"""add_app_metadata
+
+Revision ID: 0a6c5023b598
+Revises: 589a3669f13f
+Create Date: 2026-10-18 21:48:09.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a6c5023b598'
+down_revision = '589a3669f13f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Marqueur d'initialisation lu au démarrage
+    op.create_table('app_metadata',
+        sa.Column('key', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.String(length=200), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('app_metadata')
@@ -0,0 +1,47 @@
+"""add_planning_hot_path_indexes
+
+Revision ID: 25adf966b305
+Revises: e5cc2ec752d7
+Create Date: 2026-10-18 10:03:17.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '25adf966b305'
+down_revision = 'e5cc2ec752d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Créneaux d'une semaine / d'un jour
+    op.create_index('ix_slots_week_day_start', 'slots', ['week_id', 'day_index', 'start_min'], unique=False)
+    
+    # Note d'une semaine
+    op.create_index(op.f('ix_notes_week_id'), 'notes', ['week_id'], unique=False)
+    
+    # Semaines d'un employé triées par date
+    op.create_index('ix_weeks_employee_start', 'weeks', ['employee_id', 'week_start_date'], unique=False)
+    
+    # Index partiel sur les employés actifs
+    op.create_index('ix_employees_active_id', 'employees', ['id'], unique=False,
+                    postgresql_where=sa.text('active = true'), sqlite_where=sa.text('active = 1'))
+    
+    # simple_slots est créée par create_all au démarrage : elle peut ne pas encore exister
+    if sa.inspect(op.get_bind()).has_table('simple_slots'):
+        op.create_index('ix_simple_slots_employee_date_start', 'simple_slots',
+                        ['employee_id', 'date', 'start_time'], unique=False)
+        op.create_index('ix_simple_slots_updated_at', 'simple_slots', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('simple_slots'):
+        op.drop_index('ix_simple_slots_updated_at', table_name='simple_slots')
+        op.drop_index('ix_simple_slots_employee_date_start', table_name='simple_slots')
+    op.drop_index('ix_employees_active_id', table_name='employees')
+    op.drop_index('ix_weeks_employee_start', table_name='weeks')
+    op.drop_index(op.f('ix_notes_week_id'), table_name='notes')
+    op.drop_index('ix_slots_week_day_start', table_name='slots')
@@ -0,0 +1,31 @@
+"""add_week_pagination_indexes
+
+Revision ID: 322cc8a7852a
+Revises: 0a6c5023b598
+Create Date: 2026-10-18 22:31:05.418273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '322cc8a7852a'
+down_revision = '0a6c5023b598'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Curseur (week_start_date, id) des semaines d'un employé
+    op.drop_index('ix_weeks_employee_start', table_name='weeks')
+    op.create_index('ix_weeks_employee_start', 'weeks', ['employee_id', 'week_start_date', 'id'], unique=False)
+    
+    # Curseur (week_start_date, id) sur toutes les semaines
+    op.create_index('ix_weeks_start_id', 'weeks', ['week_start_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_weeks_start_id', table_name='weeks')
+    op.drop_index('ix_weeks_employee_start', table_name='weeks')
+    op.create_index('ix_weeks_employee_start', 'weeks', ['employee_id', 'week_start_date'], unique=False)
@@ -0,0 +1,35 @@
+"""add_change_log
+
+Revision ID: 589a3669f13f
+Revises: 25adf966b305
+Create Date: 2026-10-18 21:02:41.517208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '589a3669f13f'
+down_revision = '25adf966b305'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Journal des modifications pour les backups incrémentaux
+    op.create_table('change_log',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(length=50), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_change_log_id'), 'change_log', ['id'], unique=False)
+    op.create_index(op.f('ix_change_log_changed_at'), 'change_log', ['changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_change_log_changed_at'), table_name='change_log')
+    op.drop_index(op.f('ix_change_log_id'), table_name='change_log')
+    op.drop_table('change_log')
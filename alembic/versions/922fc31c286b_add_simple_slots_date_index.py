@@ -0,0 +1,28 @@
+"""add_simple_slots_date_index
+
+Revision ID: 922fc31c286b
+Revises: 322cc8a7852a
+Create Date: 2026-10-18 23:04:51.702146
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '922fc31c286b'
+down_revision = '322cc8a7852a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Créneaux de tous les employés sur une semaine (couverture)
+    # simple_slots est créée par create_all au démarrage : elle peut ne pas encore exister
+    if sa.inspect(op.get_bind()).has_table('simple_slots'):
+        op.create_index('ix_simple_slots_date', 'simple_slots', ['date'], unique=False)
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('simple_slots'):
+        op.drop_index('ix_simple_slots_date', table_name='simple_slots')
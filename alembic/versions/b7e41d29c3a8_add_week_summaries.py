@@ -0,0 +1,80 @@
+"""add_week_summaries
+
+Revision ID: b7e41d29c3a8
+Revises: 922fc31c286b
+Create Date: 2026-10-18 23:41:12.408517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e41d29c3a8'
+down_revision = '922fc31c286b'
+branch_labels = None
+depends_on = None
+
+DAY_COLUMNS = [f"day{day}_min" for day in range(7)]
+CATEGORIES = ['a', 'p', 'e', 'c', 'o', 'l', 'm', 's']
+VALUE_COLUMNS = DAY_COLUMNS + [f"{code}_min" for code in CATEGORIES] + ['total_min', 'slot_count']
+
+
+def _aggregates(day: str, duration: str, category: str, row_id: str) -> str:
+    """SUM(CASE ...) dans l'ordre de VALUE_COLUMNS"""
+    sums = [f"COALESCE(SUM(CASE WHEN {day} = {index} THEN {duration} ELSE 0 END), 0)" for index in range(7)]
+    sums += [f"COALESCE(SUM(CASE WHEN {category} = '{code}' THEN {duration} ELSE 0 END), 0)" for code in CATEGORIES]
+    sums += [f"COALESCE(SUM({duration}), 0)", f"COUNT({row_id})"]
+    return ", ".join(sums)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'week_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('week_id', sa.Integer(), nullable=True),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('week_start_date', sa.Date(), nullable=False),
+        *[sa.Column(column, sa.Integer(), server_default='0', nullable=False) for column in VALUE_COLUMNS],
+        sa.ForeignKeyConstraint(['week_id'], ['weeks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_week_summaries_id'), 'week_summaries', ['id'], unique=False)
+    # Une ligne par semaine de `weeks`
+    op.create_index('ux_week_summaries_week', 'week_summaries', ['week_id'], unique=True)
+    # Une ligne par employé et par lundi pour les créneaux simples
+    op.create_index('ux_week_summaries_simple', 'week_summaries', ['employee_id', 'week_start_date'], unique=True,
+                    postgresql_where=sa.text('week_id IS NULL'), sqlite_where=sa.text('week_id IS NULL'))
+    # Rapports sur une plage de dates
+    op.create_index('ix_week_summaries_start', 'week_summaries', ['week_start_date', 'employee_id'], unique=False)
+
+    # Remplissage initial depuis les créneaux existants
+    columns = ", ".join(VALUE_COLUMNS)
+    op.execute(
+        f"INSERT INTO week_summaries (week_id, employee_id, week_start_date, {columns}) "
+        f"SELECT weeks.id, weeks.employee_id, weeks.week_start_date, "
+        f"{_aggregates('slots.day_index', 'slots.duration_min', 'slots.category', 'slots.id')} "
+        f"FROM weeks LEFT OUTER JOIN slots ON slots.week_id = weeks.id "
+        f"GROUP BY weeks.id, weeks.employee_id, weeks.week_start_date"
+    )
+    # simple_slots est créée par create_all au démarrage : elle peut ne pas encore exister
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table('simple_slots'):
+        if bind.dialect.name == 'postgresql':
+            monday = "CAST(date_trunc('week', date) AS DATE)"
+        else:
+            monday = "date(date, 'weekday 0', '-6 days')"
+        op.execute(
+            f"INSERT INTO week_summaries (employee_id, week_start_date, {columns}) "
+            f"SELECT employee_id, {monday}, "
+            f"{_aggregates('day_of_week', 'end_time - start_time', 'category', 'id')} "
+            f"FROM simple_slots GROUP BY employee_id, {monday}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_week_summaries_start', table_name='week_summaries')
+    op.drop_index('ux_week_summaries_simple', table_name='week_summaries')
+    op.drop_index('ux_week_summaries_week', table_name='week_summaries')
+    op.drop_index(op.f('ix_week_summaries_id'), table_name='week_summaries')
+    op.drop_table('week_summaries')
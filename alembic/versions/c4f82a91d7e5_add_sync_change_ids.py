@@ -0,0 +1,50 @@
+"""add_sync_change_ids
+
+Revision ID: c4f82a91d7e5
+Revises: b7e41d29c3a8
+Create Date: 2026-10-18 22:05:37.114902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f82a91d7e5'
+down_revision = 'b7e41d29c3a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Compteur des changements synchronisés, une seule ligne
+    op.create_table(
+        'sync_clock',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('value', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO sync_clock (id, value) VALUES (1, 0)")
+
+    # simple_slots et simple_slot_tombstones sont créées par create_all au démarrage :
+    # elles peuvent ne pas encore exister. Les lignes existantes prennent le numéro 0.
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('simple_slots'):
+        op.add_column('simple_slots', sa.Column('change_id', sa.BigInteger(), server_default='0', nullable=False))
+        op.create_index('ix_simple_slots_change_id', 'simple_slots', ['change_id'], unique=False)
+    if inspector.has_table('simple_slot_tombstones'):
+        op.add_column('simple_slot_tombstones',
+                      sa.Column('change_id', sa.BigInteger(), server_default='0', nullable=False))
+        op.create_index(op.f('ix_simple_slot_tombstones_change_id'), 'simple_slot_tombstones', ['change_id'],
+                        unique=False)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table('simple_slot_tombstones'):
+        op.drop_index(op.f('ix_simple_slot_tombstones_change_id'), table_name='simple_slot_tombstones')
+        op.drop_column('simple_slot_tombstones', 'change_id')
+    if inspector.has_table('simple_slots'):
+        op.drop_index('ix_simple_slots_change_id', table_name='simple_slots')
+        op.drop_column('simple_slots', 'change_id')
+    op.drop_table('sync_clock')
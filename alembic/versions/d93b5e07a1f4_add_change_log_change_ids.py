@@ -0,0 +1,29 @@
+"""add_change_log_change_ids
+
+Revision ID: d93b5e07a1f4
+Revises: c4f82a91d7e5
+Create Date: 2026-10-18 23:12:08.447390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd93b5e07a1f4'
+down_revision = 'c4f82a91d7e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Numéro de changement (sync_clock) des entrées du journal : curseur des backups incrémentaux.
+    # Les entrées existantes prennent le numéro 0 ; les anciens manifestes (curseur horodaté)
+    # imposent un snapshot complet, qui les purge.
+    op.add_column('change_log', sa.Column('change_id', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_change_log_change_id'), 'change_log', ['change_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_change_log_change_id'), table_name='change_log')
+    op.drop_column('change_log', 'change_id')
@@ -0,0 +1,25 @@
+"""add_week_revision
+
+Revision ID: e5cc2ec752d7
+Revises: 8c1cb7eaa426
+Create Date: 2026-10-18 09:12:41.527310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5cc2ec752d7'
+down_revision = '8c1cb7eaa426'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Compteur de révision incrémenté à chaque modification de la semaine (ETag)
+    op.add_column('weeks', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('weeks', 'revision')
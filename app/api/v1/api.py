@@ -1,12 +1,26 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import health, employees, weeks, legend, auth, backup, simple_planning
+from app.api.v1.endpoints import health, employees, weeks, legend, auth, backup, simple_planning, reports
+from app.config import settings
 
 api_router = APIRouter()
 
 api_router.include_router(health.router, tags=["health"])
+
+if settings.async_database:
+    # Routes asynchrones : enregistrées en premier, elles prennent le pas sur
+    # leurs équivalents synchrones. Seules les lectures et les écritures d'un
+    # créneau sont portées ; écritures de semaine, lots, instanciation,
+    # exports, rapports et backups restent synchrones (voir le README).
+    from app.api.v1.endpoints import async_employees, async_weeks, async_simple_planning
+
+    api_router.include_router(async_employees.router, prefix="/employees", tags=["employees"])
+    api_router.include_router(async_weeks.router, prefix="/weeks", tags=["weeks"])
+    api_router.include_router(async_simple_planning.router, prefix="/planning", tags=["simple-planning"])
+
 api_router.include_router(employees.router, prefix="/employees", tags=["employees"])
 api_router.include_router(weeks.router, prefix="/weeks", tags=["weeks"])
 api_router.include_router(simple_planning.router, prefix="/planning", tags=["simple-planning"])
+api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(legend.router, prefix="/legend", tags=["legend"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(backup.router, prefix="/backup", tags=["backup"])
\ No newline at end of file
+api_router.include_router(backup.router, prefix="/backup", tags=["backup"])
@@ -0,0 +1,63 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.api.v1.pagination import decode_cursor, page_size, set_next_cursor
+from app.database import get_async_db
+from app.schemas.employee import Employee, EmployeeCreate, EmployeeUpdate
+from app.services.async_employee_service import AsyncEmployeeService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Employee])
+async def get_employees(
+    response: Response,
+    limit: int = Query(settings.page_size_default, ge=1, description="Page size (capped by PAGE_SIZE_MAX)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Récupère la liste des employés actifs, paginée par curseur sur l'ID"""
+    limit = page_size(limit)
+    after = decode_cursor(cursor, int)
+    employees = await AsyncEmployeeService.get_all(db, limit=limit, after_id=after[0] if after else None)
+    set_next_cursor(response, employees, limit, lambda employee: (employee.id,))
+    return employees
+
+
+@router.get("/{employee_id}", response_model=Employee)
+async def get_employee(employee_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Récupère un employé par son ID"""
+    employee = await AsyncEmployeeService.get_by_id(db, employee_id)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return employee
+
+
+@router.post("/", response_model=Employee)
+async def create_employee(employee: EmployeeCreate, db: AsyncSession = Depends(get_async_db)):
+    """Crée un nouvel employé"""
+    existing = await AsyncEmployeeService.get_by_slug(db, employee.slug)
+    if existing:
+        raise HTTPException(status_code=400, detail="Employee slug already exists")
+    
+    return await AsyncEmployeeService.create(db, employee)
+
+
+@router.put("/{employee_id}", response_model=Employee)
+async def update_employee(employee_id: int, employee_update: EmployeeUpdate,
+                          db: AsyncSession = Depends(get_async_db)):
+    """Met à jour un employé"""
+    employee = await AsyncEmployeeService.update(db, employee_id, employee_update)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return employee
+
+
+@router.delete("/{employee_id}")
+async def delete_employee(employee_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Supprime (désactive) un employé"""
+    success = await AsyncEmployeeService.delete(db, employee_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return {"message": "Employee deleted successfully"}
@@ -0,0 +1,75 @@
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.api.v1.etag import etag_matches, not_modified
+from app.schemas.simple_slot import SimpleSlot, SimpleSlotCreate, SimpleSlotUpdate, WeekPlanningResponse
+from app.services.async_simple_planning_service import AsyncSimplePlanningService
+
+router = APIRouter()
+
+
+@router.get("/week", response_model=WeekPlanningResponse)
+async def get_week_planning(
+    response: Response,
+    employee_id: int = Query(..., description="ID de l'employé"),
+    week_start: date = Query(..., description="Date de début de semaine (lundi)"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Récupère le planning d'une semaine pour un employé (304 si inchangé)"""
+    try:
+        etag = await AsyncSimplePlanningService.get_week_etag(db, employee_id, week_start)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
+        planning = await AsyncSimplePlanningService.get_week_planning(db, employee_id, week_start)
+        response.headers["ETag"] = etag
+        return planning
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/slots", response_model=SimpleSlot)
+async def create_slot(slot: SimpleSlotCreate, exclude_id: int = Query(None),
+                      db: AsyncSession = Depends(get_async_db)):
+    """Crée un nouveau créneau"""
+    try:
+        return await AsyncSimplePlanningService.create_slot(db, slot, exclude_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/slots/{slot_id}", response_model=SimpleSlot)
+async def get_slot(slot_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Récupère un créneau par son ID"""
+    slot = await AsyncSimplePlanningService.get_slot_by_id(db, slot_id)
+    if not slot:
+        raise HTTPException(status_code=404, detail="Créneau non trouvé")
+    return slot
+
+
+@router.put("/slots/{slot_id}", response_model=SimpleSlot)
+async def update_slot(slot_id: int, slot_update: SimpleSlotUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Met à jour un créneau"""
+    try:
+        slot = await AsyncSimplePlanningService.update_slot(db, slot_id, slot_update)
+        if not slot:
+            raise HTTPException(status_code=404, detail="Créneau non trouvé")
+        return slot
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/slots/{slot_id}")
+async def delete_slot(slot_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Supprime un créneau"""
+    success = await AsyncSimplePlanningService.delete_slot(db, slot_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Créneau non trouvé")
+    return {"message": "Créneau supprimé avec succès"}
@@ -0,0 +1,112 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db
+from app.api.v1.endpoints import weeks
+from app.api.v1.etag import etag_matches, not_modified
+from app.api.v1.pagination import decode_cursor, page_size, set_next_cursor
+from app.schemas.week import WeekResponse
+from app.schemas.slot import SlotCreate, SlotUpdate, Slot
+from app.services.async_week_service import AsyncWeekService
+from app.services.week_service import WeekService, NDJSON_MEDIA_TYPE
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[WeekResponse])
+async def get_weeks(
+    response: Response,
+    employee_id: Optional[int] = Query(None, description="Filter by employee ID"),
+    kind: Optional[str] = Query(None, description="Filter by week kind (type|current|next|vacation)"),
+    vacation: Optional[str] = Query(None, description="Filter by vacation period"),
+    week_start: Optional[date] = Query(None, description="Filter by week start date"),
+    date_from: Optional[date] = Query(None, alias="from", description="Weeks starting on or after this date"),
+    date_to: Optional[date] = Query(None, alias="to", description="Weeks starting on or before this date"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size (capped by PAGE_SIZE_MAX, except in NDJSON mode)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Récupère les semaines selon les filtres, paginées par curseur sur (week_start_date, id)
+    
+    Avec `Accept: application/x-ndjson`, les semaines sont envoyées en flux,
+    une par ligne, au fur et à mesure de leur lecture.
+    """
+    after = decode_cursor(cursor, date.fromisoformat, int)
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            AsyncWeekService.iter_weeks_ndjson(db, employee_id, kind, vacation, week_start,
+                                               date_from, date_to, after, limit),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    
+    limit = page_size(limit or settings.page_size_default)
+    weeks = await AsyncWeekService.get_weeks(db, employee_id, kind, vacation, week_start,
+                                             date_from, date_to, after, limit)
+    set_next_cursor(response, weeks, limit, lambda week: (week.week.week_start_date, week.week.id))
+    return weeks
+
+
+# Export Excel et impression PDF : écriture synchrone (openpyxl, reportlab), servies
+# par les routes de weeks.py ; déclarées avant /{week_id} pour ne pas être capturées
+router.add_api_route("/export.xlsx", weeks.export_weeks_xlsx, methods=["GET"], response_class=StreamingResponse)
+router.add_api_route("/print.pdf", weeks.print_weeks_pdf, methods=["GET"], response_class=StreamingResponse)
+
+
+@router.get("/{week_id}", response_model=WeekResponse)
+async def get_week(
+    week_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Récupère une semaine avec tous ses détails (servie depuis le cache si possible)"""
+    revision = await AsyncWeekService.get_week_revision(db, week_id)
+    if revision is None:
+        raise HTTPException(status_code=404, detail="Week not found")
+    etag = WeekService.week_etag(week_id, revision)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    payload = await AsyncWeekService.get_week_json(db, week_id, revision)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Week not found")
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
+
+
+@router.post("/{week_id}/slots", response_model=Slot)
+async def create_slot(week_id: int, slot: SlotCreate, db: AsyncSession = Depends(get_async_db)):
+    """Crée un nouveau créneau dans une semaine"""
+    slot.week_id = week_id
+    
+    try:
+        db_slot = await AsyncWeekService.create_slot(db, slot)
+        if not db_slot:
+            raise HTTPException(status_code=404, detail="Week not found")
+        return db_slot
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.patch("/{week_id}/slots/{slot_id}", response_model=Slot)
+async def update_slot(week_id: int, slot_id: int, slot_update: SlotUpdate,
+                      db: AsyncSession = Depends(get_async_db)):
+    """Met à jour un créneau"""
+    try:
+        slot = await AsyncWeekService.update_slot(db, slot_id, slot_update)
+        if not slot:
+            raise HTTPException(status_code=404, detail="Slot not found")
+        return slot
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.delete("/{week_id}/slots/{slot_id}")
+async def delete_slot(week_id: int, slot_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Supprime un créneau"""
+    success = await AsyncWeekService.delete_slot(db, slot_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Slot not found")
+    return {"message": "Slot deleted successfully"}
@@ -1,103 +1,180 @@
-import json
+import os
+import shutil
 import subprocess
+import uuid
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.api.v1.endpoints.auth import verify_backup_token
 from app.config import settings
+from app.services.backup_service import BackupService, BACKUP_MEDIA_TYPE, BACKUP_SCHEMA_VERSION
+from app.services.backup_store import BackupStore, get_backup_store
+from app.services.job_service import Job, JobCancelled, JobService
+from app.schemas.backup import BackupJob
 
 router = APIRouter()
 
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
-@router.post("/backup")
-def create_backup(db: Session = Depends(get_db), _: bool = Depends(verify_backup_token)):
-    """Crée un backup de la base de données"""
-    try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Backup SQL avec pg_dump
-        sql_filename = f"backup_{timestamp}.sql"
-        cmd = [
+
+@router.get("/export")
+def export_backup(db: Session = Depends(get_db), _: bool = Depends(verify_backup_token)):
+    """Exporte les données en NDJSON compressé, sans les charger en mémoire"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return StreamingResponse(
+        BackupService.iter_gzip(db),
+        media_type=BACKUP_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{BackupService.export_filename(timestamp)}"',
+            "X-Backup-Schema-Version": str(BACKUP_SCHEMA_VERSION),
+        }
+    )
+
+
+def _run_command(cmd: List[str], job: Job) -> None:
+    """Exécute pg_dump/psql en surveillant la demande d'annulation"""
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    while True:
+        try:
+            _, stderr = process.communicate(timeout=1)
+            break
+        except subprocess.TimeoutExpired:
+            if job.cancel_requested:
+                process.terminate()
+                process.wait()
+                raise JobCancelled()
+    if process.returncode != 0:
+        raise Exception(f"{cmd[0]} failed: {stderr}")
+
+
+def _backup_task(db: Session, job: Job, incremental: bool) -> dict:
+    store = get_backup_store()
+
+    # Snapshot dédupliqué : seuls les blocs modifiés sont écrits
+    manifest = store.create_snapshot(db, incremental=incremental, max_chain=settings.backup_max_chain,
+                                     progress=job)
+    retention = store.apply_retention(
+        settings.backup_keep_daily, settings.backup_keep_weekly, settings.backup_keep_monthly
+    )
+
+    # Backup SQL avec pg_dump, si disponible
+    sql_filename = None
+    if settings.database_url.startswith("postgresql") and shutil.which("pg_dump"):
+        os.makedirs(settings.backup_dir, exist_ok=True)
+        sql_filename = os.path.join(settings.backup_dir, f"backup_{manifest['id']}.sql")
+        _run_command([
             "pg_dump",
             settings.database_url,
             "-f", sql_filename,
             "--no-owner",
             "--no-privileges"
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"pg_dump failed: {result.stderr}")
-        
-        # Backup JSON (données structurées)
-        json_data = {
-            "timestamp": timestamp,
-            "employees": [],
-            "weeks": [],
-            "slots": [],
-            "notes": []
-        }
-        
-        # Ici, vous pourriez ajouter la logique pour exporter les données en JSON
-        # Pour simplifier, on retourne juste les informations du backup
-        
-        return {
-            "status": "success",
-            "timestamp": timestamp,
-            "sql_file": sql_filename,
-            "message": "Backup created successfully"
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Backup failed: {str(e)}")
+        ], job)
+
+    return {
+        "snapshot": BackupStore.summary(manifest),
+        "retention": retention,
+        "sql_file": sql_filename,
+    }
+
+
+@router.post("/backup", response_model=BackupJob, status_code=202)
+def create_backup(
+    incremental: bool = Query(False, description="Export only rows changed since the previous snapshot"),
+    _: bool = Depends(verify_backup_token)
+):
+    """Lance un backup de la base de données en arrière-plan"""
+    return JobService.submit("backup", lambda db, job: _backup_task(db, job, incremental))
+
+
+@router.get("/jobs", response_model=List[BackupJob])
+def list_jobs(_: bool = Depends(verify_backup_token)):
+    """Liste les tâches de backup et de restauration"""
+    return JobService.list_jobs()
 
 
-@router.post("/restore")
+@router.get("/jobs/{job_id}", response_model=BackupJob)
+def get_job(job_id: str, _: bool = Depends(verify_backup_token)):
+    """Récupère l'état et la progression d'une tâche"""
+    job = JobService.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=BackupJob)
+def cancel_job(job_id: str, _: bool = Depends(verify_backup_token)):
+    """Demande l'annulation d'une tâche"""
+    job = JobService.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/snapshots")
+def list_snapshots(_: bool = Depends(verify_backup_token)):
+    """Liste les snapshots et l'occupation du stockage"""
+    store = get_backup_store()
+    return {"snapshots": store.list_snapshots(), "store": store.stats()}
+
+
+@router.get("/snapshots/{snapshot_id}/verify")
+def verify_snapshot(snapshot_id: str, _: bool = Depends(verify_backup_token)):
+    """Vérifie l'intégrité des blocs d'un snapshot"""
+    result = get_backup_store().verify(snapshot_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return result
+
+
+@router.post("/snapshots/{snapshot_id}/restore", response_model=BackupJob, status_code=202)
+def restore_snapshot(snapshot_id: str, _: bool = Depends(verify_backup_token)):
+    """Lance la restauration d'un snapshot du stockage en arrière-plan"""
+    store = get_backup_store()
+    if not store.get_manifest(snapshot_id):
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return JobService.submit("restore", lambda db, job: {"restored": store.restore(db, snapshot_id, job)})
+
+
+def _restore_file_task(db: Session, job: Job, path: str, filename: str) -> dict:
+    if filename.endswith('.sql'):
+        # Restauration SQL avec psql
+        _run_command([
+            "psql",
+            settings.database_url,
+            "-f", path
+        ], job)
+        return {"restored": None}
+
+    # Restauration JSON : lecture en flux et insertions par lots
+    with BackupService.open_backup(path) as backup_file:
+        return {"restored": BackupService.restore(db, backup_file, job)}
+
+
+@router.post("/restore", response_model=BackupJob, status_code=202)
 def restore_backup(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
     _: bool = Depends(verify_backup_token)
 ):
-    """Restaure la base de données depuis un fichier de backup"""
-    try:
-        if not file.filename.endswith(('.sql', '.json')):
-            raise HTTPException(status_code=400, detail="Invalid file format. Only .sql and .json files are supported")
-        
-        # Sauvegarder le fichier temporairement
-        temp_filename = f"temp_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
-        
-        with open(temp_filename, "wb") as temp_file:
-            content = file.file.read()
-            temp_file.write(content)
-        
-        if file.filename.endswith('.sql'):
-            # Restauration SQL avec psql
-            cmd = [
-                "psql",
-                settings.database_url,
-                "-f", temp_filename
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                raise Exception(f"psql restore failed: {result.stderr}")
-        
-        elif file.filename.endswith('.json'):
-            # Restauration JSON (logique personnalisée)
-            with open(temp_filename, 'r') as json_file:
-                data = json.load(json_file)
-                # Ici, vous implémenteriez la logique de restauration JSON
-                pass
-        
-        # Nettoyer le fichier temporaire
-        import os
-        os.remove(temp_filename)
-        
-        return {
-            "status": "success",
-            "message": "Database restored successfully"
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Restore failed: {str(e)}")
\ No newline at end of file
+    """Lance la restauration depuis un fichier de backup en arrière-plan"""
+    if not file.filename.endswith(('.sql', '.json', '.ndjson', '.json.gz', '.ndjson.gz')):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file format. Only .sql, .json, .ndjson and their .gz variants are supported"
+        )
+
+    # Copier le fichier sur disque par blocs, il est supprimé à la fin de la tâche
+    upload_dir = os.path.join(settings.backup_dir, "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    filename = os.path.basename(file.filename)
+    temp_filename = os.path.join(upload_dir, f"restore_{uuid.uuid4().hex}_{filename}")
+    with open(temp_filename, "wb") as temp_file:
+        shutil.copyfileobj(file.file, temp_file, UPLOAD_CHUNK_BYTES)
+
+    return JobService.submit(
+        "restore",
+        lambda db, job: _restore_file_task(db, job, temp_filename, filename),
+        cleanup=lambda: os.remove(temp_filename)
+    )
@@ -1,6 +1,8 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.config import settings
+from app.api.v1.pagination import decode_cursor, page_size, set_next_cursor
 from app.database import get_db
 from app.schemas.employee import Employee, EmployeeCreate, EmployeeUpdate
 from app.services.employee_service import EmployeeService
@@ -9,9 +11,17 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[Employee])
-def get_employees(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Récupère la liste des employés actifs"""
-    employees = EmployeeService.get_all(db, skip=skip, limit=limit)
+def get_employees(
+    response: Response,
+    limit: int = Query(settings.page_size_default, ge=1, description="Page size (capped by PAGE_SIZE_MAX)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db: Session = Depends(get_db)
+):
+    """Récupère la liste des employés actifs, paginée par curseur sur l'ID"""
+    limit = page_size(limit)
+    after = decode_cursor(cursor, int)
+    employees = EmployeeService.get_all(db, limit=limit, after_id=after[0] if after else None)
+    set_next_cursor(response, employees, limit, lambda employee: (employee.id,))
     return employees
 
 
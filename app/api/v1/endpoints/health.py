@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from app.services.cache_service import CacheService
 
 router = APIRouter()
 
@@ -6,4 +7,10 @@ router = APIRouter()
 @router.get("/health")
 async def health_check():
     """Endpoint de vérification de santé de l'API"""
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    """Statistiques du cache des semaines (hits, misses, évictions)"""
+    return CacheService.stats()
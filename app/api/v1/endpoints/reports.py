@@ -0,0 +1,39 @@
+from typing import Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.api.v1.endpoints.auth import verify_backup_token
+from app.schemas.report import HoursReport, SummaryCheck
+from app.services.report_service import ReportService
+from app.services.summary_service import SummaryService
+
+router = APIRouter()
+
+
+@router.get("/hours", response_model=HoursReport)
+def get_hours_report(
+    date_from: date = Query(..., alias="from", description="First day of the report"),
+    date_to: date = Query(..., alias="to", description="Last day of the report"),
+    employee_id: Optional[int] = Query(None, description="Restrict to one employee"),
+    period: str = Query("month", description="Grouping of the totals: month|week"),
+    db: Session = Depends(get_db)
+):
+    """Récupère les heures par employé, période et période de vacances, comparées aux notes"""
+    try:
+        return ReportService.hours_report(db, date_from, date_to, employee_id, period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/summaries/check", response_model=SummaryCheck)
+def check_week_summaries(
+    repair: bool = Query(False, description="Rebuild the summaries if any difference is found"),
+    db: Session = Depends(get_db),
+    _: bool = Depends(verify_backup_token)
+):
+    """Vérifie les résumés de semaine contre un recalcul complet (et les reconstruit si demandé)"""
+    try:
+        return SummaryService.check(db, repair)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Header
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.schemas.simple_slot import SimpleSlot, SimpleSlotCreate, SimpleSlotUpdate, WeekPlanningResponse
+from app.api.v1.etag import etag_matches, not_modified
+from app.schemas.simple_slot import SimpleSlot, SimpleSlotCreate, SimpleSlotUpdate, WeekPlanningResponse, PlanningChangesResponse, CoverageResponse
+from app.services.coverage_service import CoverageService
 from app.services.simple_planning_service import SimplePlanningService
 
 router = APIRouter()
@@ -11,18 +13,48 @@ router = APIRouter()
 
 @router.get("/week", response_model=WeekPlanningResponse)
 def get_week_planning(
+    response: Response,
     employee_id: int = Query(..., description="ID de l'employé"),
     week_start: date = Query(..., description="Date de début de semaine (lundi)"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
-    """Récupère le planning d'une semaine pour un employé"""
+    """Récupère le planning d'une semaine pour un employé (304 si inchangé)"""
     try:
+        etag = SimplePlanningService.get_week_etag(db, employee_id, week_start)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
         planning = SimplePlanningService.get_week_planning(db, employee_id, week_start)
+        response.headers["ETag"] = etag
         return planning
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/coverage", response_model=CoverageResponse)
+def get_coverage(
+    week_start: date = Query(..., description="Date de début de semaine (lundi)"),
+    min_staff: Optional[int] = Query(None, ge=1, description="Effectif minimal pendant l'ouverture (COVERAGE_MIN_STAFF par défaut)"),
+    db: Session = Depends(get_db)
+):
+    """Récupère l'effectif de tous les employés par quart d'heure et les plages en sous-effectif"""
+    try:
+        return CoverageService.get_coverage(db, week_start, min_staff)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/changes", response_model=PlanningChangesResponse)
+def get_changes(
+    since: Optional[int] = Query(None, ge=0, description="Curseur renvoyé par la synchronisation précédente"),
+    employee_id: Optional[int] = Query(None, description="ID de l'employé"),
+    db: Session = Depends(get_db)
+):
+    """Récupère les créneaux créés/modifiés et supprimés depuis un curseur"""
+    return SimplePlanningService.get_changes(db, since, employee_id)
+
+
 @router.post("/slots", response_model=SimpleSlot)
 def create_slot(slot: SimpleSlotCreate, exclude_id: int = Query(None), db: Session = Depends(get_db)):
     """Crée un nouveau créneau"""
@@ -1,35 +1,185 @@
+import tempfile
 from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
-from app.schemas.week import WeekResponse, WeekCreate, WeekCreateSimple, WeekUpdate
-from app.schemas.slot import SlotCreate, SlotUpdate, Slot
-from app.services.week_service import WeekService
+from app.api.v1.etag import etag_matches, not_modified
+from app.api.v1.pagination import decode_cursor, page_size, set_next_cursor
+from app.schemas.week import WeekResponse, WeekCreate, WeekCreateSimple, WeekUpdate, WeekGridResponse, FreeSlot, WeekInstantiate, WeekInstantiateResult
+from app.schemas.slot import SlotCreate, SlotUpdate, Slot, SlotBatch
+from app.services.week_service import WeekService, NDJSON_MEDIA_TYPE
+from app.services.employee_service import EmployeeService
+from app.services.export_service import ExportService, XLSX_MEDIA_TYPE
+from app.services.pdf_service import PdfService, PDF_MEDIA_TYPE
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[WeekResponse])
 def get_weeks(
+    response: Response,
     employee_id: Optional[int] = Query(None, description="Filter by employee ID"),
     kind: Optional[str] = Query(None, description="Filter by week kind (type|current|next|vacation)"),
     vacation: Optional[str] = Query(None, description="Filter by vacation period"),
     week_start: Optional[date] = Query(None, description="Filter by week start date"),
+    date_from: Optional[date] = Query(None, alias="from", description="Weeks starting on or after this date"),
+    date_to: Optional[date] = Query(None, alias="to", description="Weeks starting on or before this date"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size (capped by PAGE_SIZE_MAX, except in NDJSON mode)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    accept: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
-    """Récupère les semaines selon les filtres"""
-    weeks = WeekService.get_weeks(db, employee_id, kind, vacation, week_start)
+    """Récupère les semaines selon les filtres, paginées par curseur sur (week_start_date, id)
+    
+    Avec `Accept: application/x-ndjson`, les semaines sont envoyées en flux,
+    une par ligne, au fur et à mesure de leur lecture.
+    """
+    after = decode_cursor(cursor, date.fromisoformat, int)
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            WeekService.iter_weeks_ndjson(db, employee_id, kind, vacation, week_start,
+                                          date_from, date_to, after, limit),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    
+    limit = page_size(limit or settings.page_size_default)
+    weeks = WeekService.get_weeks(db, employee_id, kind, vacation, week_start,
+                                  date_from, date_to, after, limit)
+    set_next_cursor(response, weeks, limit, lambda week: (week.week.week_start_date, week.week.id))
     return weeks
 
 
+@router.get("/export.xlsx", response_class=StreamingResponse)
+def export_weeks_xlsx(
+    employee_id: Optional[int] = Query(None, description="Export one employee's weeks"),
+    kind: Optional[str] = Query(None, description="Filter by week kind (type|current|next|vacation)"),
+    vacation: Optional[str] = Query(None, description="Filter by vacation period"),
+    season: Optional[int] = Query(None, description="Season starting in September of this year (e.g. 2024 for 2024-2025)"),
+    date_from: Optional[date] = Query(None, alias="from", description="Weeks starting on or after this date"),
+    date_to: Optional[date] = Query(None, alias="to", description="Weeks starting on or before this date"),
+    db: Session = Depends(get_db)
+):
+    """Exporte les semaines filtrées en classeur Excel (grille, totaux et répartition)"""
+    if season is not None:
+        if date_from or date_to:
+            raise HTTPException(status_code=400, detail="Use either 'season' or 'from'/'to'")
+        date_from, date_to = ExportService.season_range(season)
+    
+    employee_slug = None
+    if employee_id is not None:
+        employee = EmployeeService.get_by_id(db, employee_id)
+        if not employee:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        employee_slug = employee.slug
+    
+    # Classeur écrit dans un fichier temporaire, puis envoyé par morceaux
+    export = tempfile.TemporaryFile()
+    try:
+        ExportService.write_weeks_xlsx(db, export, employee_id, kind, vacation, date_from, date_to)
+    except Exception:
+        export.close()
+        raise
+    filename = ExportService.export_filename(employee_slug, season, date_from, date_to)
+    return StreamingResponse(
+        ExportService.iter_file(export),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/print.pdf", response_class=StreamingResponse)
+def print_weeks_pdf(
+    employee_id: Optional[List[int]] = Query(None, description="Employees to print (repeatable, default: all)"),
+    kind: Optional[str] = Query(None, description="Filter by week kind (type|current|next|vacation)"),
+    vacation: Optional[str] = Query(None, description="Filter by vacation period"),
+    week_start: Optional[date] = Query(None, description="Print the weeks starting on this date"),
+    date_from: Optional[date] = Query(None, alias="from", description="Weeks starting on or after this date"),
+    date_to: Optional[date] = Query(None, alias="to", description="Weeks starting on or before this date"),
+    db: Session = Depends(get_db)
+):
+    """Imprime les semaines filtrées en PDF, une grille colorée par page
+    
+    Les pages des semaines inchangées viennent du cache ; les autres sont
+    rendues dans le pool de processus PDF.
+    """
+    for requested_id in set(employee_id or []):
+        if not EmployeeService.get_by_id(db, requested_id):
+            raise HTTPException(status_code=404, detail="Employee not found")
+    
+    conditions = PdfService.week_conditions(db, employee_id, kind, vacation, week_start, date_from, date_to)
+    count = PdfService.count_weeks(db, conditions)
+    if count == 0:
+        raise HTTPException(status_code=404, detail="No week to print")
+    if count > settings.pdf_max_pages:
+        raise HTTPException(status_code=400,
+                            detail=f"Too many weeks to print ({count}, max {settings.pdf_max_pages})")
+    
+    filename = PdfService.print_filename(week_start, date_from, date_to)
+    document = tempfile.TemporaryFile()
+    try:
+        PdfService.write_weeks_pdf(db, document, conditions, title=filename[:-4])
+    except Exception:
+        document.close()
+        raise
+    return StreamingResponse(
+        ExportService.iter_file(document),
+        media_type=PDF_MEDIA_TYPE,
+        headers={"Content-Disposition": f'inline; filename="{filename}"'}
+    )
+
+
 @router.get("/{week_id}", response_model=WeekResponse)
-def get_week(week_id: int, db: Session = Depends(get_db)):
-    """Récupère une semaine avec tous ses détails"""
-    week = WeekService.get_week_with_details(db, week_id)
-    if not week:
+def get_week(
+    week_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Récupère une semaine avec tous ses détails (servie depuis le cache si possible)"""
+    revision = WeekService.get_week_revision(db, week_id)
+    if revision is None:
         raise HTTPException(status_code=404, detail="Week not found")
-    return week
+    etag = WeekService.week_etag(week_id, revision)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    payload = WeekService.get_week_json(db, week_id, revision)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Week not found")
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/{week_id}/grid", response_model=WeekGridResponse)
+def get_week_grid(week_id: int, db: Session = Depends(get_db)):
+    """Récupère la grille compacte d'une semaine (heatmap)"""
+    grid = WeekService.get_week_grid(db, week_id)
+    if not grid:
+        raise HTTPException(status_code=404, detail="Week not found")
+    return WeekGridResponse(week_id=week_id, **grid.to_dict())
+
+
+@router.get("/{week_id}/free-slots", response_model=List[FreeSlot])
+def get_free_slots(
+    week_id: int,
+    day_index: Optional[int] = Query(None, ge=0, le=6, description="Restrict to one day (0=Monday)"),
+    start_min: int = Query(0, ge=0, le=1440, description="Window start in minutes since 00:00"),
+    end_min: int = Query(1440, ge=0, le=1440, description="Window end in minutes since 00:00"),
+    min_duration: int = Query(15, gt=0, description="Minimum gap duration in minutes"),
+    db: Session = Depends(get_db)
+):
+    """Récupère les plages libres d'une semaine"""
+    grid = WeekService.get_week_grid(db, week_id)
+    if not grid:
+        raise HTTPException(status_code=404, detail="Week not found")
+    
+    days = [day_index] if day_index is not None else range(7)
+    return [
+        FreeSlot(day_index=day, start_min=start, duration_min=duration)
+        for day in days
+        for start, duration in grid.free_gaps(day, start_min, end_min, min_duration)
+    ]
 
 
 @router.post("/", response_model=WeekResponse)
@@ -42,6 +192,15 @@ def create_week(week: WeekCreateSimple, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/instantiate", response_model=WeekInstantiateResult)
+def instantiate_weeks(request: WeekInstantiate, db: Session = Depends(get_db)):
+    """Génère des semaines pour plusieurs employés et lundis à partir des semaines types"""
+    try:
+        return WeekService.instantiate_weeks(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.put("/{week_id}", response_model=WeekResponse)
 def update_week(week_id: int, week_update: WeekUpdate, db: Session = Depends(get_db)):
     """Met à jour une semaine"""
@@ -66,6 +225,18 @@ def create_slot(week_id: int, slot: SlotCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/{week_id}/slots:batch", response_model=WeekResponse)
+def apply_slot_batch(week_id: int, batch: SlotBatch, db: Session = Depends(get_db)):
+    """Crée, modifie et supprime plusieurs créneaux en une seule transaction"""
+    try:
+        week = WeekService.apply_slot_batch(db, week_id, batch)
+        if not week:
+            raise HTTPException(status_code=404, detail="Week not found")
+        return week
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.patch("/{week_id}/slots/{slot_id}", response_model=Slot)
 def update_slot(week_id: int, slot_id: int, slot_update: SlotUpdate, db: Session = Depends(get_db)):
     """Met à jour un créneau"""
@@ -0,0 +1,18 @@
+from typing import Optional
+from fastapi import Response
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible d'un en-tête If-None-Match avec un ETag"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    weak_etag = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == weak_etag for candidate in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """Réponse 304 sans corps"""
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,38 @@
+import base64
+import json
+from typing import Any, Callable, Optional, Tuple
+from fastapi import HTTPException, Response
+from app.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_size(limit: int) -> int:
+    """Taille de page demandée, plafonnée à PAGE_SIZE_MAX"""
+    return min(limit, settings.page_size_max)
+
+
+def encode_cursor(*values: Any) -> str:
+    """Curseur opaque à partir de la clé de la dernière ligne d'une page"""
+    payload = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], *types: Callable[[Any], Any]) -> Optional[Tuple[Any, ...]]:
+    """Décode un curseur et convertit ses valeurs (400 s'il est invalide)"""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, items: list, limit: int,
+                    key: Callable[[Any], Tuple[Any, ...]]) -> None:
+    """Ajoute l'en-tête du curseur suivant (clé de la dernière ligne) si la page est pleine"""
+    if items and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(items[-1]))
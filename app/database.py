@@ -3,15 +3,59 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-engine = create_engine(settings.database_url)
+
+def engine_options(url: str) -> dict:
+    """Options du pool de connexions selon la configuration"""
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
+
+def async_database_url(url: str) -> str:
+    """URL avec le driver asynchrone (asyncpg pour PostgreSQL, aiosqlite pour SQLite)"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Moteur asynchrone créé à la demande (drivers asyncpg/aiosqlite requis)
+_async_session_factory = None
+
+
+def get_async_session_factory():
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = async_database_url(settings.database_url)
+        async_engine = create_async_engine(url, **engine_options(url))
+        _async_session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return _async_session_factory
+
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
@@ -5,6 +5,8 @@ from app.api.v1.api import api_router
 from app.config import settings
 from app.database import get_db
 from app.services.init_service import InitService
+from app.services.pdf_service import PdfService
+from app.services.reference_service import ReferenceService
 
 app = FastAPI(
     title="Planning API",
@@ -21,6 +23,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Middleware de sécurité pour les hosts de confiance
@@ -42,10 +45,20 @@ async def startup_event():
     db = next(get_db())
     try:
         InitService.init_reference_data(db)
+        # Charger le registre des types de semaine et périodes de vacances
+        ReferenceService.refresh(db)
+    except Exception as e:
+        print(f"❌ Erreur lors du chargement du registre de référence: {e}")
     finally:
         db.close()
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Arrêt des processus de rendu PDF"""
+    PdfService.shutdown()
+
+
 @app.get("/")
 async def root():
     """Endpoint racine"""
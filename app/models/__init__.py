@@ -4,5 +4,6 @@ from .vacation_period import VacationPeriod
 from .week import Week
 from .slot import Slot
 from .note import Note
+from .week_summary import WeekSummary
 
-__all__ = ["Employee", "WeekKind", "VacationPeriod", "Week", "Slot", "Note"]
\ No newline at end of file
+__all__ = ["Employee", "WeekKind", "VacationPeriod", "Week", "Slot", "Note", "WeekSummary"]
\ No newline at end of file
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String
+from app.database import Base
+
+
+class AppMetadata(Base):
+    """Paires clé/valeur internes (ex: marqueur d'initialisation)"""
+    __tablename__ = "app_metadata"
+
+    key = Column(String(50), primary_key=True)
+    value = Column(String(200), nullable=False)
+
+    def __repr__(self):
+        return f"<AppMetadata(key={self.key}, value={self.value})>"
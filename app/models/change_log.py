@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ChangeLog(Base):
+    """Journal des lignes modifiées, pour les tables sans horodatage (backups incrémentaux)"""
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True, index=True)
+    table_name = Column(String(50), nullable=False)  # "*" : toutes les tables (ex: restauration)
+    row_id = Column(Integer, nullable=True)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    change_id = Column(BigInteger, nullable=False, default=0, server_default="0", index=True)  # SyncClock
+
+    def __repr__(self):
+        return f"<ChangeLog(table_name={self.table_name}, row_id={self.row_id})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, Index
 from app.database import Base
 
 
@@ -8,4 +8,10 @@ class Employee(Base):
     id = Column(Integer, primary_key=True, index=True)
     slug = Column(String(50), unique=True, index=True, nullable=False)
     fullname = Column(String(100), nullable=False)
-    active = Column(Boolean, default=True, nullable=False)
\ No newline at end of file
+    active = Column(Boolean, default=True, nullable=False)
+
+    __table_args__ = (
+        # Index partiel sur les employés actifs (EmployeeService.get_all)
+        Index('ix_employees_active_id', 'id',
+              postgresql_where=active == True, sqlite_where=active == True),
+    )
\ No newline at end of file
@@ -8,7 +8,7 @@ class Note(Base):
     __tablename__ = "notes"
 
     id = Column(Integer, primary_key=True, index=True)
-    week_id = Column(Integer, ForeignKey("weeks.id"), nullable=False)
+    week_id = Column(Integer, ForeignKey("weeks.id"), nullable=False, index=True)
     hours_total = Column(DECIMAL(5, 2), nullable=True)
     comments = Column(Text, nullable=True)
     last_edit_by = Column(String(100), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -26,6 +26,17 @@ class SimpleSlot(Base):
     # Métadonnées
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    change_id = Column(BigInteger, nullable=False, default=0, server_default="0")  # Numéro de changement (SyncClock)
+    
+    __table_args__ = (
+        # Planning d'un employé par jour (lecture de semaine et chevauchements)
+        Index('ix_simple_slots_employee_date_start', 'employee_id', 'date', 'start_time'),
+        # Créneaux de tous les employés sur une semaine (couverture)
+        Index('ix_simple_slots_date', 'date'),
+        # Synchronisation incrémentale
+        Index('ix_simple_slots_updated_at', 'updated_at'),
+        Index('ix_simple_slots_change_id', 'change_id'),
+    )
     
     def __repr__(self):
         return f"<SimpleSlot(id={self.id}, employee={self.employee_id}, date={self.date}, title='{self.title}')>"
\ No newline at end of file
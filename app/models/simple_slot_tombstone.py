@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, BigInteger, Date, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class SimpleSlotTombstone(Base):
+    """Trace d'un créneau supprimé, pour la synchronisation incrémentale des clients"""
+    __tablename__ = "simple_slot_tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    slot_id = Column(Integer, nullable=False)
+    employee_id = Column(Integer, nullable=False)
+    date = Column(Date, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    change_id = Column(BigInteger, nullable=False, default=0, server_default="0", index=True)
+
+    def __repr__(self):
+        return f"<SimpleSlotTombstone(slot_id={self.slot_id}, deleted_at={self.deleted_at})>"
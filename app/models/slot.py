@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Text, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, String, Text, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -24,4 +24,6 @@ class Slot(Base):
         CheckConstraint('start_min >= 0 AND start_min < 1440', name='valid_start_min'),
         CheckConstraint('duration_min % 15 = 0', name='duration_multiple_15'),
         CheckConstraint("category IN ('a','p','e','c','o','l','m','s')", name='valid_category'),
+        # Créneaux d'une semaine / d'un jour (chargement et chevauchements)
+        Index('ix_slots_week_day_start', 'week_id', 'day_index', 'start_min'),
     )
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, BigInteger
+from app.database import Base
+
+SYNC_CLOCK_ID = 1
+
+
+class SyncClock(Base):
+    """Compteur des changements de planning (une seule ligne)
+
+    Chaque transaction qui écrit des créneaux simples ou le journal des
+    modifications incrémente la ligne et garde son verrou jusqu'au commit :
+    les numéros de changement sont donc visibles dans l'ordre des commits,
+    sans trou derrière un curseur donné (synchronisation et backups).
+    """
+    __tablename__ = "sync_clock"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<SyncClock(value={self.value})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, JSON, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Date, JSON, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -12,6 +12,7 @@ class Week(Base):
     vacation_id = Column(Integer, ForeignKey("vacation_period.id"), nullable=True)
     week_start_date = Column(Date, nullable=False)  # Lundi ISO
     meta = Column(JSON, default=dict)  # Ex: heures d'ouverture
+    revision = Column(Integer, default=0, server_default="0", nullable=False)  # Incrémenté à chaque modification
 
     # Relations
     employee = relationship("Employee", backref="weeks")
@@ -19,9 +20,14 @@ class Week(Base):
     vacation = relationship("VacationPeriod")
     slots = relationship("Slot", back_populates="week", cascade="all, delete-orphan")
     notes = relationship("Note", back_populates="week", cascade="all, delete-orphan")
+    summary = relationship("WeekSummary", uselist=False, viewonly=True)  # Totaux maintenus (SummaryService)
 
     # Contrainte d'unicité
     __table_args__ = (
         UniqueConstraint('employee_id', 'kind_id', 'vacation_id', 'week_start_date', 
                         name='unique_employee_week'),
+        # Semaines d'un employé triées par date (curseur de pagination)
+        Index('ix_weeks_employee_start', 'employee_id', 'week_start_date', 'id'),
+        # Toutes les semaines triées par date (curseur de pagination)
+        Index('ix_weeks_start_id', 'week_start_date', 'id'),
     )
\ No newline at end of file
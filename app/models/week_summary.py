@@ -0,0 +1,56 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, Index
+from app.database import Base
+
+# Colonnes de minutes, dans l'ordre de WeekTotals.per_day et de CATEGORY_CODES
+DAY_COLUMNS = [f"day{day}_min" for day in range(7)]
+CATEGORY_COLUMNS = {code: f"{code}_min" for code in ['a', 'p', 'e', 'c', 'o', 'l', 'm', 's']}
+
+
+class WeekSummary(Base):
+    """Totaux en minutes d'une semaine, tenus à jour à chaque écriture de créneau
+
+    Une ligne par semaine de `weeks` (créneaux `slots`, week_id renseigné) et
+    une ligne par employé et par lundi pour les créneaux `simple_slots`
+    (week_id nul).
+    """
+    __tablename__ = "week_summaries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    week_id = Column(Integer, ForeignKey("weeks.id", ondelete="CASCADE"), nullable=True)
+    employee_id = Column(Integer, nullable=False)
+    week_start_date = Column(Date, nullable=False)  # Lundi ISO
+
+    # Minutes par jour (0=Lundi)
+    day0_min = Column(Integer, default=0, server_default="0", nullable=False)
+    day1_min = Column(Integer, default=0, server_default="0", nullable=False)
+    day2_min = Column(Integer, default=0, server_default="0", nullable=False)
+    day3_min = Column(Integer, default=0, server_default="0", nullable=False)
+    day4_min = Column(Integer, default=0, server_default="0", nullable=False)
+    day5_min = Column(Integer, default=0, server_default="0", nullable=False)
+    day6_min = Column(Integer, default=0, server_default="0", nullable=False)
+
+    # Minutes par catégorie (m = indéterminé)
+    a_min = Column(Integer, default=0, server_default="0", nullable=False)
+    p_min = Column(Integer, default=0, server_default="0", nullable=False)
+    e_min = Column(Integer, default=0, server_default="0", nullable=False)
+    c_min = Column(Integer, default=0, server_default="0", nullable=False)
+    o_min = Column(Integer, default=0, server_default="0", nullable=False)
+    l_min = Column(Integer, default=0, server_default="0", nullable=False)
+    m_min = Column(Integer, default=0, server_default="0", nullable=False)
+    s_min = Column(Integer, default=0, server_default="0", nullable=False)
+
+    total_min = Column(Integer, default=0, server_default="0", nullable=False)
+    slot_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    __table_args__ = (
+        # Une ligne par semaine de `weeks`
+        Index('ux_week_summaries_week', 'week_id', unique=True),
+        # Une ligne par employé et par lundi pour les créneaux simples
+        Index('ux_week_summaries_simple', 'employee_id', 'week_start_date', unique=True,
+              postgresql_where=week_id.is_(None), sqlite_where=week_id.is_(None)),
+        # Rapports sur une plage de dates
+        Index('ix_week_summaries_start', 'week_start_date', 'employee_id'),
+    )
+
+    def __repr__(self):
+        return f"<WeekSummary(week_id={self.week_id}, employee={self.employee_id}, week={self.week_start_date})>"
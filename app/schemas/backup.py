@@ -0,0 +1,65 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+from datetime import datetime
+from app.models.week_kind import WeekKindEnum
+from .employee import Employee
+from .week import Week
+from .slot import Slot
+from .note import NoteBase
+from .simple_slot import SimpleSlotBase
+
+
+# Schémas de validation des lignes d'un backup, un par table exportée
+
+class WeekKindRow(BaseModel):
+    id: int
+    kind: WeekKindEnum
+
+
+class VacationPeriodRow(BaseModel):
+    id: int
+    period: str
+
+
+class WeekRow(Week):
+    revision: int = 0
+
+
+class NoteRow(NoteBase):
+    id: int
+    week_id: int
+    last_edit_at: Optional[datetime] = None
+
+
+class SimpleSlotRow(SimpleSlotBase):
+    id: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+BACKUP_ROW_SCHEMAS = {
+    "week_kind": WeekKindRow,
+    "vacation_period": VacationPeriodRow,
+    "employees": Employee,
+    "weeks": WeekRow,
+    "slots": Slot,
+    "notes": NoteRow,
+    "simple_slots": SimpleSlotRow,
+}
+
+
+class BackupJob(BaseModel):
+    """Tâche de backup ou de restauration en arrière-plan"""
+    id: str
+    kind: str
+    status: str = Field(..., description="pending|running|succeeded|failed|cancelled")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    rows: int = Field(0, description="Rows processed so far")
+    bytes: int = Field(0, description="Bytes processed so far")
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
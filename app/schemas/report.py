@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import date
+
+
+class PeriodHours(BaseModel):
+    """Heures planifiées sur une période, comparées aux heures notées"""
+    period: str  # "2024-09", lundi "2024-09-02" ou nom de la période de vacances
+    hours: float
+    categories: Dict[str, float]
+    noted_hours: Optional[float] = Field(None, description="Sum of Note.hours_total of the period's weeks")
+    difference: Optional[float] = Field(None, description="Planned hours of the noted weeks minus noted hours")
+
+
+class EmployeeHours(BaseModel):
+    """Totaux d'un employé sur l'intervalle du rapport"""
+    employee_id: int
+    hours: float
+    categories: Dict[str, float]
+    noted_hours: Optional[float] = None
+    difference: Optional[float] = None
+    periods: List[PeriodHours]
+    vacations: List[PeriodHours]
+
+
+class HoursReport(BaseModel):
+    """Rapport d'heures par employé, période et période de vacances"""
+    date_from: date
+    date_to: date
+    period: str = Field(..., description="month|week")
+    employees: List[EmployeeHours]
+
+
+class SummaryCheck(BaseModel):
+    """Résultat de la vérification des résumés de semaine"""
+    checked: int = Field(..., description="Number of summaries expected from the slots")
+    missing: int
+    stale: int = Field(..., description="Summaries whose totals differ from the slots")
+    orphaned: int = Field(..., description="Summaries without matching week or simple slots")
+    repaired: bool
@@ -45,4 +45,41 @@ class WeekPlanningResponse(BaseModel):
     slots: list[SimpleSlot]
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class SimpleSlotTombstone(BaseModel):
+    """Créneau supprimé"""
+    slot_id: int
+    employee_id: int
+    date: date
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PlanningChangesResponse(BaseModel):
+    """Changements depuis un curseur : créneaux créés/modifiés et supprimés"""
+    cursor: int  # Numéro de changement, à renvoyer dans `since` à la prochaine synchronisation
+    slots: list[SimpleSlot]
+    deleted: list[SimpleSlotTombstone]
+
+
+class UnderstaffedInterval(BaseModel):
+    """Plage d'ouverture où l'effectif est inférieur au minimum"""
+    day_index: int  # 0=Lundi
+    start_min: int
+    end_min: int
+    staff: int  # Effectif le plus bas sur la plage
+
+
+class CoverageResponse(BaseModel):
+    """Effectifs par quart d'heure de tous les employés pour une semaine"""
+    week_start: date
+    resolution_min: int
+    min_staff: int
+    opening_hours: list[Optional[list[int]]]  # [début, fin) en minutes par jour, null si fermé
+    staff: list[list[int]]  # 7 jours × 96 quarts d'heure
+    categories: dict[str, list[list[int]]]  # Même matrice par code catégorie présent
+    understaffed: list[UnderstaffedInterval]
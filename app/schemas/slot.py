@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import List, Optional
 
 
 class SlotBase(BaseModel):
@@ -49,3 +49,14 @@ class Slot(SlotBase):
 
     class Config:
         from_attributes = True
+
+
+class SlotBatchUpdate(SlotUpdate):
+    id: int
+
+
+class SlotBatch(BaseModel):
+    """Lot de modifications appliqué à une semaine en une seule transaction"""
+    create: List[SlotBase] = Field(default_factory=list)
+    update: List[SlotBatchUpdate] = Field(default_factory=list)
+    delete: List[int] = Field(default_factory=list)
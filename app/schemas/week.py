@@ -24,6 +24,17 @@ class WeekCreateSimple(BaseModel):
     meta: Dict[str, Any] = Field(default_factory=dict)
 
 
+class WeekInstantiate(BaseModel):
+    """Génération de semaines à partir d'une semaine type"""
+    week_starts: List[date] = Field(..., min_length=1, description="Target Mondays (ISO)")
+    employee_ids: Optional[List[int]] = Field(None, description="Target employees (default: all active)")
+    template_week_id: Optional[int] = Field(None, description="Type week to copy (default: each employee's own type week)")
+    kind: str = Field("current", description="Kind of the generated weeks: current|next|vacation")
+    vacation: Optional[str] = Field(None, description="Vacation period of the generated weeks")
+    copy_notes: bool = False
+    copy_meta: bool = True
+
+
 class WeekCreate(WeekBase):
     pass
 
@@ -51,4 +62,25 @@ class WeekResponse(BaseModel):
     repartition: CategoryRepartition
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class FreeSlot(BaseModel):
+    day_index: int
+    start_min: int
+    duration_min: int
+
+
+class WeekGridResponse(BaseModel):
+    """Grille compacte pour l'affichage heatmap (un code catégorie par quart d'heure, '.' si libre)"""
+    week_id: int
+    resolution_min: int
+    days: List[str]
+    occupancy: List[int]  # Minutes occupées par jour
+    categories: Dict[str, int]  # Minutes par catégorie
+
+
+class WeekInstantiateResult(BaseModel):
+    created: List[Week]
+    skipped: int  # Semaines déjà existantes
+    slots_created: int
@@ -0,0 +1,64 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.employee import Employee
+from app.schemas.employee import EmployeeCreate, EmployeeUpdate
+
+
+class AsyncEmployeeService:
+    """Version asynchrone d'EmployeeService (ASYNC_DATABASE=true)"""
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, limit: int = 100, after_id: Optional[int] = None) -> List[Employee]:
+        """Récupère les employés actifs par ID croissant, après `after_id` (curseur)"""
+        query = select(Employee).filter(Employee.active == True)
+        if after_id is not None:
+            query = query.filter(Employee.id > after_id)
+        result = await db.execute(query.order_by(Employee.id).limit(limit))
+        return list(result.scalars().all())
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, employee_id: int) -> Optional[Employee]:
+        """Récupère un employé par son ID"""
+        return await db.get(Employee, employee_id)
+    
+    @staticmethod
+    async def get_by_slug(db: AsyncSession, slug: str) -> Optional[Employee]:
+        """Récupère un employé par son slug"""
+        result = await db.execute(select(Employee).filter(Employee.slug == slug))
+        return result.scalars().first()
+    
+    @staticmethod
+    async def create(db: AsyncSession, employee: EmployeeCreate) -> Employee:
+        """Crée un nouvel employé"""
+        db_employee = Employee(**employee.dict())
+        db.add(db_employee)
+        await db.commit()
+        await db.refresh(db_employee)
+        return db_employee
+    
+    @staticmethod
+    async def update(db: AsyncSession, employee_id: int, employee_update: EmployeeUpdate) -> Optional[Employee]:
+        """Met à jour un employé"""
+        db_employee = await db.get(Employee, employee_id)
+        if not db_employee:
+            return None
+        
+        update_data = employee_update.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_employee, field, value)
+        
+        await db.commit()
+        await db.refresh(db_employee)
+        return db_employee
+    
+    @staticmethod
+    async def delete(db: AsyncSession, employee_id: int) -> bool:
+        """Supprime (désactive) un employé"""
+        db_employee = await db.get(Employee, employee_id)
+        if not db_employee:
+            return False
+        
+        db_employee.active = False
+        await db.commit()
+        return True
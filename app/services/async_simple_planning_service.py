@@ -0,0 +1,88 @@
+from typing import Optional
+from datetime import date
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.simple_slot import SimpleSlot
+from app.models.simple_slot_tombstone import SimpleSlotTombstone
+from app.schemas.simple_slot import SimpleSlotCreate, SimpleSlotUpdate, WeekPlanningResponse
+from app.services.simple_planning_service import SimplePlanningService
+
+
+class AsyncSimplePlanningService:
+    """Version asynchrone de SimplePlanningService (ASYNC_DATABASE=true)"""
+    
+    @staticmethod
+    async def get_week_planning(db: AsyncSession, employee_id: int, week_start: date) -> WeekPlanningResponse:
+        """Récupère le planning d'une semaine pour un employé"""
+        result = await db.execute(SimplePlanningService.week_slots_query(employee_id, week_start))
+        
+        return WeekPlanningResponse(
+            employee_id=employee_id,
+            week_start=week_start,
+            slots=result.scalars().all()
+        )
+    
+    @staticmethod
+    async def get_week_etag(db: AsyncSession, employee_id: int, week_start: date) -> str:
+        """ETag faible du planning d'une semaine"""
+        result = await db.execute(SimplePlanningService.week_etag_query(employee_id, week_start))
+        return SimplePlanningService.format_week_etag(employee_id, week_start, result.one())
+    
+    @staticmethod
+    async def create_slot(db: AsyncSession, slot_data: SimpleSlotCreate, exclude_id: int = None) -> SimpleSlot:
+        """Crée un nouveau créneau"""
+        result = await db.execute(select(SimpleSlot).filter(
+            SimpleSlot.employee_id == slot_data.employee_id,
+            SimpleSlot.date == slot_data.date
+        ))
+        SimplePlanningService._check_overlap(result.scalars().all(), slot_data, exclude_id)
+        
+        db_slot = SimpleSlot(**slot_data.dict())
+        db.add(db_slot)
+        await db.commit()
+        await db.refresh(db_slot)
+        return db_slot
+    
+    @staticmethod
+    async def update_slot(db: AsyncSession, slot_id: int, slot_update: SimpleSlotUpdate) -> Optional[SimpleSlot]:
+        """Met à jour un créneau"""
+        db_slot = await db.get(SimpleSlot, slot_id)
+        if not db_slot:
+            return None
+        
+        update_data = slot_update.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_slot, field, value)
+        
+        if 'start_time' in update_data or 'end_time' in update_data or 'date' in update_data:
+            result = await db.execute(select(SimpleSlot).filter(
+                SimpleSlot.employee_id == db_slot.employee_id,
+                SimpleSlot.date == db_slot.date,
+                SimpleSlot.id != slot_id
+            ))
+            SimplePlanningService._check_overlap(result.scalars().all(), db_slot)
+        
+        await db.commit()
+        await db.refresh(db_slot)
+        return db_slot
+    
+    @staticmethod
+    async def delete_slot(db: AsyncSession, slot_id: int) -> bool:
+        """Supprime un créneau"""
+        db_slot = await db.get(SimpleSlot, slot_id)
+        if not db_slot:
+            return False
+        
+        db.add(SimpleSlotTombstone(
+            slot_id=db_slot.id,
+            employee_id=db_slot.employee_id,
+            date=db_slot.date
+        ))
+        await db.delete(db_slot)
+        await db.commit()
+        return True
+    
+    @staticmethod
+    async def get_slot_by_id(db: AsyncSession, slot_id: int) -> Optional[SimpleSlot]:
+        """Récupère un créneau par son ID"""
+        return await db.get(SimpleSlot, slot_id)
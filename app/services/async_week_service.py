@@ -0,0 +1,169 @@
+from typing import AsyncIterator, List, Optional, Tuple
+from datetime import date
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.models.week import Week
+from app.models.slot import Slot
+from app.models.note import Note
+from app.schemas.week import WeekResponse
+from app.schemas.slot import SlotCreate, SlotUpdate
+from app.services.calculation_service import CalculationService
+from app.services.cache_service import CacheService
+from app.services.reference_service import ReferenceService
+from app.services.week_service import WeekService, STREAM_YIELD_PER
+
+
+class AsyncWeekService:
+    """Version asynchrone des lectures et écritures de créneaux de WeekService (ASYNC_DATABASE=true)"""
+    
+    @staticmethod
+    async def get_week_with_details(db: AsyncSession, week_id: int) -> Optional[WeekResponse]:
+        """Récupère une semaine avec tous ses détails et calculs"""
+        week = (await db.execute(
+            select(Week).options(joinedload(Week.summary)).filter(Week.id == week_id)
+            .execution_options(populate_existing=True)
+        )).scalars().first()
+        if not week:
+            return None
+        
+        slots = (await db.execute(select(Slot).filter(Slot.week_id == week_id))).scalars().all()
+        note = (await db.execute(select(Note).filter(Note.week_id == week_id))).scalars().first()
+        
+        return WeekService._build_week_response(week, slots, note, WeekService._summary_calculations(week))
+    
+    @staticmethod
+    async def get_week_json(db: AsyncSession, week_id: int, revision: int) -> Optional[bytes]:
+        """Réponse sérialisée d'une semaine, servie depuis le cache si possible
+        
+        `revision` est la révision lue avant la construction (celle de l'ETag) :
+        le contenu construit ensuite est au moins aussi récent.
+        """
+        payload = CacheService.get_week(week_id, revision)
+        if payload is None:
+            week = await AsyncWeekService.get_week_with_details(db, week_id)
+            if not week:
+                return None
+            payload = week.model_dump_json().encode()
+            CacheService.set_week(week_id, revision, payload)
+        return payload
+    
+    @staticmethod
+    async def get_week_revision(db: AsyncSession, week_id: int) -> Optional[int]:
+        """Révision courante d'une semaine (None si elle n'existe pas)"""
+        return (await db.execute(select(Week.revision).filter(Week.id == week_id))).scalar()
+    
+    @staticmethod
+    async def get_week_etag(db: AsyncSession, week_id: int) -> Optional[str]:
+        """ETag faible d'une semaine, dérivé de son compteur de révision"""
+        revision = await AsyncWeekService.get_week_revision(db, week_id)
+        if revision is None:
+            return None
+        return WeekService.week_etag(week_id, revision)
+    
+    @staticmethod
+    async def get_weeks(db: AsyncSession, employee_id: Optional[int] = None,
+                        kind: Optional[str] = None, vacation: Optional[str] = None,
+                        week_start: Optional[date] = None, date_from: Optional[date] = None,
+                        date_to: Optional[date] = None, after: Optional[Tuple[date, int]] = None,
+                        limit: Optional[int] = None) -> List[WeekResponse]:
+        """Récupère les semaines selon les filtres (nombre constant de requêtes)"""
+        reference_ids = await db.run_sync(ReferenceService.resolve, kind, vacation)
+        if reference_ids is None:
+            return []
+        query = WeekService.weeks_query(employee_id, *reference_ids, week_start,
+                                        date_from, date_to, after, limit)
+        weeks = (await db.execute(query)).scalars().all()
+        return WeekService._build_week_responses(weeks)
+    
+    @staticmethod
+    async def iter_weeks_ndjson(db: AsyncSession, employee_id: Optional[int] = None,
+                                kind: Optional[str] = None, vacation: Optional[str] = None,
+                                week_start: Optional[date] = None, date_from: Optional[date] = None,
+                                date_to: Optional[date] = None, after: Optional[Tuple[date, int]] = None,
+                                limit: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Produit les semaines en NDJSON par lots (curseur serveur)"""
+        reference_ids = await db.run_sync(ReferenceService.resolve, kind, vacation)
+        if reference_ids is None:
+            return
+        query = WeekService.weeks_query(employee_id, *reference_ids, week_start,
+                                        date_from, date_to, after, limit)
+        result = await db.stream(query.execution_options(yield_per=STREAM_YIELD_PER))
+        async for weeks in result.scalars().partitions():
+            yield b"".join([
+                response.model_dump_json().encode() + b"\n"
+                for response in WeekService._build_week_responses(weeks)
+            ])
+            WeekService.expunge_weeks(db, weeks)
+    
+    @staticmethod
+    async def create_slot(db: AsyncSession, slot_data: SlotCreate) -> Optional[Slot]:
+        """Crée un nouveau créneau avec vérification de chevauchement"""
+        if not await db.get(Week, slot_data.week_id):
+            return None
+        
+        existing_slots = (await db.execute(select(Slot).filter(
+            Slot.week_id == slot_data.week_id,
+            Slot.day_index == slot_data.day_index
+        ))).scalars().all()
+        
+        temp_slot = Slot(**slot_data.dict())
+        conflicts = CalculationService.find_slot_conflicts(existing_slots, temp_slot)
+        if conflicts:
+            raise ValueError(f"Slot overlap detected with {CalculationService.format_conflicts(conflicts)}")
+        
+        db_slot = Slot(**slot_data.dict())
+        db.add(db_slot)
+        await db.execute(WeekService.revision_bump(slot_data.week_id))
+        await db.commit()
+        await db.refresh(db_slot)
+        CacheService.invalidate_week(db_slot.week_id)
+        return db_slot
+    
+    @staticmethod
+    async def update_slot(db: AsyncSession, slot_id: int, slot_update: SlotUpdate) -> Optional[Slot]:
+        """Met à jour un créneau"""
+        db_slot = await db.get(Slot, slot_id)
+        if not db_slot:
+            return None
+        
+        update_data = slot_update.dict(exclude_unset=True)
+        if any(field in update_data for field in ['day_index', 'start_min', 'duration_min']):
+            temp_slot = Slot(
+                week_id=db_slot.week_id,
+                day_index=update_data.get('day_index', db_slot.day_index),
+                start_min=update_data.get('start_min', db_slot.start_min),
+                duration_min=update_data.get('duration_min', db_slot.duration_min)
+            )
+            other_slots = (await db.execute(select(Slot).filter(
+                Slot.week_id == db_slot.week_id,
+                Slot.day_index == temp_slot.day_index,
+                Slot.id != slot_id
+            ))).scalars().all()
+            
+            conflicts = CalculationService.find_slot_conflicts(other_slots, temp_slot)
+            if conflicts:
+                raise ValueError(f"Slot overlap detected with {CalculationService.format_conflicts(conflicts)}")
+        
+        for field, value in update_data.items():
+            setattr(db_slot, field, value)
+        await db.execute(WeekService.revision_bump(db_slot.week_id))
+        
+        await db.commit()
+        await db.refresh(db_slot)
+        CacheService.invalidate_week(db_slot.week_id)
+        return db_slot
+    
+    @staticmethod
+    async def delete_slot(db: AsyncSession, slot_id: int) -> bool:
+        """Supprime un créneau"""
+        db_slot = await db.get(Slot, slot_id)
+        if not db_slot:
+            return False
+        
+        week_id = db_slot.week_id
+        await db.delete(db_slot)
+        await db.execute(WeekService.revision_bump(week_id))
+        await db.commit()
+        CacheService.invalidate_week(week_id)
+        return True
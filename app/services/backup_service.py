@@ -0,0 +1,320 @@
+import enum
+import gzip
+import json
+import zlib
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from sqlalchemy import Table, delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+from app.models.employee import Employee
+from app.models.week_kind import WeekKind
+from app.models.vacation_period import VacationPeriod
+from app.models.week import Week
+from app.models.slot import Slot
+from app.models.note import Note
+from app.models.simple_slot import SimpleSlot
+from app.schemas.backup import BACKUP_ROW_SCHEMAS
+from app.services.cache_service import CacheService
+from app.services.change_log_service import ChangeLogService
+from app.services.job_service import Job
+from app.services.reference_service import ReferenceService
+from app.services.simple_planning_service import SimplePlanningService
+from app.services.summary_service import SummaryService
+
+BACKUP_FORMAT = "planning-backup"
+BACKUP_SCHEMA_VERSION = 1
+BACKUP_MEDIA_TYPE = "application/gzip"
+
+# Ordre des clés étrangères : une table n'y référence que des tables précédentes
+BACKUP_TABLES: List[Table] = [
+    WeekKind.__table__,
+    VacationPeriod.__table__,
+    Employee.__table__,
+    Week.__table__,
+    Slot.__table__,
+    Note.__table__,
+    SimpleSlot.__table__,
+]
+
+YIELD_PER = 5000
+INSERT_BATCH = 5000
+CHUNK_BYTES = 256 * 1024
+
+
+def _batches(ids: List[int], size: int = INSERT_BATCH) -> Iterator[List[int]]:
+    for position in range(0, len(ids), size):
+        yield ids[position:position + size]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+
+
+_encoder = json.JSONEncoder(default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_line(value: Any) -> str:
+    """Sérialise une valeur en une ligne NDJSON"""
+    return _encoder.encode(value) + "\n"
+
+
+class BackupService:
+    """Export des données au format NDJSON compressé (gzip)
+
+    Première ligne : en-tête avec la version du schéma. Puis pour chaque table
+    une ligne `{"table": ..., "columns": [...]}` suivie d'une ligne par
+    enregistrement (tableau de valeurs dans l'ordre des colonnes).
+    """
+
+    @staticmethod
+    def header() -> dict:
+        """En-tête du fichier de backup"""
+        return {
+            "format": BACKUP_FORMAT,
+            "schema_version": BACKUP_SCHEMA_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "tables": [table.name for table in BACKUP_TABLES],
+        }
+
+    @staticmethod
+    def section(table: Table) -> dict:
+        """Ligne d'ouverture de la section d'une table"""
+        return {"table": table.name, "columns": [column.name for column in table.columns]}
+
+    @staticmethod
+    def iter_partitions(db: Session, table: Table, where=None) -> Iterator[Sequence]:
+        """Lit une table par lots, triée par clé primaire (curseur serveur)"""
+        query = select(table)
+        if where is not None:
+            query = query.where(where)
+        result = db.execute(
+            query.order_by(*table.primary_key.columns).execution_options(yield_per=YIELD_PER)
+        )
+        yield from result.partitions()
+
+    @staticmethod
+    def iter_lines(db: Session) -> Iterator[str]:
+        """Produit les lignes NDJSON en lisant les tables par lots"""
+        encode = _encoder.encode
+        yield encode_line(BackupService.header())
+        for table in BACKUP_TABLES:
+            yield encode_line(BackupService.section(table))
+            for rows in BackupService.iter_partitions(db, table):
+                yield "".join([encode(list(row)) + "\n" for row in rows])
+
+    @staticmethod
+    def iter_gzip(db: Session, level: int = 6) -> Iterator[bytes]:
+        """Flux gzip de l'export, par blocs d'environ CHUNK_BYTES"""
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = en-tête gzip
+        pending: List[bytes] = []
+        size = 0
+        for line in BackupService.iter_lines(db):
+            data = line.encode()
+            pending.append(data)
+            size += len(data)
+            if size >= CHUNK_BYTES:
+                chunk = compressor.compress(b"".join(pending))
+                pending, size = [], 0
+                if chunk:
+                    yield chunk
+        yield compressor.compress(b"".join(pending)) + compressor.flush()
+
+    @staticmethod
+    def write_export(db: Session, path: str) -> Tuple[str, int]:
+        """Écrit l'export gzip dans un fichier, renvoie (chemin, taille)"""
+        size = 0
+        with open(path, "wb") as output:
+            for chunk in BackupService.iter_gzip(db):
+                output.write(chunk)
+                size += len(chunk)
+        return path, size
+
+    @staticmethod
+    def export_filename(timestamp: str) -> str:
+        return f"backup_{timestamp}.ndjson.gz"
+
+    @staticmethod
+    def open_backup(path: str) -> IO[bytes]:
+        """Ouvre un fichier de backup, compressé (gzip) ou non"""
+        with open(path, "rb") as raw:
+            magic = raw.read(2)
+        return gzip.open(path, "rb") if magic == b"\x1f\x8b" else open(path, "rb")
+
+    @staticmethod
+    def _check_header(line: bytes) -> dict:
+        try:
+            header = json.loads(line)
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != BACKUP_FORMAT:
+            raise ValueError("Not a planning backup file")
+        version = header.get("schema_version")
+        if not isinstance(version, int) or version > BACKUP_SCHEMA_VERSION:
+            raise ValueError(f"Unsupported backup schema version: {version}")
+        return header
+
+    @staticmethod
+    def reset_sequences(db: Session) -> None:
+        """Recale les séquences d'identifiants après une insertion d'IDs explicites"""
+        if db.get_bind().dialect.name != "postgresql":
+            return  # SQLite repart de MAX(rowid)
+        for table in BACKUP_TABLES:
+            db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {table.name}"
+            ))
+
+    @staticmethod
+    def restore(db: Session, lines: Iterable[bytes], progress: Optional[Job] = None) -> Dict[str, int]:
+        """Remplace les données par celles d'un backup NDJSON, en une transaction
+
+        Les lignes sont lues au fil de l'eau, validées par les schémas Pydantic
+        et insérées par lots (executemany). Les sections doivent suivre l'ordre
+        des clés étrangères de `BACKUP_TABLES`. Renvoie le nombre de lignes par table.
+        """
+        return BackupService.restore_chain(db, [lines], progress)
+
+    @staticmethod
+    def restore_chain(db: Session, streams: Iterable[Iterable[bytes]],
+                      progress: Optional[Job] = None) -> Dict[str, int]:
+        """Restaure un backup complet puis ses incrémentaux, en une transaction
+
+        Un incrémental supprime d'abord les lignes listées dans son en-tête
+        (`deleted`, et `replaced` pour les enfants des semaines modifiées),
+        puis remplace ses lignes par identifiant. `progress` reçoit le nombre
+        de lignes et d'octets traités.
+
+        Les révisions restaurées sont décalées au-delà de la plus grande
+        révision d'avant la restauration : un ETag `week-{id}-r{n}` déjà servi
+        (et gardé en cache par un client) ne correspond plus à aucune semaine.
+        """
+        counts: Dict[str, int] = {}
+
+        # Écritures en Core (executemany) : pas de passage par l'unité de travail ORM
+        connection = db.connection()
+        try:
+            revision_floor = connection.execute(select(func.max(Week.revision))).scalar() or 0
+            for position, lines in enumerate(streams):
+                iterator = iter(lines)
+                header = BackupService._check_header(next(iterator, b""))
+                incremental = header.get("type") == "incremental"
+                if incremental != (position > 0):
+                    raise ValueError("A restore chain must be a full backup followed by incrementals")
+
+                if incremental:
+                    BackupService._delete_changed(connection, header)
+                else:
+                    # Vider dans l'ordre inverse des clés étrangères
+                    for existing in reversed(BACKUP_TABLES):
+                        connection.execute(delete(existing))
+                BackupService._load_rows(connection, iterator, counts, incremental, progress)
+
+            BackupService.reset_sequences(db)
+            connection.execute(update(Week).values(revision=Week.revision + revision_floor + 1))
+            # Les résumés ne sont pas sauvegardés : recalculés depuis les créneaux restaurés
+            SummaryService.rebuild(db)
+            # Les lignes restaurées ne sont pas journalisées : le prochain backup sera complet
+            ChangeLogService.mark_all_changed(db)
+            # ... et les clients de synchronisation reçoivent tous les créneaux simples
+            SimplePlanningService.stamp_all(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        CacheService.clear()
+        ReferenceService.clear()  # Les IDs de référence ont pu changer
+        return counts
+
+    @staticmethod
+    def _delete_changed(connection, header: dict) -> None:
+        """Supprime les lignes remplacées ou supprimées par un incrémental"""
+        replaced = header.get("replaced", {})
+        deleted = header.get("deleted", {})
+        for table in reversed(BACKUP_TABLES):
+            scope = replaced.get(table.name)
+            if scope:
+                if scope.get("column") not in table.c:
+                    raise ValueError(f"Unknown column {scope.get('column')!r} for table {table.name!r}")
+                column = table.c[scope["column"]]
+                for ids in _batches(scope["ids"]):
+                    connection.execute(delete(table).where(column.in_(ids)))
+            for ids in _batches(deleted.get(table.name, [])):
+                connection.execute(delete(table).where(table.c.id.in_(ids)))
+
+    @staticmethod
+    def _upsert(connection, table: Table):
+        """INSERT ... ON CONFLICT (id) DO UPDATE : les lignes référencées restent en place"""
+        if connection.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif connection.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise ValueError(f"Incremental restore is not supported on {connection.dialect.name}")
+        statement = dialect_insert(table)
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={column.name: statement.excluded[column.name] for column in table.columns if column.name != "id"}
+        )
+
+    @staticmethod
+    def _load_rows(connection, iterator: Iterator[bytes], counts: Dict[str, int], upsert: bool,
+                   progress: Optional[Job] = None) -> None:
+        """Valide et insère par lots les sections d'un flux NDJSON"""
+        order = {table.name: position for position, table in enumerate(BACKUP_TABLES)}
+        table, schema, columns, keys = None, None, [], []
+        batch: List[dict] = []
+        pending_bytes = 0
+
+        def flush():
+            nonlocal pending_bytes
+            if batch:
+                statement = BackupService._upsert(connection, table) if upsert else insert(table)
+                connection.execute(statement, batch)
+                counts[table.name] += len(batch)
+                if progress:
+                    progress.advance(rows=len(batch), bytes=pending_bytes)
+                    pending_bytes = 0
+                batch.clear()
+
+        for number, line in enumerate(iterator, start=2):
+            pending_bytes += len(line)
+            if not line.strip():
+                continue
+            record = json.loads(line)
+
+            if isinstance(record, dict):
+                flush()
+                name = record.get("table")
+                if name not in order:
+                    raise ValueError(f"Line {number}: unknown table {name!r}")
+                if table is not None and order[name] <= order[table.name]:
+                    raise ValueError(f"Line {number}: table {name!r} is out of foreign key order")
+                table, schema, columns = BackupService._table(name), BACKUP_ROW_SCHEMAS[name], record["columns"]
+                keys = [column.name for column in table.columns]
+                counts.setdefault(name, 0)
+                continue
+
+            if table is None:
+                raise ValueError(f"Line {number}: row outside of a table section")
+            try:
+                row = schema.model_validate(dict(zip(columns, record))).model_dump()
+            except ValidationError as e:
+                raise ValueError(f"Line {number}: invalid {table.name} row: {e}")
+            batch.append({key: row[key] for key in keys if key in row})
+            if len(batch) >= INSERT_BATCH:
+                flush()
+
+        flush()
+
+    @staticmethod
+    def _table(name: str) -> Table:
+        return next(table for table in BACKUP_TABLES if table.name == name)
@@ -0,0 +1,416 @@
+import fcntl
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import Table, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.employee import Employee
+from app.models.week import Week
+from app.models.slot import Slot
+from app.models.note import Note
+from app.models.simple_slot import SimpleSlot
+from app.models.simple_slot_tombstone import SimpleSlotTombstone
+from app.services.backup_service import BackupService, BACKUP_TABLES, encode_line
+from app.services.change_log_service import ChangeLogService
+from app.services.simple_planning_service import SimplePlanningService
+from app.services.job_service import Job
+
+BACKUP_CHUNK_ROWS = 1000
+SNAPSHOT_ID_FORMAT = "%Y%m%d_%H%M%S_%f"
+_SNAPSHOT_ID = re.compile(r"^\d{8}_\d{6}_\d{6}$")
+
+
+class BackupStore:
+    """Stockage des backups adressé par contenu
+
+    Chaque table est découpée en blocs par plage d'identifiants
+    (`chunk_rows` ids par bloc) : une modification ne change que le bloc qui
+    contient la ligne. Un bloc est nommé par le SHA-256 de son contenu NDJSON
+    et écrit compressé une seule fois dans `objects/`. Chaque snapshot est un
+    manifeste JSON dans `snapshots/` qui liste ses blocs.
+
+    Un verrou de fichier (`lock` à la racine) protège les blocs : un snapshot
+    le prend en partage de l'écriture du premier bloc à celle du manifeste,
+    la rétention et le ramasse-miettes le prennent en exclusif. Un bloc écrit
+    ou réutilisé par un backup en cours n'est donc jamais supprimé avant que
+    son manifeste ne le référence, entre threads comme entre processus.
+    """
+
+    def __init__(self, root: str, chunk_rows: int = BACKUP_CHUNK_ROWS):
+        self.root = root
+        self.chunk_rows = chunk_rows
+        self.objects_dir = os.path.join(root, "objects")
+        self.snapshots_dir = os.path.join(root, "snapshots")
+
+    @contextmanager
+    def _locked(self, exclusive: bool = False) -> Iterator[None]:
+        """Verrou du stockage, partagé (snapshots, lectures) ou exclusif (suppressions)"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, "lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # Objets
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as output:
+            output.write(data)
+        os.replace(temp_path, path)
+
+    def put_object(self, data: bytes) -> Tuple[str, int]:
+        """Stocke un bloc s'il est nouveau, renvoie (empreinte, octets écrits)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        compressed = zlib.compress(data, 6)
+        self._write_atomic(path, compressed)
+        return digest, len(compressed)
+
+    def get_object(self, digest: str) -> bytes:
+        """Lit et décompresse un bloc"""
+        with open(self._object_path(digest), "rb") as source:
+            return zlib.decompress(source.read())
+
+    # Snapshots
+
+    def _manifest_path(self, snapshot_id: str) -> str:
+        return os.path.join(self.snapshots_dir, f"{snapshot_id}.json")
+
+    def create_snapshot(self, db: Session, incremental: bool = False,
+                        max_chain: Optional[int] = None, progress: Optional[Job] = None) -> dict:
+        """Écrit un snapshot ; seuls les blocs inconnus sont stockés
+
+        En mode incrémental, seules les lignes modifiées depuis le snapshot
+        précédent sont exportées (journal des modifications pour employés,
+        semaines et leurs notes, numéros de changement pour les créneaux
+        simples). Le curseur est le dernier numéro de changement validé
+        (`SyncClock`) : une transaction longue validée après la lecture du
+        curseur reçoit un numéro supérieur et part dans l'incrémental suivant. Le snapshot est
+        complet s'il n'y a pas de parent utilisable ou si la chaîne atteint
+        `max_chain` incrémentaux. Un snapshot complet purge le journal des
+        modifications jusqu'à son curseur. `progress` reçoit le nombre de
+        lignes et d'octets exportés.
+        """
+        with self._locked():
+            created_at = datetime.now(timezone.utc)
+            cursor = SimplePlanningService.current_change_id(db)
+            parent = self._incremental_parent(db, max_chain) if incremental else None
+
+            manifest = BackupService.header()
+            manifest.update({
+                "id": created_at.strftime(SNAPSHOT_ID_FORMAT),
+                "created_at": created_at.isoformat(),
+                "type": "incremental" if parent else "full",
+                "parent": parent["id"] if parent else None,
+                "chain": parent.get("chain", 0) + 1 if parent else 0,
+                "cursor": cursor,
+                "tables": [],
+            })
+            wheres: Dict[str, object] = {}
+            if parent:
+                wheres, deleted, replaced = self._incremental_plan(db, parent["cursor"])
+                manifest.update({"deleted": deleted, "replaced": replaced})
+
+            totals = {"rows": 0, "size": 0, "bytes_written": 0}
+            for table in BACKUP_TABLES:
+                partitions = BackupService.iter_partitions(db, table, wheres.get(table.name))
+                manifest["tables"].append(self._store_section(table, partitions, totals, progress))
+
+            manifest.update(totals)
+            self._write_atomic(self._manifest_path(manifest["id"]), json.dumps(manifest).encode())
+
+        if not parent:
+            # Les prochains incrémentaux partent de ce snapshot : le journal antérieur ne sert plus
+            ChangeLogService.prune(db, cursor)
+            db.commit()
+        return manifest
+
+    def _store_section(self, table: Table, partitions: Iterable[Sequence], totals: Dict[str, int],
+                       progress: Optional[Job] = None) -> dict:
+        """Découpe les lignes d'une table en blocs par plage d'identifiants"""
+        section = BackupService.section(table)
+        section["chunks"] = []
+        id_position = section["columns"].index(table.primary_key.columns[0].name)
+        lines: List[str] = []
+        current = None
+
+        def store_chunk():
+            data = "".join(lines).encode()
+            digest, written = self.put_object(data)
+            section["chunks"].append({"hash": digest, "rows": len(lines), "size": len(data)})
+            totals["rows"] += len(lines)
+            totals["size"] += len(data)
+            totals["bytes_written"] += written
+            lines.clear()
+
+        for rows in partitions:
+            size = 0
+            for row in rows:
+                key = row[id_position] // self.chunk_rows
+                if key != current and lines:
+                    store_chunk()
+                current = key
+                line = encode_line(list(row))
+                size += len(line)
+                lines.append(line)
+            if progress:
+                progress.advance(rows=len(rows), bytes=size)
+        if lines:
+            store_chunk()
+        return section
+
+    def _incremental_parent(self, db: Session, max_chain: Optional[int]) -> Optional[dict]:
+        """Dernier snapshot utilisable comme parent d'un incrémental"""
+        snapshot_ids = self.snapshot_ids()
+        if not snapshot_ids:
+            return None
+        parent = self.get_manifest(snapshot_ids[-1])
+        if not isinstance(parent.get("cursor"), int):
+            return None  # Ancien curseur horodaté : snapshot complet
+        if max_chain is not None and parent.get("chain", 0) + 1 > max_chain:
+            return None
+        if ChangeLogService.all_changed_since(db, parent["cursor"]):
+            return None
+        return parent
+
+    @staticmethod
+    def _incremental_plan(db: Session, since: int) -> Tuple[Dict[str, object], Dict[str, List[int]], dict]:
+        """Filtres des lignes à exporter, lignes supprimées et portées remplacées"""
+        employees, weeks, slots, notes, simple_slots = (
+            Employee.__table__, Week.__table__, Slot.__table__, Note.__table__, SimpleSlot.__table__
+        )
+        changed_employees = ChangeLogService.changed_ids_query("employees", since)
+        changed_weeks = ChangeLogService.changed_ids_query("weeks", since)
+        wheres = {
+            "employees": employees.c.id.in_(changed_employees),
+            "weeks": weeks.c.id.in_(changed_weeks),
+            "slots": slots.c.week_id.in_(changed_weeks),
+            "notes": notes.c.week_id.in_(changed_weeks),
+            "simple_slots": simple_slots.c.change_id > since,
+        }
+
+        week_ids = ChangeLogService.changed_ids(db, "weeks", since)
+        employee_ids = ChangeLogService.changed_ids(db, "employees", since)
+        tombstone_ids = sorted(set(db.scalars(
+            select(SimpleSlotTombstone.slot_id).where(SimpleSlotTombstone.change_id > since)
+        )))
+        deleted = {
+            "employees": BackupStore._missing(db, employees, employee_ids),
+            "weeks": BackupStore._missing(db, weeks, week_ids),
+            "simple_slots": BackupStore._missing(db, simple_slots, tombstone_ids),
+        }
+        # Les créneaux et notes d'une semaine modifiée sont réexportés en entier
+        replaced = {
+            "slots": {"column": "week_id", "ids": week_ids},
+            "notes": {"column": "week_id", "ids": week_ids},
+        }
+        return wheres, deleted, replaced
+
+    @staticmethod
+    def _missing(db: Session, table: Table, ids: List[int]) -> List[int]:
+        """Identifiants qui n'existent plus dans la table"""
+        existing = set()
+        for position in range(0, len(ids), BACKUP_CHUNK_ROWS):
+            batch = ids[position:position + BACKUP_CHUNK_ROWS]
+            existing.update(db.scalars(select(table.c.id).where(table.c.id.in_(batch))))
+        return [row_id for row_id in ids if row_id not in existing]
+
+    def get_manifest(self, snapshot_id: str) -> Optional[dict]:
+        """Récupère le manifeste d'un snapshot"""
+        if not _SNAPSHOT_ID.match(snapshot_id):
+            return None
+        try:
+            with open(self._manifest_path(snapshot_id), "rb") as source:
+                return json.load(source)
+        except FileNotFoundError:
+            return None
+
+    def snapshot_ids(self) -> List[str]:
+        """Identifiants des snapshots, du plus ancien au plus récent"""
+        if not os.path.isdir(self.snapshots_dir):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.snapshots_dir)
+                      if name.endswith(".json") and _SNAPSHOT_ID.match(name[:-5]))
+
+    @staticmethod
+    def summary(manifest: dict) -> dict:
+        """Manifeste sans la liste des blocs"""
+        summary = {key: value for key, value in manifest.items() if key != "tables"}
+        summary["chunks"] = sum(len(section["chunks"]) for section in manifest["tables"])
+        return summary
+
+    def list_snapshots(self) -> List[dict]:
+        """Résumé de chaque snapshot"""
+        with self._locked():
+            return [self.summary(self.get_manifest(snapshot_id)) for snapshot_id in self.snapshot_ids()]
+
+    def iter_lines(self, manifest: dict) -> Iterator[bytes]:
+        """Reconstitue le flux NDJSON d'un snapshot, bloc par bloc"""
+        header = {key: value for key, value in manifest.items() if key != "tables"}
+        header["tables"] = [section["table"] for section in manifest["tables"]]
+        yield encode_line(header).encode()
+        for section in manifest["tables"]:
+            yield encode_line({"table": section["table"], "columns": section["columns"]}).encode()
+            for chunk in section["chunks"]:
+                yield from self.get_object(chunk["hash"]).splitlines()
+
+    def chain(self, snapshot_id: str) -> Optional[List[dict]]:
+        """Manifestes à rejouer : le snapshot complet puis les incrémentaux"""
+        manifest = self.get_manifest(snapshot_id)
+        if not manifest:
+            return None
+        chain = [manifest]
+        while chain[-1].get("type") == "incremental":
+            parent = self.get_manifest(chain[-1].get("parent") or "")
+            if not parent:
+                raise ValueError(f"Broken backup chain: parent of {chain[-1]['id']} is missing")
+            chain.append(parent)
+        return list(reversed(chain))
+
+    def restore(self, db: Session, snapshot_id: str, progress: Optional[Job] = None) -> Optional[Dict[str, int]]:
+        """Restaure un snapshot (et sa chaîne d'incrémentaux), None s'il n'existe pas"""
+        with self._locked():
+            chain = self.chain(snapshot_id)
+            if chain is None:
+                return None
+            return BackupService.restore_chain(db, (self.iter_lines(manifest) for manifest in chain), progress)
+
+    def verify(self, snapshot_id: str) -> Optional[dict]:
+        """Contrôle la présence et l'empreinte de chaque bloc d'un snapshot"""
+        with self._locked():
+            manifest = self.get_manifest(snapshot_id)
+            if not manifest:
+                return None
+            missing, corrupt = [], []
+            chunks = [chunk for section in manifest["tables"] for chunk in section["chunks"]]
+            for chunk in chunks:
+                try:
+                    data = self.get_object(chunk["hash"])
+                except FileNotFoundError:
+                    missing.append(chunk["hash"])
+                    continue
+                except zlib.error:
+                    corrupt.append(chunk["hash"])
+                    continue
+                if hashlib.sha256(data).hexdigest() != chunk["hash"] or len(data) != chunk["size"]:
+                    corrupt.append(chunk["hash"])
+            parent_missing = (manifest.get("type") == "incremental"
+                              and not self.get_manifest(manifest.get("parent") or ""))
+            return {
+                "id": snapshot_id,
+                "ok": not missing and not corrupt and not parent_missing,
+                "chunks": len(chunks),
+                "missing": missing,
+                "corrupt": corrupt,
+                "parent_missing": parent_missing,
+            }
+
+    # Rétention
+
+    def apply_retention(self, keep_daily: int, keep_weekly: int, keep_monthly: int) -> dict:
+        """Conserve le dernier snapshot des N derniers jours, semaines et mois
+
+        Les parents des incrémentaux conservés sont gardés. Les autres
+        manifestes sont supprimés, puis les blocs qui ne sont plus référencés
+        par aucun snapshot.
+        """
+        with self._locked(exclusive=True):
+            snapshots = [(snapshot_id, datetime.strptime(snapshot_id, SNAPSHOT_ID_FORMAT))
+                         for snapshot_id in reversed(self.snapshot_ids())]
+            kept: Set[str] = set()
+            periods = (
+                (keep_daily, lambda created: created.date()),
+                (keep_weekly, lambda created: created.isocalendar()[:2]),
+                (keep_monthly, lambda created: (created.year, created.month)),
+            )
+            for count, period in periods:
+                seen = set()
+                for snapshot_id, created in snapshots:
+                    key = period(created)
+                    if key in seen:
+                        continue
+                    if len(seen) >= count:
+                        break
+                    seen.add(key)
+                    kept.add(snapshot_id)
+
+            # Les parents d'un incrémental conservé sont conservés
+            for snapshot_id in list(kept):
+                parent = self.get_manifest(snapshot_id).get("parent")
+                while parent and parent not in kept and self.get_manifest(parent):
+                    kept.add(parent)
+                    parent = self.get_manifest(parent).get("parent")
+
+            deleted = [snapshot_id for snapshot_id, _ in snapshots if snapshot_id not in kept]
+            for snapshot_id in deleted:
+                os.remove(self._manifest_path(snapshot_id))
+            objects_deleted, bytes_freed = self._collect_garbage()
+            return {
+                "kept": sorted(kept),
+                "deleted": sorted(deleted),
+                "objects_deleted": objects_deleted,
+                "bytes_freed": bytes_freed,
+            }
+
+    def referenced_objects(self) -> Set[str]:
+        """Empreintes des blocs référencés par au moins un snapshot"""
+        referenced = set()
+        for snapshot_id in self.snapshot_ids():
+            for section in self.get_manifest(snapshot_id)["tables"]:
+                referenced.update(chunk["hash"] for chunk in section["chunks"])
+        return referenced
+
+    def _iter_object_files(self) -> Iterator[Tuple[str, str]]:
+        if not os.path.isdir(self.objects_dir):
+            return
+        for prefix in os.listdir(self.objects_dir):
+            directory = os.path.join(self.objects_dir, prefix)
+            for name in os.listdir(directory):
+                yield prefix + name, os.path.join(directory, name)
+
+    def collect_garbage(self) -> Tuple[int, int]:
+        """Supprime les blocs orphelins, renvoie (nombre, octets libérés)"""
+        with self._locked(exclusive=True):
+            return self._collect_garbage()
+
+    def _collect_garbage(self) -> Tuple[int, int]:
+        referenced = self.referenced_objects()
+        count = freed = 0
+        for digest, path in self._iter_object_files():
+            if digest not in referenced:
+                freed += os.path.getsize(path)
+                os.remove(path)
+                count += 1
+        return count, freed
+
+    def stats(self) -> Dict[str, int]:
+        """Occupation disque du stockage"""
+        with self._locked():
+            objects = disk_bytes = 0
+            for _, path in self._iter_object_files():
+                objects += 1
+                disk_bytes += os.path.getsize(path)
+            return {"snapshots": len(self.snapshot_ids()), "objects": objects, "bytes": disk_bytes}
+
+
+def get_backup_store() -> BackupStore:
+    """Stockage des backups configuré (BACKUP_DIR)"""
+    return BackupStore(settings.backup_dir)
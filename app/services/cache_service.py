@@ -0,0 +1,169 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+from app.config import settings
+
+
+class CacheBackend(ABC):
+    """Interface d'un backend de cache
+
+    Un backend partagé entre workers (Redis, memcached...) peut être branché
+    via `CacheService.configure` en implémentant ces méthodes.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Valeur de la clé, None si absente"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        """Enregistre la valeur de la clé"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Supprime la clé si elle existe"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Vide le cache"""
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs du backend (aucun par défaut)"""
+        return {}
+
+
+class LRUCacheBackend(CacheBackend):
+    """Cache LRU en mémoire, borné en nombre d'entrées et en octets"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return  # Trop gros pour le budget mémoire
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self._size -= len(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class CacheService:
+    """Cache des réponses sérialisées et des pages imprimables des semaines"""
+
+    backend: CacheBackend = LRUCacheBackend(
+        max_entries=settings.week_cache_max_entries,
+        max_bytes=settings.week_cache_max_bytes
+    )
+
+    @classmethod
+    def configure(cls, backend: CacheBackend) -> None:
+        """Remplace le backend (ex: cache partagé entre workers)"""
+        cls.backend = backend
+
+    @staticmethod
+    def _week_key(week_id: int) -> str:
+        return f"week:{week_id}"
+
+    @staticmethod
+    def _week_page_key(week_id: int) -> str:
+        return f"week-page:{week_id}"
+
+    @classmethod
+    def _get_versioned(cls, key: str, version: str) -> Optional[bytes]:
+        if not settings.week_cache_enabled:
+            return None
+        value = cls.backend.get(key)
+        if value is None:
+            return None
+        cached_version, _, content = value.partition(b"\0")
+        return content if cached_version == version.encode() else None
+
+    @classmethod
+    def _set_versioned(cls, key: str, version: str, content: bytes) -> None:
+        # Une entrée par semaine : la version précédente est remplacée
+        if settings.week_cache_enabled:
+            cls.backend.set(key, version.encode() + b"\0" + content)
+
+    @classmethod
+    def get_week(cls, week_id: int, revision: int) -> Optional[bytes]:
+        """Réponse sérialisée de la semaine, si elle l'a été pour cette révision
+
+        La révision fait partie de la clé : une réponse construite avant une
+        écriture, ou gardée par un autre worker, n'est jamais servie pour une
+        révision plus récente.
+        """
+        return cls._get_versioned(cls._week_key(week_id), f"r{revision}")
+
+    @classmethod
+    def set_week(cls, week_id: int, revision: int, payload: bytes) -> None:
+        cls._set_versioned(cls._week_key(week_id), f"r{revision}", payload)
+
+    @classmethod
+    def get_week_page(cls, week_id: int, version: str) -> Optional[bytes]:
+        """Page PDF rendue de la semaine, si elle l'a été pour cette version"""
+        return cls._get_versioned(cls._week_page_key(week_id), version)
+
+    @classmethod
+    def set_week_page(cls, week_id: int, version: str, content: bytes) -> None:
+        cls._set_versioned(cls._week_page_key(week_id), version, content)
+
+    @classmethod
+    def invalidate_week(cls, week_id: int) -> None:
+        """Libère les entrées de la semaine (la révision suffit à écarter une entrée périmée)"""
+        cls.backend.delete(cls._week_key(week_id))
+        cls.backend.delete(cls._week_page_key(week_id))
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.backend.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return cls.backend.stats()
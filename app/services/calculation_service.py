@@ -1,6 +1,15 @@
-from typing import List, Dict
+from typing import List, Dict, Iterable, Sequence, Tuple
+import numpy as np
 from app.models.slot import Slot
 from app.schemas.common import WeekTotals, CategoryRepartition
+from app.services.interval_index import IntervalIndex
+
+# Ordre des catégories dans les tableaux de répartition
+CATEGORY_CODES = ['a', 'p', 'e', 'c', 'o', 'l', 'm', 's']
+# Codes triés (recherche dichotomique) et leur position dans CATEGORY_CODES, pour le calcul par lots
+_SORTED_CODES = np.array(sorted(CATEGORY_CODES))
+_SORTED_POSITIONS = np.array([CATEGORY_CODES.index(code) for code in sorted(CATEGORY_CODES)])
+_INDETERMINE_INDEX = CATEGORY_CODES.index('m')  # Mise en place / Rangement
 
 
 class CalculationService:
@@ -49,26 +58,106 @@ class CalculationService:
         return CategoryRepartition(**repartition)
     
     @staticmethod
-    def check_slot_overlap(slots: List[Slot], new_slot: Slot, exclude_id: int = None) -> bool:
-        """Vérifie s'il y a chevauchement entre les créneaux"""
-        new_start = new_slot.start_min
-        new_end = new_slot.start_min + new_slot.duration_min
+    def slots_to_columns(slots: Iterable[Slot]) -> Tuple[List[int], List[int], List[int], List[str]]:
+        """Convertit des créneaux en colonnes (week_id, day_index, duration_min, category)"""
+        week_ids, day_indexes, durations, categories = [], [], [], []
+        for slot in slots:
+            week_ids.append(slot.week_id)
+            day_indexes.append(slot.day_index)
+            durations.append(slot.duration_min)
+            categories.append(slot.category)
+        return week_ids, day_indexes, durations, categories
+    
+    @staticmethod
+    def batch_minutes(week_ids: Sequence[int], day_indexes: Sequence[int],
+                      durations: Sequence[int], categories: Sequence[str],
+                      expected_weeks: Iterable[int] = ()) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Minutes par semaine, par jour et par catégorie, en une passe groupée NumPy
+        
+        Chaque créneau reçoit le rang de sa semaine (`np.unique`), puis les
+        minutes sont sommées par (semaine, jour) et (semaine, catégorie) avec
+        `bincount`, sans boucle Python par créneau. Renvoie les IDs de semaine
+        triés et deux tableaux (semaines × 7 jours, semaines × 8 catégories
+        dans l'ordre de CATEGORY_CODES) ; les semaines de `expected_weeks`
+        sans créneau ont des lignes nulles.
+        """
+        expected = np.fromiter(expected_weeks, dtype=np.int64)
+        weeks, ranks = np.unique(np.concatenate([expected, np.asarray(week_ids, dtype=np.int64)]),
+                                 return_inverse=True)
+        ranks = ranks[len(expected):]
+        count = len(weeks)
+        minutes = np.asarray(durations, dtype=np.int64)
         
+        # Index aplati rang * 7 + jour
+        days = np.asarray(day_indexes, dtype=np.int64)
+        per_day = np.bincount(ranks * 7 + days, weights=minutes, minlength=count * 7)
+        
+        # Position dans CATEGORY_CODES par recherche dichotomique ; codes inconnus écartés
+        # (deux caractères suffisent : un code plus long ou None ne correspond à aucun code)
+        codes = np.asarray(categories, dtype="U2")
+        positions = np.minimum(np.searchsorted(_SORTED_CODES, codes), len(_SORTED_CODES) - 1)
+        known = _SORTED_CODES[positions] == codes
+        per_category = np.bincount(
+            ranks[known] * len(CATEGORY_CODES) + _SORTED_POSITIONS[positions[known]],
+            weights=minutes[known], minlength=count * len(CATEGORY_CODES)
+        )
+        return (weeks, per_day.astype(np.int64).reshape(count, 7),
+                per_category.astype(np.int64).reshape(count, len(CATEGORY_CODES)))
+    
+    @staticmethod
+    def calculate_batch_totals(week_ids: Sequence[int], day_indexes: Sequence[int],
+                               durations: Sequence[int], categories: Sequence[str],
+                               expected_weeks: Iterable[int] = ()
+                               ) -> Dict[int, Tuple[WeekTotals, CategoryRepartition]]:
+        """Calcule totaux et répartition de plusieurs semaines en une seule passe
+        
+        Les créneaux sont fournis en colonnes ; les sommes viennent de
+        `batch_minutes`, converties en heures pour tout le lot à la fois. Les
+        semaines de `expected_weeks` sans créneau obtiennent des totaux nuls.
+        """
+        weeks, per_day, per_category = CalculationService.batch_minutes(
+            week_ids, day_indexes, durations, categories, expected_weeks
+        )
+        hours_per_day = (per_day / 60.0).tolist()
+        week_hours = (per_day.sum(axis=1) / 60.0).tolist()
+        hours_per_category = (per_category / 60.0).tolist()
+        
+        results = {}
+        for rank, week_id in enumerate(weeks.tolist()):
+            category_hours = hours_per_category[rank]
+            totals = WeekTotals(
+                per_day=hours_per_day[rank],
+                week_total=week_hours[rank],
+                indetermine=category_hours[_INDETERMINE_INDEX]
+            )
+            repartition = CategoryRepartition(**dict(zip(CATEGORY_CODES, category_hours)))
+            results[week_id] = (totals, repartition)
+        
+        return results
+    
+    @staticmethod
+    def find_slot_conflicts(slots: List[Slot], new_slot: Slot, exclude_id: int = None) -> List[Slot]:
+        """Renvoie tous les créneaux du même jour qui chevauchent le nouveau créneau"""
+        index = IntervalIndex()
         for slot in slots:
-            if exclude_id and slot.id == exclude_id:
-                continue
-                
-            if slot.day_index != new_slot.day_index:
-                continue
-                
-            slot_start = slot.start_min
-            slot_end = slot.start_min + slot.duration_min
-            
-            # Vérification du chevauchement
-            if (new_start < slot_end and new_end > slot_start):
-                return True
+            index.add(slot.day_index, slot.start_min, slot.start_min + slot.duration_min, slot)
         
-        return False
+        return index.conflicts(
+            new_slot.day_index,
+            new_slot.start_min,
+            new_slot.start_min + new_slot.duration_min,
+            exclude_id
+        )
+    
+    @staticmethod
+    def check_slot_overlap(slots: List[Slot], new_slot: Slot, exclude_id: int = None) -> bool:
+        """Vérifie s'il y a chevauchement entre les créneaux"""
+        return bool(CalculationService.find_slot_conflicts(slots, new_slot, exclude_id))
+    
+    @staticmethod
+    def format_conflicts(conflicts: List) -> str:
+        """Liste lisible des titres des créneaux en conflit"""
+        return ", ".join(f"'{slot.title}'" for slot in conflicts)
     
     @staticmethod
     def get_category_legend() -> Dict[str, Dict[str, str]]:
@@ -0,0 +1,104 @@
+from itertools import chain
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import Session
+from app.models.change_log import ChangeLog
+from app.models.employee import Employee
+from app.models.week import Week
+from app.models.slot import Slot
+from app.models.note import Note
+from app.services.simple_planning_service import SimplePlanningService
+
+ALL_TABLES = "*"
+
+
+def _tracked_entry(obj) -> Optional[Tuple[str, int]]:
+    """Ligne journalisée pour un objet ORM : un créneau ou une note modifie sa semaine"""
+    if isinstance(obj, (Slot, Note)):
+        return "weeks", obj.week_id
+    if isinstance(obj, Week):
+        return "weeks", obj.id
+    if isinstance(obj, Employee):
+        return "employees", obj.id
+    return None
+
+
+class ChangeLogService:
+    """Journal des modifications des employés et des semaines
+
+    Les écritures ORM sont journalisées automatiquement à chaque flush ; les
+    écritures en Core (insertions en masse) appellent `record`. Un créneau est
+    journalisé comme une modification de sa semaine : les backups incrémentaux
+    réexportent la semaine entière, ce qui couvre aussi les suppressions.
+
+    Chaque entrée porte le numéro de changement de sa transaction
+    (`SyncClock`) : les numéros sont visibles dans l'ordre des commits, le
+    curseur d'un backup ne laisse donc passer aucune transaction longue. Le
+    journal ne sert qu'aux incrémentaux qui suivent le dernier snapshot
+    complet : il est purgé à chaque snapshot complet et à chaque invalidation.
+    """
+
+    @staticmethod
+    def entries_statement(entries: Iterable[Tuple[str, Optional[int]]], change_id: int):
+        """Requête d'insertion des entrées (table, id) dans le journal"""
+        return insert(ChangeLog).values([
+            {"table_name": table_name, "row_id": row_id, "change_id": change_id} for table_name, row_id in entries
+        ])
+
+    @staticmethod
+    def _insert(connection, entries: Iterable[Tuple[str, Optional[int]]]) -> None:
+        """Journalise les entrées avec un nouveau numéro de changement"""
+        change_id = SimplePlanningService.next_change_id(connection)
+        connection.execute(ChangeLogService.entries_statement(entries, change_id))
+
+    @staticmethod
+    def record(db: Session, table_name: str, row_ids: Iterable[int]) -> None:
+        """Journalise des lignes écrites hors de l'ORM (dans la transaction en cours)"""
+        entries = [(table_name, row_id) for row_id in sorted(set(row_ids))]
+        if entries:
+            ChangeLogService._insert(db.connection(), entries)
+
+    @staticmethod
+    def mark_all_changed(db: Session) -> None:
+        """Invalide tout le journal (ex: après une restauration)
+
+        Les entrées existantes sont remplacées par le marqueur : un incrémental
+        dont le parent le précède devient complet, elles ne servent plus.
+        """
+        db.execute(delete(ChangeLog))
+        ChangeLogService._insert(db.connection(), [(ALL_TABLES, None)])
+
+    @staticmethod
+    def prune(db: Session, before: int) -> int:
+        """Supprime les entrées jusqu'au numéro (curseur du dernier snapshot complet)"""
+        return db.execute(delete(ChangeLog).where(ChangeLog.change_id <= before)).rowcount
+
+    @staticmethod
+    def all_changed_since(db: Session, since: int) -> bool:
+        """Vrai si toutes les tables ont été invalidées après le numéro de changement"""
+        return db.query(
+            select(ChangeLog.id).where(ChangeLog.table_name == ALL_TABLES, ChangeLog.change_id > since).exists()
+        ).scalar()
+
+    @staticmethod
+    def changed_ids_query(table_name: str, since: int):
+        """Sous-requête des identifiants modifiés après le numéro de changement"""
+        return select(ChangeLog.row_id).where(
+            ChangeLog.table_name == table_name, ChangeLog.change_id > since
+        ).distinct()
+
+    @staticmethod
+    def changed_ids(db: Session, table_name: str, since: int) -> List[int]:
+        """Identifiants modifiés après le numéro de changement"""
+        return sorted(db.scalars(ChangeLogService.changed_ids_query(table_name, since)))
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session: Session, flush_context) -> None:
+    entries = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        entry = _tracked_entry(obj)
+        if entry and entry[1] is not None:
+            entries.add(entry)
+    if entries:
+        ChangeLogService._insert(session.connection(), sorted(entries))
@@ -0,0 +1,195 @@
+import re
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.simple_slot import SimpleSlot
+from app.models.slot import Slot
+from app.models.week import Week
+from app.models.week_kind import WeekKindEnum
+from app.schemas.simple_slot import CoverageResponse, UnderstaffedInterval
+from app.services.reference_service import ReferenceService
+from app.services.week_grid import CELLS_PER_DAY, QUARTER_MIN, WeekGrid
+
+WEEK_CELLS = 7 * CELLS_PER_DAY
+
+OpeningHours = List[Optional[Tuple[int, int]]]
+
+_HOURS_RANGE = re.compile(r"^\s*(\d{1,2})(?:[:h](\d{2})?)?\s*-\s*(\d{1,2})(?:[:h](\d{2})?)?\s*$")
+
+
+class CoverageService:
+    """Nombre d'employés présents par quart d'heure sur une semaine
+
+    Les créneaux de tous les employés (SimpleSlot et Slot des semaines hors
+    semaines types) sont lus en une requête. Les créneaux de chaque employé
+    sont fusionnés en un masque de 7×96 bits (un employé compte une fois par
+    quart d'heure même si ses créneaux se chevauchent). Les masques sont
+    additionnés cellule par cellule avec des compteurs en tranches de bits :
+    le bit i de la tranche k vaut le bit k de l'effectif du quart d'heure i,
+    une addition coûte donc quelques opérations sur des entiers.
+    """
+
+    @staticmethod
+    def parse_hours_range(value) -> Optional[Tuple[int, int]]:
+        """Convertit "9-22", "9h30-22h" ou "09:30-22:00" en minutes [début, fin)"""
+        match = _HOURS_RANGE.match(value) if isinstance(value, str) else None
+        if not match:
+            return None
+        start_h, start_m, end_h, end_m = match.groups()
+        start = int(start_h) * 60 + int(start_m or 0)
+        end = int(end_h) * 60 + int(end_m or 0)
+        if not 0 <= start < end <= 1440:
+            return None
+        return start, end
+
+    @staticmethod
+    def parse_opening_hours(value) -> Optional[OpeningHours]:
+        """Horaires d'ouverture par jour à partir de `meta.opening_hours`
+
+        Accepte une plage unique pour toute la semaine ("9-22"), une liste de
+        7 plages ou un dictionnaire indexé par jour (0=lundi) ; une valeur
+        vide pour un jour signifie fermé.
+        """
+        if isinstance(value, str):
+            hours = CoverageService.parse_hours_range(value)
+            return [hours] * 7 if hours else None
+        if isinstance(value, list) and len(value) == 7:
+            return [CoverageService.parse_hours_range(day) for day in value]
+        if isinstance(value, dict):
+            return [CoverageService.parse_hours_range(value.get(str(day))) for day in range(7)]
+        return None
+
+    @staticmethod
+    def coverage_rows_query(week_start: date, type_kind_id: Optional[int]):
+        """Créneaux de tous les employés pour la semaine, en une requête (UNION ALL)"""
+        simple = select(
+            SimpleSlot.employee_id,
+            SimpleSlot.day_of_week.label("day_index"),
+            SimpleSlot.start_time.label("start_min"),
+            SimpleSlot.end_time.label("end_min"),
+            SimpleSlot.category
+        ).filter(SimpleSlot.date >= week_start, SimpleSlot.date < week_start + timedelta(days=7))
+
+        weekly = select(
+            Week.employee_id,
+            Slot.day_index,
+            Slot.start_min,
+            (Slot.start_min + Slot.duration_min).label("end_min"),
+            Slot.category
+        ).join(Week, Slot.week_id == Week.id).filter(Week.week_start_date == week_start)
+        if type_kind_id is not None:
+            weekly = weekly.filter(Week.kind_id != type_kind_id)
+
+        return union_all(simple, weekly)
+
+    @staticmethod
+    def _add(planes: List[int], mask: int) -> None:
+        """Ajoute 1 aux cellules du masque (compteurs en tranches de bits)"""
+        for weight, plane in enumerate(planes):
+            planes[weight] = plane ^ mask
+            mask &= plane  # Retenue
+            if not mask:
+                return
+        planes.append(mask)
+
+    @staticmethod
+    def _counts(planes: List[int]) -> List[List[int]]:
+        """Matrice 7×96 des compteurs en tranches de bits"""
+        cells = [0] * WEEK_CELLS
+        for weight, plane in enumerate(planes):
+            value = 1 << weight
+            for first, length in WeekGrid.runs(plane):
+                for cell in range(first, first + length):
+                    cells[cell] += value
+        return [cells[day * CELLS_PER_DAY:(day + 1) * CELLS_PER_DAY] for day in range(7)]
+
+    @staticmethod
+    def build_coverage(rows, opening_hours: OpeningHours, min_staff: int) -> dict:
+        """Matrice 7×96 des effectifs, par catégorie, et plages en sous-effectif"""
+        # Un masque de 7×96 bits par employé (et par employé et catégorie)
+        staff_masks: Dict[int, int] = {}
+        category_masks: Dict[tuple, int] = {}
+        for employee_id, day_index, start_min, end_min, category in rows:
+            if not 0 <= day_index < 7:
+                continue
+            first = max(start_min, 0) // QUARTER_MIN
+            last = min(-(-end_min // QUARTER_MIN), CELLS_PER_DAY)
+            if last <= first:
+                continue
+            mask = ((1 << (last - first)) - 1) << (day_index * CELLS_PER_DAY + first)
+            staff_masks[employee_id] = staff_masks.get(employee_id, 0) | mask
+            key = (category, employee_id)
+            category_masks[key] = category_masks.get(key, 0) | mask
+
+        planes: List[int] = []
+        for mask in staff_masks.values():
+            CoverageService._add(planes, mask)
+        staff = CoverageService._counts(planes)
+
+        category_planes: Dict[str, List[int]] = {}
+        for (category, _), mask in category_masks.items():
+            CoverageService._add(category_planes.setdefault(category, []), mask)
+        categories = {
+            category: CoverageService._counts(category_planes[category])
+            for category in sorted(category_planes)
+        }
+
+        # Quarts d'heure d'ouverture sous l'effectif minimal, fusionnés en plages
+        understaffed = []
+        for day_index, hours in enumerate(opening_hours):
+            if not hours:
+                continue
+            first, last = WeekGrid.cell_range(*hours)
+            cell = first
+            while cell < last:
+                if staff[day_index][cell] >= min_staff:
+                    cell += 1
+                    continue
+                start = cell
+                while cell < last and staff[day_index][cell] < min_staff:
+                    cell += 1
+                understaffed.append(UnderstaffedInterval(
+                    day_index=day_index,
+                    start_min=start * QUARTER_MIN,
+                    end_min=cell * QUARTER_MIN,
+                    staff=min(staff[day_index][start:cell])
+                ))
+
+        return {"staff": staff, "categories": categories, "understaffed": understaffed}
+
+    @staticmethod
+    def week_opening_hours(db: Session, week_start: date) -> OpeningHours:
+        """Horaires d'ouverture les plus fréquents parmi les semaines du lundi donné"""
+        candidates = Counter()
+        for (meta,) in db.query(Week.meta).filter(Week.week_start_date == week_start):
+            value = meta.get("opening_hours") if isinstance(meta, dict) else None
+            hours = CoverageService.parse_opening_hours(value)
+            if hours:
+                candidates[tuple(hours)] += 1
+        if candidates:
+            return list(candidates.most_common(1)[0][0])
+        return CoverageService.parse_opening_hours(settings.coverage_opening_hours) or [None] * 7
+
+    @staticmethod
+    def get_coverage(db: Session, week_start: date, min_staff: Optional[int] = None) -> CoverageResponse:
+        """Effectifs par quart d'heure de tous les employés pour une semaine"""
+        if week_start.weekday() != 0:
+            raise ValueError("week_start must be a Monday")
+        if min_staff is None:
+            min_staff = settings.coverage_min_staff
+
+        type_kind_id = ReferenceService.kind_id(db, WeekKindEnum.TYPE.value)
+        rows = db.execute(CoverageService.coverage_rows_query(week_start, type_kind_id)).all()
+        opening_hours = CoverageService.week_opening_hours(db, week_start)
+        coverage = CoverageService.build_coverage(rows, opening_hours, min_staff)
+
+        return CoverageResponse(
+            week_start=week_start,
+            resolution_min=QUARTER_MIN,
+            min_staff=min_staff,
+            opening_hours=[list(hours) if hours else None for hours in opening_hours],
+            **coverage
+        )
@@ -7,9 +7,12 @@ from app.schemas.employee import EmployeeCreate, EmployeeUpdate
 class EmployeeService:
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Employee]:
-        """Récupère tous les employés"""
-        return db.query(Employee).filter(Employee.active == True).offset(skip).limit(limit).all()
+    def get_all(db: Session, limit: int = 100, after_id: Optional[int] = None) -> List[Employee]:
+        """Récupère les employés actifs par ID croissant, après `after_id` (curseur)"""
+        query = db.query(Employee).filter(Employee.active == True)
+        if after_id is not None:
+            query = query.filter(Employee.id > after_id)
+        return query.order_by(Employee.id).limit(limit).all()
     
     @staticmethod
     def get_by_id(db: Session, employee_id: int) -> Optional[Employee]:
@@ -0,0 +1,214 @@
+from datetime import date
+from typing import IO, Iterator, List, Optional, Tuple
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, NamedStyle, PatternFill
+from sqlalchemy import Row, func, select
+from sqlalchemy.orm import Session
+from app.models.employee import Employee
+from app.models.note import Note
+from app.models.slot import Slot
+from app.models.week import Week
+from app.models.week_summary import WeekSummary, DAY_COLUMNS, CATEGORY_COLUMNS
+from app.schemas.common import WeekTotals, CategoryRepartition
+from app.services.calculation_service import CalculationService, CATEGORY_CODES
+from app.services.reference_service import ReferenceService
+from app.services.summary_service import SummaryService
+from app.services.week_service import WeekService, STREAM_YIELD_PER
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_CHUNK = 64 * 1024
+DAY_NAMES = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+
+
+def _format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class ExportService:
+    """Exports Excel des plannings
+
+    Le classeur est écrit en mode write-only d'openpyxl (les lignes partent
+    sur disque au fil de l'eau) à partir de semaines et créneaux lus en flux
+    (curseurs serveur) : la mémoire ne dépend pas du nombre de semaines
+    exportées. Les totaux viennent des résumés de semaine. Trois feuilles :
+    la grille (une ligne par jour, un créneau coloré par cellule), les totaux
+    et la répartition par semaine, et la légende des catégories.
+    """
+
+    @staticmethod
+    def season_range(season: int) -> Tuple[date, date]:
+        """Saison sportive : du 1er septembre au 31 août de l'année suivante"""
+        return date(season, 9, 1), date(season + 1, 8, 31)
+
+    @staticmethod
+    def export_filename(employee_slug: Optional[str] = None, season: Optional[int] = None,
+                        date_from: Optional[date] = None, date_to: Optional[date] = None) -> str:
+        """Nom du fichier exporté, d'après les filtres"""
+        parts = ["planning"]
+        if employee_slug:
+            parts.append(employee_slug)
+        if season is not None:
+            parts.append(f"{season}-{season + 1}")
+        else:
+            if date_from:
+                parts.append(date_from.isoformat())
+            if date_to:
+                parts.append(date_to.isoformat())
+        return "_".join(parts) + ".xlsx"
+
+    @staticmethod
+    def export_weeks_query(conditions: list):
+        """Semaines à exporter avec employé, résumé et heures notées (une ligne par semaine)"""
+        # Première note de la semaine (plus petit id), comme l'API et le rapport d'heures
+        noted_hours = select(Note.hours_total).where(Note.week_id == Week.id).order_by(
+            Note.id
+        ).limit(1).scalar_subquery()
+        return select(
+            Week.id, Week.employee_id, Week.week_start_date, Week.kind_id, Week.vacation_id, Week.revision,
+            Employee.fullname, noted_hours.label("noted_hours"),
+            WeekSummary.week_id.label("summary_week_id"),
+            *(getattr(WeekSummary, column) for column in DAY_COLUMNS + list(CATEGORY_COLUMNS.values())),
+            WeekSummary.total_min
+        ).outerjoin(Employee, Employee.id == Week.employee_id).outerjoin(
+            WeekSummary, WeekSummary.week_id == Week.id
+        ).filter(*conditions).order_by(Week.week_start_date, Week.id)
+
+    @staticmethod
+    def export_slots_query(conditions: list):
+        """Créneaux des semaines à exporter, dans l'ordre des semaines puis des jours"""
+        return select(
+            Slot.week_id, Slot.day_index, Slot.start_min, Slot.duration_min, Slot.title, Slot.category
+        ).join(Week, Slot.week_id == Week.id).filter(*conditions).order_by(
+            Week.week_start_date, Week.id, Slot.day_index, Slot.start_min
+        )
+
+    @staticmethod
+    def iter_weeks(db: Session, conditions: list) -> Iterator[Tuple[Row, List[Row]]]:
+        """Parcourt les semaines et leurs créneaux par deux curseurs serveur triés à l'identique
+
+        Les lignes sont lues en Core (sans objets ORM) par lots de
+        STREAM_YIELD_PER ; les créneaux sont rattachés à leur semaine par
+        fusion des deux flux.
+        """
+        weeks = db.execute(ExportService.export_weeks_query(conditions).execution_options(
+            yield_per=STREAM_YIELD_PER))
+        slots = iter(db.execute(ExportService.export_slots_query(conditions).execution_options(
+            yield_per=STREAM_YIELD_PER)))
+        pending = next(slots, None)
+        for week in weeks:
+            week_slots = []
+            while pending is not None and pending.week_id == week.id:
+                week_slots.append(pending)
+                pending = next(slots, None)
+            yield week, week_slots
+
+    @staticmethod
+    def week_calculations(week: Row, slots: List[Row]) -> Tuple[WeekTotals, CategoryRepartition]:
+        """Totaux et répartition d'une semaine lue par `iter_weeks` (résumé, sinon calcul)"""
+        if week.summary_week_id is not None:
+            return SummaryService.calculations(week)
+        return CalculationService.calculate_batch_totals(
+            *CalculationService.slots_to_columns(slots), expected_weeks=[week.id]
+        )[week.id]
+
+    @staticmethod
+    def write_weeks_xlsx(db: Session, fileobj: IO[bytes], employee_id: Optional[int] = None,
+                         kind: Optional[str] = None, vacation: Optional[str] = None,
+                         date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+        """Écrit les semaines filtrées dans un classeur Excel ; renvoie le nombre de semaines"""
+        legend = CalculationService.get_category_legend()
+        workbook = Workbook(write_only=True)
+        planning = workbook.create_sheet("Planning")
+        totals = workbook.create_sheet("Totaux")
+        legend_sheet = workbook.create_sheet("Légende")
+
+        bold = Font(bold=True)
+        # Un style nommé par catégorie : affecté par nom, sans recalcul du style à chaque cellule
+        styles = {}
+        for code, entry in legend.items():
+            style = NamedStyle(name=entry["label"],
+                               fill=PatternFill(fill_type="solid", start_color=entry["color"].lstrip("#")))
+            workbook.add_named_style(style)
+            styles[code] = style.name
+
+        def header(sheet, titles):
+            cells = []
+            for title in titles:
+                cell = WriteOnlyCell(sheet, value=title)
+                cell.font = bold
+                cells.append(cell)
+            return cells
+
+        # Largeurs et en-têtes : à définir avant la première ligne en mode write-only
+        for column, width in (("A", 24), ("B", 12), ("C", 11), ("D", 8)):
+            planning.column_dimensions[column].width = width
+        planning.freeze_panes = "E2"
+        planning.append(header(planning, ["Employé", "Semaine", "Jour", "Heures", "Créneaux"]))
+
+        totals.column_dimensions["A"].width = 24
+        totals.column_dimensions["B"].width = 12
+        totals.freeze_panes = "C2"
+        totals.append(header(totals, [
+            "Employé", "Semaine", "Type", "Vacances", *DAY_NAMES, "Total", "Indéterminé",
+            *(legend[code]["label"] for code in CATEGORY_CODES), "Heures notées"
+        ]))
+
+        legend_sheet.column_dimensions["B"].width = 28
+        legend_sheet.append(header(legend_sheet, ["Code", "Catégorie"]))
+        for code in CATEGORY_CODES:
+            cell = WriteOnlyCell(legend_sheet, value=code)
+            cell.style = styles[code]
+            legend_sheet.append([cell, legend[code]["label"]])
+
+        count = 0
+        reference_ids = ReferenceService.resolve(db, kind, vacation)
+        if reference_ids is not None:
+            kind_names = ReferenceService.kind_names(db)
+            vacation_names = ReferenceService.vacation_names(db)
+            conditions = WeekService.week_filters(employee_id, *reference_ids, None, date_from, date_to)
+
+            for week, slots in ExportService.iter_weeks(db, conditions):
+                week_totals, repartition = ExportService.week_calculations(week, slots)
+                employee = week.fullname or str(week.employee_id)
+
+                days = [[] for _ in range(7)]
+                for slot in slots:
+                    days[slot.day_index].append(slot)
+                for day_index, day_slots in enumerate(days):
+                    cells = []
+                    for slot in day_slots:
+                        cell = WriteOnlyCell(planning, value=(
+                            f"{_format_minutes(slot.start_min)}-"
+                            f"{_format_minutes(slot.start_min + slot.duration_min)} {slot.title}"
+                        ))
+                        if slot.category in styles:
+                            cell.style = styles[slot.category]
+                        cells.append(cell)
+                    planning.append([employee, week.week_start_date, DAY_NAMES[day_index],
+                                     week_totals.per_day[day_index], *cells])
+
+                totals.append([
+                    employee, week.week_start_date, kind_names.get(week.kind_id),
+                    vacation_names.get(week.vacation_id) if week.vacation_id else None,
+                    *week_totals.per_day, week_totals.week_total, week_totals.indetermine,
+                    *(getattr(repartition, code) for code in CATEGORY_CODES),
+                    float(week.noted_hours) if week.noted_hours is not None else None
+                ])
+                count += 1
+
+        workbook.save(fileobj)
+        return count
+
+    @staticmethod
+    def iter_file(fileobj: IO[bytes], chunk_size: int = EXPORT_CHUNK) -> Iterator[bytes]:
+        """Relit un fichier exporté par morceaux, puis le ferme"""
+        try:
+            fileobj.seek(0)
+            while True:
+                chunk = fileobj.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            fileobj.close()
@@ -1,60 +1,104 @@
+import hashlib
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models.week_kind import WeekKind, WeekKindEnum
 from app.models.vacation_period import VacationPeriod, VacationPeriodEnum
 from app.models.simple_slot import SimpleSlot
-from app.database import Base, engine
+from app.models.simple_slot_tombstone import SimpleSlotTombstone
+from app.models.sync_clock import SyncClock
+from app.models.change_log import ChangeLog
+from app.models.app_metadata import AppMetadata
+from app.models.week_summary import WeekSummary
+from app.database import Base
+from app.services.summary_service import SummaryService
+
+INIT_MARKER_KEY = "init_marker"
+
+WEEK_KINDS = [
+    {"id": 1, "kind": WeekKindEnum.TYPE},
+    {"id": 2, "kind": WeekKindEnum.CURRENT},
+    {"id": 3, "kind": WeekKindEnum.NEXT},
+    {"id": 4, "kind": WeekKindEnum.VACATION},
+]
+
+VACATION_PERIODS = [
+    {"id": 1, "period": VacationPeriodEnum.TOUSSAINT.value},
+    {"id": 2, "period": VacationPeriodEnum.NOEL.value},
+    {"id": 3, "period": VacationPeriodEnum.PAQUES.value},
+    {"id": 4, "period": VacationPeriodEnum.ETE.value},
+]
 
 
 class InitService:
     
+    @staticmethod
+    def init_marker() -> str:
+        """Empreinte du schéma des modèles et des données de référence"""
+        digest = hashlib.sha256()
+        for table in sorted(Base.metadata.tables.values(), key=lambda table: table.name):
+            digest.update(table.name.encode())
+            for column in table.columns:
+                digest.update(f"{column.name}:{column.type}:{column.nullable}".encode())
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                digest.update(f"{index.name}:{[column.name for column in index.columns]}".encode())
+        digest.update(repr(WEEK_KINDS + VACATION_PERIODS).encode())
+        return digest.hexdigest()[:32]
+    
+    @staticmethod
+    def is_initialized(db: Session) -> bool:
+        """Vrai si le marqueur enregistré correspond au code (une seule requête)"""
+        try:
+            stored = db.query(AppMetadata.value).filter(AppMetadata.key == INIT_MARKER_KEY).scalar()
+        except SQLAlchemyError:
+            db.rollback()  # Table absente : base jamais initialisée
+            return False
+        return stored == InitService.init_marker()
+    
+    @staticmethod
+    def _insert_missing(db: Session, model, rows) -> None:
+        """Insère les lignes absentes en une requête (ON CONFLICT DO NOTHING)"""
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            existing = set(db.scalars(select(model.id)))
+            missing = [row for row in rows if row["id"] not in existing]
+            if missing:
+                db.execute(insert(model), missing)
+            return
+        db.execute(dialect_insert(model).values(rows).on_conflict_do_nothing())
+    
     @staticmethod
     def init_reference_data(db: Session):
-        """Initialise les données de référence si elles n'existent pas"""
+        """Initialise les tables et les données de référence si nécessaire
+        
+        Au démarrage, une seule requête lit le marqueur d'initialisation : s'il
+        correspond à l'empreinte du schéma et des données de référence, rien
+        d'autre n'est exécuté.
+        """
         
         try:
+            if settings.fast_startup and InitService.is_initialized(db):
+                print("✅ Schéma et données de référence à jour")
+                return
+            
             # Créer toutes les tables si elles n'existent pas
             print("🏗️ Création des tables...")
-            Base.metadata.create_all(bind=engine)
-            
-            # Vérifier si les données existent déjà
-            existing_kinds = db.query(WeekKind).count()
-            existing_vacations = db.query(VacationPeriod).count()
-            
-            if existing_kinds > 0 and existing_vacations > 0:
-                print("✅ Les données de référence existent déjà")
-                return  # Données déjà présentes
+            summaries_missing = not inspect(db.get_bind()).has_table(WeekSummary.__tablename__)
+            Base.metadata.create_all(bind=db.get_bind())
+            if summaries_missing:
+                # Table des résumés créée sur une base existante : la remplir
+                print("🧮 Calcul des résumés de semaine...")
+                SummaryService.rebuild(db)
             
             print("🚀 Initialisation des données de référence...")
-            
-            # Créer les WeekKind si nécessaire
-            if existing_kinds == 0:
-                week_kinds = [
-                    WeekKind(id=1, kind="type"),
-                    WeekKind(id=2, kind="current"),
-                    WeekKind(id=3, kind="next"),
-                    WeekKind(id=4, kind="vacation")
-                ]
-                
-                for kind in week_kinds:
-                    existing = db.query(WeekKind).filter(WeekKind.id == kind.id).first()
-                    if not existing:
-                        db.add(kind)
-                        print(f"  ✅ WeekKind ajouté: {kind.kind} (ID: {kind.id})")
-            
-            # Créer les VacationPeriod si nécessaire
-            if existing_vacations == 0:
-                vacation_periods = [
-                    VacationPeriod(id=1, period="Toussaint"),
-                    VacationPeriod(id=2, period="Noel"),
-                    VacationPeriod(id=3, period="Paques"),
-                    VacationPeriod(id=4, period="Ete")
-                ]
-                
-                for period in vacation_periods:
-                    existing = db.query(VacationPeriod).filter(VacationPeriod.id == period.id).first()
-                    if not existing:
-                        db.add(period)
-                        print(f"  ✅ VacationPeriod ajouté: {period.period} (ID: {period.id})")
+            InitService._insert_missing(db, WeekKind, WEEK_KINDS)
+            InitService._insert_missing(db, VacationPeriod, VACATION_PERIODS)
+            db.merge(AppMetadata(key=INIT_MARKER_KEY, value=InitService.init_marker()))
             
             # Commit les changements
             db.commit()
@@ -63,4 +107,4 @@ class InitService:
         except Exception as e:
             print(f"❌ Erreur lors de l'initialisation des données de référence: {e}")
             db.rollback()
-            # Ne pas lever l'exception pour ne pas empêcher le démarrage de l'app
\ No newline at end of file
+            # Ne pas lever l'exception pour ne pas empêcher le démarrage de l'app
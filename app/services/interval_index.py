@@ -0,0 +1,110 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+
+class _Bucket:
+    """Intervalles [start, end) d'une même clé, triés par début à la lecture"""
+
+    def __init__(self):
+        self.entries: List[tuple] = []  # (start, end, seq, item)
+        self.starts: List[int] = []
+        self.max_ends: List[int] = []  # Maximum cumulé des fins (monotone)
+        self.dirty = False
+
+    def refresh(self):
+        if self.dirty:
+            # Un seul tri après une série d'ajouts : O(n log n) pour construire le seau
+            self.entries.sort()
+            self.starts = [entry[0] for entry in self.entries]
+            self.max_ends = list(accumulate((entry[1] for entry in self.entries), max))
+            self.dirty = False
+
+
+class IntervalIndex:
+    """Intervalles rangés par clé, parcourus pour détecter les chevauchements
+
+    Les clés sont libres : (week_id, day_index) pour les `Slot`,
+    (employee_id, date) pour les `SimpleSlot`. Chaque seau est trié par
+    début ; une recherche le parcourt linéairement, entre deux bornes
+    trouvées par bisection (début avant la fin demandée, maximum cumulé des
+    fins après le début demandé). Le parcours reste O(n) dans le pire cas
+    pour les n intervalles de la clé : c'est un parcours borné, pas un arbre
+    d'intervalles.
+
+    L'index n'est pas persistant : les écritures le construisent (un tri par
+    seau) à partir des créneaux du jour, ou de la semaine pour un lot,
+    chargés en base. Le gain est de ne regarder que la clé concernée, et un
+    seul index pour tout un lot de créneaux.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._seq = 0
+
+    def add(self, key: Hashable, start: int, end: int, item: Any) -> None:
+        """Ajoute un intervalle [start, end) pour la clé"""
+        bucket = self._buckets.setdefault(key, _Bucket())
+        # Le compteur départage les débuts égaux sans comparer les items
+        bucket.entries.append((start, end, self._seq, item))
+        bucket.dirty = True
+        self._seq += 1
+
+    def remove(self, key: Hashable, item: Any) -> bool:
+        """Retire un item de l'index, renvoie False s'il est absent"""
+        bucket = self._buckets.get(key)
+        if not bucket:
+            return False
+        for position, entry in enumerate(bucket.entries):
+            if entry[3] is item:
+                del bucket.entries[position]
+                bucket.dirty = True
+                return True
+        return False
+
+    def conflicts(self, key: Hashable, start: int, end: int,
+                  exclude_id: Optional[int] = None) -> List[Any]:
+        """Renvoie tous les items dont l'intervalle chevauche [start, end)"""
+        bucket = self._buckets.get(key)
+        if not bucket or not bucket.entries:
+            return []
+        bucket.refresh()
+
+        # Candidats : début < end, et fin (cumulée) > start
+        hi = bisect_left(bucket.starts, end)
+        lo = bisect_right(bucket.max_ends, start, 0, hi)
+
+        results = []
+        for entry_start, entry_end, _, item in bucket.entries[lo:hi]:
+            if entry_end <= start:
+                continue
+            if exclude_id is not None and getattr(item, "id", None) == exclude_id:
+                continue
+            results.append(item)
+        return results
+
+    @classmethod
+    def for_slots(cls, slots: Iterable[Any]) -> "IntervalIndex":
+        """Construit un index des `Slot` par (week_id, day_index)"""
+        index = cls()
+        for slot in slots:
+            index.add(*cls.slot_interval(slot), slot)
+        return index
+
+    @classmethod
+    def for_simple_slots(cls, slots: Iterable[Any]) -> "IntervalIndex":
+        """Construit un index des `SimpleSlot` par (employee_id, date)"""
+        index = cls()
+        for slot in slots:
+            index.add(*cls.simple_slot_interval(slot), slot)
+        return index
+
+    @staticmethod
+    def slot_interval(slot: Any) -> tuple:
+        """Clé et intervalle d'un `Slot`"""
+        return (slot.week_id, slot.day_index), slot.start_min, slot.start_min + slot.duration_min
+
+    @staticmethod
+    def simple_slot_interval(slot: Any) -> tuple:
+        """Clé et intervalle d'un `SimpleSlot`"""
+        return (slot.employee_id, slot.date), slot.start_time, slot.end_time
@@ -0,0 +1,134 @@
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+
+
+class JobCancelled(Exception):
+    """Levée dans une tâche dont l'annulation a été demandée"""
+
+
+class Job:
+    """Tâche de fond : état, progression et demande d'annulation"""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "pending"
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.rows = 0
+        self.bytes = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def advance(self, rows: int = 0, bytes: int = 0) -> None:
+        """Ajoute à la progression ; point d'annulation de la tâche"""
+        self.rows += rows
+        self.bytes += bytes
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+
+class JobService:
+    """Exécution des backups et restaurations en arrière-plan
+
+    Les tâches tournent une à une, dans l'ordre de soumission, sur un thread
+    dédié avec leur propre session : deux backups, ou un backup et une
+    restauration, ne modifient jamais en même temps la base et le stockage.
+    Les suivantes attendent à l'état "pending". L'annulation est
+    coopérative : la tâche s'arrête au prochain appel de `Job.advance` (une
+    restauration annulée est entièrement annulée). L'état est conservé en
+    mémoire, par processus.
+    """
+
+    session_factory: Callable[[], Session] = SessionLocal
+    _executor: Optional[ThreadPoolExecutor] = None
+    _jobs: "OrderedDict[str, Job]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, session_factory: Callable[[], Session]) -> None:
+        """Remplace la fabrique de sessions des tâches"""
+        cls.session_factory = session_factory
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backup-job")
+            return cls._executor
+
+    @classmethod
+    def submit(cls, kind: str, task: Callable[[Session, Job], Dict[str, Any]],
+               cleanup: Optional[Callable[[], None]] = None) -> Job:
+        """Planifie une tâche `task(db, job)` et renvoie son suivi"""
+        job = Job(kind)
+        with cls._lock:
+            cls._jobs[job.id] = job
+            cls._prune()
+        cls._get_executor().submit(cls._run, job, task, cleanup)
+        return job
+
+    @classmethod
+    def _run(cls, job: Job, task: Callable[[Session, Job], Dict[str, Any]],
+             cleanup: Optional[Callable[[], None]]) -> None:
+        try:
+            if job.cancel_requested:
+                job.status = "cancelled"
+                return
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            db = cls.session_factory()
+            try:
+                job.result = task(db, job)
+                job.status = "succeeded"
+            except JobCancelled:
+                job.status = "cancelled"
+            except Exception as e:
+                print(f"❌ Tâche {job.kind} {job.id} en échec : {e}")
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                db.close()
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            if cleanup:
+                cleanup()
+
+    @classmethod
+    def _prune(cls) -> None:
+        """Oublie les plus anciennes tâches terminées au-delà de la limite"""
+        finished = [job_id for job_id, job in cls._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(cls._jobs) - settings.backup_jobs_retained)]:
+            del cls._jobs[job_id]
+
+    @classmethod
+    def get(cls, job_id: str) -> Optional[Job]:
+        """Récupère une tâche par son ID"""
+        return cls._jobs.get(job_id)
+
+    @classmethod
+    def list_jobs(cls) -> List[Job]:
+        """Récupère les tâches, de la plus récente à la plus ancienne"""
+        with cls._lock:
+            return list(reversed(cls._jobs.values()))
+
+    @classmethod
+    def cancel(cls, job_id: str) -> Optional[Job]:
+        """Demande l'annulation d'une tâche"""
+        job = cls._jobs.get(job_id)
+        if job and job.finished_at is None:
+            job._cancel.set()
+        return job
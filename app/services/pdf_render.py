@@ -0,0 +1,192 @@
+"""Rendu des pages PDF des plannings (exécuté dans les processus du pool)
+
+Chaque page est rendue seule sur un canvas reportlab jetable et renvoyée
+sous forme de flux de contenu PDF ; le document final rejoue ces flux
+(`assemble`). Les polices sont déclarées dans le même ordre sur tous les
+canvas pour que les noms internes (/F1, /F2) d'un flux restent valables dans
+n'importe quel document. Le module ne dépend que de reportlab : les pages
+arrivent sous forme de dictionnaires de valeurs simples.
+"""
+
+from datetime import date, timedelta
+from typing import IO, Dict, Iterable, List, Tuple
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+
+PAGE_SIZE = landscape(A4)
+PAGE_LAYOUT = "v1"  # À changer avec la mise en page : invalide les pages en cache
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+MARGIN = 28
+HOURS_WIDTH = 34
+HEADER_HEIGHT = 30
+FOOTER_HEIGHT = 64
+DAY_NAMES = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+UNKNOWN_COLOR = "#D9D9D9"
+GRID_COLOR = HexColor("#BFBFBF")
+
+# Légende : code catégorie -> (libellé, couleur hexadécimale)
+Legend = Dict[str, Tuple[str, str]]
+
+
+def _hours(hours: float) -> str:
+    minutes = round(hours * 60)
+    return f"{minutes // 60}h{minutes % 60:02d}"
+
+
+def _clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _fit(text: str, font: str, size: float, width: float) -> str:
+    """Tronque le texte à la largeur disponible"""
+    if stringWidth(text, font, size) <= width:
+        return text
+    while text and stringWidth(text + "…", font, size) > width:
+        text = text[:-1]
+    return text + "…" if text else ""
+
+
+def prepare_canvas(canvas: Canvas) -> None:
+    """Déclare les polices dans un ordre fixe (noms internes identiques partout)"""
+    canvas.setFont(FONT, 10)
+    canvas.setFont(FONT_BOLD, 10)
+
+
+def _lanes(slots: List[tuple]) -> Tuple[List[int], int]:
+    """Colonne de chaque créneau d'un jour (créneaux qui se chevauchent côte à côte)"""
+    ends: List[int] = []
+    lanes = []
+    for _, start, duration, _, _ in slots:
+        for lane, end in enumerate(ends):
+            if end <= start:
+                ends[lane] = start + duration
+                break
+        else:
+            lane = len(ends)
+            ends.append(start + duration)
+        lanes.append(lane)
+    return lanes, max(len(ends), 1)
+
+
+def draw_page(canvas: Canvas, page: dict, legend: Legend) -> None:
+    """Dessine une semaine : grille colorée des 7 jours, totaux et répartition"""
+    width, height = PAGE_SIZE
+    week_start: date = page["week_start"]
+    slots = sorted(page["slots"], key=lambda slot: (slot[0], slot[1]))
+
+    # Titre
+    canvas.setFillColor(HexColor("#000000"))
+    canvas.setFont(FONT_BOLD, 16)
+    canvas.drawString(MARGIN, height - MARGIN - 12, _fit(page["employee"], FONT_BOLD, 16, width / 2))
+    canvas.setFont(FONT, 11)
+    canvas.drawRightString(width - MARGIN, height - MARGIN - 12,
+                           f"Semaine du {week_start:%d/%m/%Y} au {week_start + timedelta(days=6):%d/%m/%Y}")
+
+    # Plage horaire affichée : au moins 8h-20h, étendue aux créneaux
+    first_hour = min([8] + [slot[1] // 60 for slot in slots])
+    last_hour = max([20] + [-(-(slot[1] + slot[2]) // 60) for slot in slots])
+    first_hour, last_hour = max(first_hour, 0), min(last_hour, 24)
+
+    left = MARGIN + HOURS_WIDTH
+    right = width - MARGIN
+    top = height - MARGIN - 24 - HEADER_HEIGHT
+    bottom = MARGIN + FOOTER_HEIGHT
+    day_width = (right - left) / 7
+    per_minute = (top - bottom) / ((last_hour - first_hour) * 60)
+
+    def y_of(minutes: int) -> float:
+        return top - (minutes - first_hour * 60) * per_minute
+
+    # En-têtes des jours avec leur total
+    for day in range(7):
+        x = left + day * day_width
+        canvas.setFillColor(HexColor("#000000"))
+        canvas.setFont(FONT_BOLD, 9)
+        canvas.drawCentredString(x + day_width / 2, top + 16,
+                                 f"{DAY_NAMES[day]} {week_start + timedelta(days=day):%d/%m}")
+        canvas.setFont(FONT, 8)
+        canvas.drawCentredString(x + day_width / 2, top + 5, _hours(page["per_day"][day]))
+
+    # Lignes des heures
+    canvas.setStrokeColor(GRID_COLOR)
+    canvas.setLineWidth(0.4)
+    canvas.setFont(FONT, 7)
+    for hour in range(first_hour, last_hour + 1):
+        y = y_of(hour * 60)
+        canvas.line(left, y, right, y)
+        canvas.setFillColor(HexColor("#000000"))
+        canvas.drawRightString(left - 4, y - 2.5, _clock(hour * 60))
+    for day in range(8):
+        canvas.line(left + day * day_width, top, left + day * day_width, bottom)
+
+    # Créneaux
+    canvas.setStrokeColor(HexColor("#FFFFFF"))
+    canvas.setLineWidth(0.6)
+    for day in range(7):
+        day_slots = [slot for slot in slots if slot[0] == day]
+        lanes, lane_count = _lanes(day_slots)
+        lane_width = day_width / lane_count
+        for (_, start, duration, title, category), lane in zip(day_slots, lanes):
+            x = left + day * day_width + lane * lane_width
+            y_top = y_of(max(start, first_hour * 60))
+            y_bottom = y_of(min(start + duration, last_hour * 60))
+            label_color = legend.get(category, (None, UNKNOWN_COLOR))[1]
+            canvas.setFillColor(HexColor(label_color))
+            canvas.rect(x, y_bottom, lane_width, y_top - y_bottom, fill=1, stroke=1)
+
+            canvas.setFillColor(HexColor("#000000"))
+            text_width = lane_width - 4
+            if y_top - y_bottom >= 9:
+                canvas.setFont(FONT_BOLD, 7)
+                canvas.drawString(x + 2, y_top - 8, _fit(title or "", FONT_BOLD, 7, text_width))
+            if y_top - y_bottom >= 17:
+                canvas.setFont(FONT, 6.5)
+                canvas.drawString(x + 2, y_top - 15.5,
+                                  _fit(f"{_clock(start)}-{_clock(start + duration)}", FONT, 6.5, text_width))
+
+    # Totaux et répartition par catégorie
+    canvas.setFillColor(HexColor("#000000"))
+    canvas.setFont(FONT_BOLD, 10)
+    canvas.drawString(MARGIN, bottom - 18,
+                      f"Total : {_hours(page['week_total'])}    Indéterminé : {_hours(page['indetermine'])}")
+    column_width = (width - 2 * MARGIN) / 4
+    canvas.setFont(FONT, 8)
+    for index, (code, hours) in enumerate(page["repartition"]):
+        label, label_color = legend.get(code, (code, UNKNOWN_COLOR))
+        x = MARGIN + (index % 4) * column_width
+        y = bottom - 36 - (index // 4) * 13
+        canvas.setFillColor(HexColor(label_color))
+        canvas.rect(x, y - 1, 8, 8, fill=1, stroke=0)
+        canvas.setFillColor(HexColor("#000000"))
+        canvas.drawString(x + 12, y, _fit(f"{label} : {_hours(hours)}", FONT, 8, column_width - 16))
+
+
+def render_page(page: dict, legend: Legend) -> bytes:
+    """Flux de contenu PDF d'une page"""
+    canvas = Canvas(None, pagesize=PAGE_SIZE)
+    prepare_canvas(canvas)
+    draw_page(canvas, page, legend)
+    return canvas.getCurrentPageContent().encode("latin-1")
+
+
+def render_pages(pages: List[dict], legend: Legend) -> List[bytes]:
+    """Rend un lot de pages (unité de travail envoyée au pool de processus)"""
+    return [render_page(page, legend) for page in pages]
+
+
+def assemble(fileobj: IO[bytes], contents: Iterable[bytes], title: str) -> int:
+    """Écrit le document à partir des flux de contenu ; renvoie le nombre de pages"""
+    document = Canvas(fileobj, pagesize=PAGE_SIZE, pageCompression=1)
+    document.setTitle(title)
+    document.setCreator("Planning API")
+    prepare_canvas(document)
+    count = 0
+    for content in contents:
+        document.addLiteral(content.decode("latin-1"))
+        document.showPage()
+        count += 1
+    document.save()
+    return count
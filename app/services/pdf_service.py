@@ -0,0 +1,147 @@
+import multiprocessing
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from itertools import repeat
+from typing import IO, List, Optional, Tuple
+from sqlalchemy import Row, func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.week import Week
+from app.services import pdf_render
+from app.services.cache_service import CacheService
+from app.services.calculation_service import CalculationService, CATEGORY_CODES
+from app.services.export_service import ExportService
+from app.services.reference_service import ReferenceService
+from app.services.week_service import WeekService
+
+PDF_MEDIA_TYPE = "application/pdf"
+
+
+class PdfService:
+    """Impression des plannings hebdomadaires en PDF (une page par semaine)
+
+    Chaque page est mise en cache (flux de contenu PDF) avec la version de la
+    semaine : révision, nom de l'employé et version de la mise en page. Une
+    réimpression ne rend que les semaines modifiées depuis. Au-delà de
+    PDF_POOL_MIN_PAGES pages à rendre, le rendu part dans un pool de
+    processus : le worker de l'API attend le résultat sans le calculer.
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def week_conditions(db: Session, employee_ids: Optional[List[int]] = None, kind: Optional[str] = None,
+                        vacation: Optional[str] = None, week_start: Optional[date] = None,
+                        date_from: Optional[date] = None, date_to: Optional[date] = None) -> Optional[list]:
+        """Conditions des semaines à imprimer ; None si un type ou une période n'existe pas"""
+        reference_ids = ReferenceService.resolve(db, kind, vacation)
+        if reference_ids is None:
+            return None
+        conditions = WeekService.week_filters(None, *reference_ids, week_start, date_from, date_to)
+        if employee_ids:
+            conditions.append(Week.employee_id.in_(employee_ids))
+        return conditions
+
+    @staticmethod
+    def count_weeks(db: Session, conditions: Optional[list]) -> int:
+        """Nombre de pages du document"""
+        if conditions is None:
+            return 0
+        return db.execute(select(func.count(Week.id)).filter(*conditions)).scalar()
+
+    @staticmethod
+    def print_filename(week_start: Optional[date] = None, date_from: Optional[date] = None,
+                       date_to: Optional[date] = None) -> str:
+        """Nom du fichier imprimé, d'après les dates demandées"""
+        parts = ["planning"]
+        for value in (week_start, date_from, date_to):
+            if value:
+                parts.append(value.isoformat())
+        return "_".join(parts) + ".pdf"
+
+    @staticmethod
+    def page_version(week: Row) -> str:
+        """Version de la page : change avec la semaine, le nom de l'employé ou la mise en page"""
+        fullname = week.fullname or ""
+        return f"r{week.revision}:{zlib.crc32(fullname.encode()):08x}:{pdf_render.PAGE_LAYOUT}"
+
+    @staticmethod
+    def page_data(week: Row, slots: List[Row]) -> dict:
+        """Données d'une page en valeurs simples (transmises aux processus de rendu)"""
+        week_totals, repartition = ExportService.week_calculations(week, slots)
+        return {
+            "employee": week.fullname or str(week.employee_id),
+            "week_start": week.week_start_date,
+            "slots": [(slot.day_index, slot.start_min, slot.duration_min, slot.title, slot.category)
+                      for slot in slots],
+            "per_day": list(week_totals.per_day),
+            "week_total": week_totals.week_total,
+            "indetermine": week_totals.indetermine,
+            "repartition": [(code, getattr(repartition, code)) for code in CATEGORY_CODES],
+        }
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                # spawn : pas de fork d'un processus qui a des threads et des connexions ouvertes
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=settings.pdf_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Arrête le pool de rendu (à l'arrêt de l'application)"""
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @classmethod
+    def render_pages(cls, pages: List[dict], legend: pdf_render.Legend) -> List[bytes]:
+        """Rend les pages, dans le pool de processus au-delà de PDF_POOL_MIN_PAGES"""
+        if settings.pdf_workers <= 0 or len(pages) < max(settings.pdf_pool_min_pages, 1):
+            return pdf_render.render_pages(pages, legend)
+
+        # Quelques lots par processus : répartition équilibrée sans un envoi par page
+        batch = -(-len(pages) // (settings.pdf_workers * 4))
+        batches = [pages[start:start + batch] for start in range(0, len(pages), batch)]
+        try:
+            results = cls._get_executor().map(pdf_render.render_pages, batches, repeat(legend))
+            return [content for contents in results for content in contents]
+        except BrokenProcessPool:
+            print("⚠️ Pool de rendu PDF interrompu, rendu dans le processus de l'API")
+            cls.shutdown()
+            return pdf_render.render_pages(pages, legend)
+
+    @classmethod
+    def write_weeks_pdf(cls, db: Session, fileobj: IO[bytes], conditions: Optional[list],
+                        title: str = "Planning") -> Tuple[int, int]:
+        """Écrit le document des semaines filtrées ; renvoie (pages, pages rendues hors cache)"""
+        legend = {code: (entry["label"], entry["color"])
+                  for code, entry in CalculationService.get_category_legend().items()}
+
+        # Pages en cache, ou données à rendre (None à leur place dans `contents`)
+        contents: List[Optional[bytes]] = []
+        missing: List[Tuple[int, int, str]] = []
+        pages: List[dict] = []
+        if conditions is not None:
+            for week, slots in ExportService.iter_weeks(db, conditions):
+                version = cls.page_version(week)
+                content = CacheService.get_week_page(week.id, version)
+                if content is None:
+                    missing.append((len(contents), week.id, version))
+                    pages.append(cls.page_data(week, slots))
+                contents.append(content)
+
+        if pages:
+            for (index, week_id, version), content in zip(missing, cls.render_pages(pages, legend)):
+                CacheService.set_week_page(week_id, version, content)
+                contents[index] = content
+
+        return pdf_render.assemble(fileobj, contents, title), len(pages)
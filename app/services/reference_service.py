@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models.week_kind import WeekKind
+from app.models.vacation_period import VacationPeriod
+
+MISS_REFRESH_SECONDS = 30.0
+
+
+class ReferenceService:
+    """Registre en mémoire des types de semaine et périodes de vacances
+
+    Les tables `week_kind` et `vacation_period` sont lues au démarrage (ou au
+    premier besoin) ; les noms sont ensuite convertis en IDs sans requête. Un
+    nom inconnu provoque un rechargement avant d'être considéré comme absent,
+    ce qui couvre les lignes ajoutées après coup, au plus une fois toutes les
+    MISS_REFRESH_SECONDS : des noms invalides répétés ne coûtent pas deux
+    requêtes chacun.
+    """
+
+    _kinds: Optional[Dict[str, int]] = None
+    _vacations: Optional[Dict[str, int]] = None
+    _refreshed_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def refresh(cls, db: Session) -> None:
+        """Recharge le registre depuis la base"""
+        kinds = {kind.value: kind_id for kind_id, kind in db.query(WeekKind.id, WeekKind.kind)}
+        vacations = dict(db.query(VacationPeriod.period, VacationPeriod.id).all())
+        with cls._lock:
+            cls._kinds, cls._vacations = kinds, vacations
+            cls._refreshed_at = time.monotonic()
+
+    @classmethod
+    def clear(cls) -> None:
+        """Vide le registre (rechargé au prochain accès)"""
+        with cls._lock:
+            cls._kinds = cls._vacations = None
+
+    @classmethod
+    def _lookup(cls, db: Session, attribute: str, name: str) -> Optional[int]:
+        mapping = getattr(cls, attribute)
+        stale = time.monotonic() - cls._refreshed_at >= MISS_REFRESH_SECONDS
+        if mapping is None or (name not in mapping and stale):
+            cls.refresh(db)
+            mapping = getattr(cls, attribute)
+        return mapping.get(name)
+
+    @classmethod
+    def kind_id(cls, db: Session, kind: str) -> Optional[int]:
+        """Récupère l'ID d'un type de semaine (type|current|next|vacation)"""
+        return cls._lookup(db, "_kinds", kind)
+
+    @classmethod
+    def vacation_id(cls, db: Session, period: str) -> Optional[int]:
+        """Récupère l'ID d'une période de vacances"""
+        return cls._lookup(db, "_vacations", period)
+
+    @classmethod
+    def kind_names(cls, db: Session) -> Dict[int, str]:
+        """Récupère les noms des types de semaine par ID"""
+        kinds = cls._kinds
+        if kinds is None:
+            cls.refresh(db)
+            kinds = cls._kinds
+        return {kind_id: kind for kind, kind_id in kinds.items()}
+
+    @classmethod
+    def vacation_names(cls, db: Session) -> Dict[int, str]:
+        """Récupère les noms des périodes de vacances par ID"""
+        vacations = cls._vacations
+        if vacations is None:
+            cls.refresh(db)
+            vacations = cls._vacations
+        return {vacation_id: period for period, vacation_id in vacations.items()}
+
+    @classmethod
+    def resolve(cls, db: Session, kind: Optional[str] = None,
+                vacation: Optional[str] = None) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        """Convertit des filtres par nom en IDs
+
+        Renvoie None si un nom demandé n'existe pas (aucune semaine ne peut
+        correspondre). Utilisable en asynchrone via `AsyncSession.run_sync`.
+        """
+        kind_id = cls.kind_id(db, kind) if kind else None
+        vacation_id = cls.vacation_id(db, vacation) if vacation else None
+        if (kind and kind_id is None) or (vacation and vacation_id is None):
+            return None
+        return kind_id, vacation_id
@@ -0,0 +1,186 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.note import Note
+from app.models.week import Week
+from app.models.week_kind import WeekKindEnum
+from app.models.week_summary import WeekSummary, CATEGORY_COLUMNS
+from app.schemas.report import EmployeeHours, HoursReport, PeriodHours
+from app.services.reference_service import ReferenceService
+
+REPORT_PERIODS = ("month", "week")
+
+
+def _hours(minutes) -> float:
+    return round((minutes or 0) / 60.0, 2)
+
+
+class _Totals:
+    """Accumulateur de minutes par catégorie et d'heures notées"""
+
+    def __init__(self):
+        self.categories: Dict[str, int] = defaultdict(int)
+        self.noted: Optional[float] = None
+        self.noted_planned = 0
+
+    def add_note(self, noted_hours, planned_minutes) -> None:
+        self.noted = (self.noted or 0.0) + float(noted_hours)
+        self.noted_planned += planned_minutes or 0
+
+    def fields(self) -> dict:
+        noted = round(self.noted, 2) if self.noted is not None else None
+        return {
+            "hours": _hours(sum(self.categories.values())),
+            "categories": {code: _hours(minutes) for code, minutes in sorted(self.categories.items())},
+            "noted_hours": noted,
+            "difference": round(_hours(self.noted_planned) - noted, 2) if noted is not None else None,
+        }
+
+
+class ReportService:
+    """Rapports d'heures agrégés en SQL
+
+    Les sommes sont calculées par la base (GROUP BY employé, période et
+    période de vacances) sur les résumés de semaine (`week_summaries`) : une
+    ligne par semaine est lue, quel que soit le volume de créneaux. Les
+    semaines, y compris celles des créneaux simples, sont rattachées à la
+    période de leur lundi ; les semaines types sont exclues.
+    """
+
+    @staticmethod
+    def period_expression(column, dialect: str, period: str):
+        """Clé de période d'une date : "YYYY-MM" (mois) ou lundi "YYYY-MM-DD" (semaine)"""
+        if dialect == "postgresql":
+            if period == "month":
+                return func.to_char(column, "YYYY-MM")
+            return func.to_char(func.date_trunc("week", column), "YYYY-MM-DD")
+        if dialect == "sqlite":
+            if period == "month":
+                return func.strftime("%Y-%m", column)
+            return func.date(column, "weekday 0", "-6 days")
+        raise ValueError(f"Reports are not supported on {dialect}")
+
+    @staticmethod
+    def _week_filter(date_from: date, date_to: date, employee_id: Optional[int], type_kind_id: Optional[int]):
+        conditions = [Week.week_start_date >= date_from, Week.week_start_date <= date_to]
+        if employee_id is not None:
+            conditions.append(Week.employee_id == employee_id)
+        if type_kind_id is not None:
+            conditions.append(Week.kind_id != type_kind_id)
+        return conditions
+
+    @staticmethod
+    def _category_sums() -> list:
+        return [func.sum(getattr(WeekSummary, column)) for column in CATEGORY_COLUMNS.values()]
+
+    @staticmethod
+    def slot_hours_query(dialect: str, period: str, date_from: date, date_to: date,
+                         employee_id: Optional[int] = None, type_kind_id: Optional[int] = None):
+        """Minutes par catégorie des semaines, par employé, période et vacances (résumés)"""
+        period_key = ReportService.period_expression(Week.week_start_date, dialect, period)
+        return select(
+            Week.employee_id, period_key, Week.vacation_id, *ReportService._category_sums()
+        ).join(Week, WeekSummary.week_id == Week.id).filter(
+            *ReportService._week_filter(date_from, date_to, employee_id, type_kind_id)
+        ).group_by(Week.employee_id, period_key, Week.vacation_id)
+
+    @staticmethod
+    def simple_slot_hours_query(dialect: str, period: str, date_from: date, date_to: date,
+                                employee_id: Optional[int] = None):
+        """Minutes par catégorie des créneaux simples, par employé et période (résumés)"""
+        period_key = ReportService.period_expression(WeekSummary.week_start_date, dialect, period)
+        query = select(
+            WeekSummary.employee_id, period_key, *ReportService._category_sums()
+        ).filter(
+            WeekSummary.week_id.is_(None),
+            WeekSummary.week_start_date >= date_from,
+            WeekSummary.week_start_date <= date_to
+        )
+        if employee_id is not None:
+            query = query.filter(WeekSummary.employee_id == employee_id)
+        return query.group_by(WeekSummary.employee_id, period_key)
+
+    @staticmethod
+    def noted_hours_query(dialect: str, period: str, date_from: date, date_to: date,
+                          employee_id: Optional[int] = None, type_kind_id: Optional[int] = None):
+        """Heures notées (Note.hours_total) et minutes planifiées des semaines notées
+
+        Comme dans l'API des semaines, seule la première note (plus petit id)
+        d'une semaine compte : une ligne par semaine, ses minutes planifiées ne
+        sont pas multipliées par le nombre de notes. Une semaine dont la
+        première note n'a pas d'heures n'est pas notée, même si une note
+        suivante en a : l'API n'affiche que la première.
+        """
+        conditions = ReportService._week_filter(date_from, date_to, employee_id, type_kind_id)
+        period_key = ReportService.period_expression(Week.week_start_date, dialect, period)
+        first_notes = select(func.min(Note.id).label("id")).group_by(Note.week_id).subquery()
+        return select(
+            Week.employee_id, period_key, Week.vacation_id,
+            func.sum(Note.hours_total), func.sum(func.coalesce(WeekSummary.total_min, 0))
+        ).join(Note, Note.week_id == Week.id).join(first_notes, first_notes.c.id == Note.id).outerjoin(
+            WeekSummary, WeekSummary.week_id == Week.id
+        ).filter(Note.hours_total.isnot(None), *conditions).group_by(
+            Week.employee_id, period_key, Week.vacation_id
+        )
+
+    @staticmethod
+    def hours_report(db: Session, date_from: date, date_to: date, employee_id: Optional[int] = None,
+                     period: str = "month") -> HoursReport:
+        """Heures par employé, par période et par période de vacances, comparées aux notes"""
+        if period not in REPORT_PERIODS:
+            raise ValueError(f"Invalid period: {period} (expected {'|'.join(REPORT_PERIODS)})")
+        if date_from > date_to:
+            raise ValueError("'from' must not be after 'to'")
+
+        dialect = db.get_bind().dialect.name
+        type_kind_id = ReferenceService.kind_id(db, WeekKindEnum.TYPE.value)
+        vacation_names = ReferenceService.vacation_names(db)
+
+        employees: Dict[int, _Totals] = defaultdict(_Totals)
+        periods: Dict[int, Dict[str, _Totals]] = defaultdict(lambda: defaultdict(_Totals))
+        vacations: Dict[int, Dict[str, _Totals]] = defaultdict(lambda: defaultdict(_Totals))
+
+        def targets(employee, period_key, vacation_id):
+            yield employees[employee]
+            yield periods[employee][period_key]
+            if vacation_id is not None:
+                yield vacations[employee][vacation_names.get(vacation_id, str(vacation_id))]
+
+        def add_categories(totals, minutes):
+            for code, category_minutes in zip(CATEGORY_COLUMNS, minutes):
+                if category_minutes:
+                    totals.categories[code] += category_minutes
+
+        for employee, period_key, vacation_id, *minutes in db.execute(ReportService.slot_hours_query(
+                dialect, period, date_from, date_to, employee_id, type_kind_id)):
+            for totals in targets(employee, period_key, vacation_id):
+                add_categories(totals, minutes)
+
+        for employee, period_key, *minutes in db.execute(ReportService.simple_slot_hours_query(
+                dialect, period, date_from, date_to, employee_id)):
+            for totals in targets(employee, period_key, None):
+                add_categories(totals, minutes)
+
+        for employee, period_key, vacation_id, noted, planned in db.execute(ReportService.noted_hours_query(
+                dialect, period, date_from, date_to, employee_id, type_kind_id)):
+            for totals in targets(employee, period_key, vacation_id):
+                totals.add_note(noted, planned)
+
+        return HoursReport(
+            date_from=date_from,
+            date_to=date_to,
+            period=period,
+            employees=[
+                EmployeeHours(
+                    employee_id=employee,
+                    periods=[PeriodHours(period=key, **totals.fields())
+                             for key, totals in sorted(periods[employee].items())],
+                    vacations=[PeriodHours(period=key, **totals.fields())
+                               for key, totals in sorted(vacations[employee].items())],
+                    **employees[employee].fields()
+                )
+                for employee in sorted(employees)
+            ]
+        )
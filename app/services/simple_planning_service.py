@@ -1,25 +1,65 @@
+from itertools import chain
 from typing import List, Optional
+from sqlalchemy import event, func, select, update
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
 from app.models.simple_slot import SimpleSlot
-from app.schemas.simple_slot import SimpleSlotCreate, SimpleSlotUpdate, WeekPlanningResponse
+from app.models.simple_slot_tombstone import SimpleSlotTombstone
+from app.models.sync_clock import SyncClock, SYNC_CLOCK_ID
+from app.schemas.simple_slot import SimpleSlotCreate, SimpleSlotUpdate, WeekPlanningResponse, PlanningChangesResponse
+from app.services.interval_index import IntervalIndex
 
 
 class SimplePlanningService:
     
     @staticmethod
-    def get_week_planning(db: Session, employee_id: int, week_start: date) -> WeekPlanningResponse:
-        """Récupère le planning d'une semaine pour un employé"""
-        
-        # Calculer la fin de semaine (dimanche)
+    def _check_overlap(existing_slots: List[SimpleSlot], slot, exclude_id: int = None):
+        """Lève une ValueError listant tous les créneaux qui chevauchent `slot`"""
+        index = IntervalIndex.for_simple_slots(existing_slots)
+        conflicts = index.conflicts(*IntervalIndex.simple_slot_interval(slot), exclude_id)
+        if len(conflicts) == 1:
+            raise ValueError(f"Chevauchement détecté avec le créneau '{conflicts[0].title}'")
+        if conflicts:
+            titles = ", ".join(f"'{existing.title}'" for existing in conflicts)
+            raise ValueError(f"Chevauchement détecté avec les créneaux {titles}")
+    
+    @staticmethod
+    def _week_filter(employee_id: int, week_start: date):
+        """Filtre des créneaux d'une semaine (du lundi au dimanche)"""
         week_end = week_start + timedelta(days=6)
-        
-        # Récupérer tous les créneaux de la semaine
-        slots = db.query(SimpleSlot).filter(
+        return (
             SimpleSlot.employee_id == employee_id,
             SimpleSlot.date >= week_start,
             SimpleSlot.date <= week_end
-        ).order_by(SimpleSlot.date, SimpleSlot.start_time).all()
+        )
+    
+    @staticmethod
+    def week_slots_query(employee_id: int, week_start: date):
+        """Requête des créneaux d'une semaine, triés par date et heure"""
+        return select(SimpleSlot).filter(
+            *SimplePlanningService._week_filter(employee_id, week_start)
+        ).order_by(SimpleSlot.date, SimpleSlot.start_time)
+    
+    @staticmethod
+    def week_etag_query(employee_id: int, week_start: date):
+        """Requête d'agrégat servant à dériver l'ETag d'une semaine"""
+        return select(
+            func.count(SimpleSlot.id),
+            func.coalesce(func.sum(SimpleSlot.id), 0),
+            func.coalesce(func.max(SimpleSlot.change_id), 0)
+        ).filter(*SimplePlanningService._week_filter(employee_id, week_start))
+    
+    @staticmethod
+    def format_week_etag(employee_id: int, week_start: date, row) -> str:
+        count, id_sum, last_change = row
+        return f'W/"planning-{employee_id}-{week_start.isoformat()}-{count}-{id_sum}-c{last_change}"'
+    
+    @staticmethod
+    def get_week_planning(db: Session, employee_id: int, week_start: date) -> WeekPlanningResponse:
+        """Récupère le planning d'une semaine pour un employé"""
+        slots = db.execute(
+            SimplePlanningService.week_slots_query(employee_id, week_start)
+        ).scalars().all()
         
         return WeekPlanningResponse(
             employee_id=employee_id,
@@ -27,24 +67,29 @@ class SimplePlanningService:
             slots=slots
         )
     
+    @staticmethod
+    def get_week_etag(db: Session, employee_id: int, week_start: date) -> str:
+        """ETag faible du planning d'une semaine
+        
+        Dérivé d'une seule requête d'agrégat (nombre, somme des IDs, plus grand
+        numéro de modification) : toute création ou modification reçoit un
+        numéro plus grand, dans l'ordre des commits, et une suppression change
+        le nombre. Contrairement à `updated_at`, deux écritures dans la même
+        seconde donnent deux ETags différents.
+        """
+        row = db.execute(SimplePlanningService.week_etag_query(employee_id, week_start)).one()
+        return SimplePlanningService.format_week_etag(employee_id, week_start, row)
+    
     @staticmethod
     def create_slot(db: Session, slot_data: SimpleSlotCreate, exclude_id: int = None) -> SimpleSlot:
         """Crée un nouveau créneau"""
         
-        # Vérifier les chevauchements
+        # Vérifier les chevauchements (en ignorant le créneau qu'on est en train de déplacer)
         existing_slots = db.query(SimpleSlot).filter(
             SimpleSlot.employee_id == slot_data.employee_id,
             SimpleSlot.date == slot_data.date
         ).all()
-        
-        for existing in existing_slots:
-            # Ignorer le créneau qu'on est en train de déplacer
-            if exclude_id and existing.id == exclude_id:
-                continue
-                
-            # Vérifier si les horaires se chevauchent
-            if not (slot_data.end_time <= existing.start_time or slot_data.start_time >= existing.end_time):
-                raise ValueError(f"Chevauchement détecté avec le créneau '{existing.title}'")
+        SimplePlanningService._check_overlap(existing_slots, slot_data, exclude_id)
         
         # Créer le créneau
         db_slot = SimpleSlot(**slot_data.dict())
@@ -73,10 +118,7 @@ class SimplePlanningService:
                 SimpleSlot.date == db_slot.date,
                 SimpleSlot.id != slot_id
             ).all()
-            
-            for existing in existing_slots:
-                if not (db_slot.end_time <= existing.start_time or db_slot.start_time >= existing.end_time):
-                    raise ValueError(f"Chevauchement détecté avec le créneau '{existing.title}'")
+            SimplePlanningService._check_overlap(existing_slots, db_slot)
         
         db.commit()
         db.refresh(db_slot)
@@ -90,11 +132,92 @@ class SimplePlanningService:
         if not db_slot:
             return False
         
+        # Garder une trace pour la synchronisation incrémentale
+        db.add(SimpleSlotTombstone(
+            slot_id=db_slot.id,
+            employee_id=db_slot.employee_id,
+            date=db_slot.date
+        ))
         db.delete(db_slot)
         db.commit()
         return True
     
+    @staticmethod
+    def next_change_id(connection) -> int:
+        """Réserve le numéro de changement suivant (dans la transaction en cours)
+        
+        L'UPDATE verrouille la ligne du compteur jusqu'au commit : une autre
+        transaction d'écriture attend ce commit pour obtenir le numéro suivant.
+        Les numéros deviennent donc visibles dans l'ordre croissant.
+        """
+        bump = update(SyncClock).where(SyncClock.id == SYNC_CLOCK_ID).values(value=SyncClock.value + 1)
+        if connection.execute(bump).rowcount == 0:
+            # Première écriture : créer la ligne (une création concurrente est ignorée)
+            dialect = connection.dialect.name
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            connection.execute(dialect_insert(SyncClock).values(id=SYNC_CLOCK_ID, value=0).on_conflict_do_nothing())
+            connection.execute(bump)
+        return connection.execute(select(SyncClock.value).where(SyncClock.id == SYNC_CLOCK_ID)).scalar_one()
+    
+    @staticmethod
+    def current_change_id(db: Session) -> int:
+        """Dernier numéro de changement validé"""
+        return db.execute(select(SyncClock.value).where(SyncClock.id == SYNC_CLOCK_ID)).scalar() or 0
+    
+    @staticmethod
+    def stamp_all(db: Session) -> None:
+        """Marque tous les créneaux comme modifiés (ex: après une restauration)"""
+        connection = db.connection()
+        change_id = SimplePlanningService.next_change_id(connection)
+        connection.execute(update(SimpleSlot).values(change_id=change_id))
+    
+    @staticmethod
+    def get_changes(db: Session, since: Optional[int] = None,
+                    employee_id: Optional[int] = None) -> PlanningChangesResponse:
+        """Récupère les créneaux modifiés et supprimés depuis un curseur
+        
+        Le curseur est le dernier numéro de changement validé (`SyncClock`).
+        Les numéros sont visibles dans l'ordre des commits : toute écriture
+        validée plus tard reçoit un numéro supérieur au curseur, quelle que
+        soit la durée de sa transaction. Les lignes au-delà du curseur, validées
+        entre les lectures, sont laissées à la synchronisation suivante.
+        """
+        cursor = SimplePlanningService.current_change_id(db)
+        if since is not None and since >= cursor:
+            return PlanningChangesResponse(cursor=since, slots=[], deleted=[])
+        
+        slots_query = db.query(SimpleSlot).filter(SimpleSlot.change_id <= cursor)
+        tombstones_query = db.query(SimpleSlotTombstone).filter(SimpleSlotTombstone.change_id <= cursor)
+        if since is not None:
+            slots_query = slots_query.filter(SimpleSlot.change_id > since)
+            tombstones_query = tombstones_query.filter(SimpleSlotTombstone.change_id > since)
+        if employee_id is not None:
+            slots_query = slots_query.filter(SimpleSlot.employee_id == employee_id)
+            tombstones_query = tombstones_query.filter(SimpleSlotTombstone.employee_id == employee_id)
+        
+        return PlanningChangesResponse(
+            cursor=cursor,
+            slots=slots_query.order_by(SimpleSlot.change_id, SimpleSlot.id).all(),
+            deleted=tombstones_query.order_by(SimpleSlotTombstone.change_id, SimpleSlotTombstone.id).all()
+        )
+    
     @staticmethod
     def get_slot_by_id(db: Session, slot_id: int) -> Optional[SimpleSlot]:
         """Récupère un créneau par son ID"""
-        return db.query(SimpleSlot).filter(SimpleSlot.id == slot_id).first()
\ No newline at end of file
+        return db.query(SimpleSlot).filter(SimpleSlot.id == slot_id).first()
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_sync_changes(session: Session, flush_context, instances) -> None:
+    """Numérote les créneaux simples écrits et les suppressions (un numéro par flush)"""
+    changed = [
+        obj for obj in chain(session.new, session.dirty)
+        if isinstance(obj, (SimpleSlot, SimpleSlotTombstone)) and session.is_modified(obj)
+    ]
+    if changed:
+        change_id = SimplePlanningService.next_change_id(session.connection())
+        for obj in changed:
+            obj.change_id = change_id
@@ -0,0 +1,352 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Date, bindparam, case, cast, delete, event, func, inspect, or_, select, type_coerce, update
+from sqlalchemy.orm import Session
+from app.models.week import Week
+from app.models.slot import Slot
+from app.models.simple_slot import SimpleSlot
+from app.models.week_summary import WeekSummary, DAY_COLUMNS, CATEGORY_COLUMNS
+from app.schemas.common import WeekTotals, CategoryRepartition
+from app.schemas.report import SummaryCheck
+
+# Colonnes cumulées, dans l'ordre des vecteurs de delta
+VALUE_COLUMNS = DAY_COLUMNS + list(CATEGORY_COLUMNS.values()) + ["total_min", "slot_count"]
+_CATEGORY_OFFSETS = {code: 7 + index for index, code in enumerate(CATEGORY_COLUMNS)}
+_TOTAL_OFFSET = len(VALUE_COLUMNS) - 2
+_COUNT_OFFSET = len(VALUE_COLUMNS) - 1
+
+# Champs dont dépend le résumé, par modèle de créneau
+_SLOT_FIELDS = ("week_id", "day_index", "duration_min", "category")
+_SIMPLE_SLOT_FIELDS = ("employee_id", "date", "day_of_week", "start_time", "end_time", "category")
+
+_UNKNOWN = object()
+
+# Clés des lignes de résumé : ("week", week_id) ou ("simple", employee_id, lundi)
+SummaryKey = Tuple
+
+
+def _dialect_insert(connection):
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif connection.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise ValueError(f"Week summaries are not supported on {connection.dialect.name}")
+    return dialect_insert
+
+
+def _monday(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+class SummaryService:
+    """Résumés matérialisés des semaines (table `week_summaries`)
+
+    Chaque écriture ORM de créneau (`Slot` ou `SimpleSlot`) applique au flush
+    le delta du créneau à sa ligne de résumé (INSERT ... ON CONFLICT DO UPDATE
+    avec `colonne = colonne + delta`), dans la même transaction : aucune
+    semaine n'est rescannée. Les écritures en Core (insertions en masse,
+    restauration) appellent `rebuild`. `check` recalcule tous les résumés en
+    SQL et les compare à la table.
+    """
+
+    @staticmethod
+    def monday_expression(column, dialect: str):
+        """Lundi de la semaine d'une date, en SQL"""
+        if dialect == "postgresql":
+            return cast(func.date_trunc("week", column), Date)
+        if dialect == "sqlite":
+            return type_coerce(func.date(column, "weekday 0", "-6 days"), Date)
+        raise ValueError(f"Week summaries are not supported on {dialect}")
+
+    @staticmethod
+    def calculations(summary: WeekSummary) -> Tuple[WeekTotals, CategoryRepartition]:
+        """Convertit un résumé en totaux et répartition (heures)"""
+        totals = WeekTotals(
+            per_day=[getattr(summary, column) / 60.0 for column in DAY_COLUMNS],
+            week_total=summary.total_min / 60.0,
+            indetermine=summary.m_min / 60.0  # Mise en place / Rangement
+        )
+        repartition = CategoryRepartition(
+            **{code: getattr(summary, column) / 60.0 for code, column in CATEGORY_COLUMNS.items()}
+        )
+        return totals, repartition
+
+    # Recalcul en masse
+
+    @staticmethod
+    def _aggregates(day, duration, category, row_id) -> list:
+        """Colonnes SUM(CASE ...) dans l'ordre de VALUE_COLUMNS"""
+        return [
+            *(func.coalesce(func.sum(case((day == index, duration), else_=0)), 0) for index in range(7)),
+            *(func.coalesce(func.sum(case((category == code, duration), else_=0)), 0) for code in CATEGORY_COLUMNS),
+            func.coalesce(func.sum(duration), 0),
+            func.count(row_id),
+        ]
+
+    @staticmethod
+    def week_summaries_query(week_ids: Optional[Iterable[int]] = None):
+        """Résumés recalculés des semaines (une ligne par semaine, même vide)"""
+        query = select(
+            Week.id, Week.employee_id, Week.week_start_date,
+            *SummaryService._aggregates(Slot.day_index, Slot.duration_min, Slot.category, Slot.id)
+        ).outerjoin(Slot, Slot.week_id == Week.id).group_by(Week.id, Week.employee_id, Week.week_start_date)
+        if week_ids is not None:
+            query = query.filter(Week.id.in_(list(week_ids)))
+        return query
+
+    @staticmethod
+    def simple_summaries_query(dialect: str, keys: Optional[Iterable[Tuple[int, date]]] = None):
+        """Résumés recalculés des créneaux simples, par employé et par lundi"""
+        monday = SummaryService.monday_expression(SimpleSlot.date, dialect)
+        query = select(
+            SimpleSlot.employee_id, monday,
+            *SummaryService._aggregates(SimpleSlot.day_of_week, SimpleSlot.end_time - SimpleSlot.start_time,
+                                        SimpleSlot.category, SimpleSlot.id)
+        ).group_by(SimpleSlot.employee_id, monday)
+        if keys is not None:
+            query = query.filter(or_(*(
+                (SimpleSlot.employee_id == employee_id) & SimpleSlot.date.between(start, start + timedelta(days=6))
+                for employee_id, start in keys
+            )))
+        return query
+
+    @staticmethod
+    def _rebuild(connection, week_ids: Optional[List[int]] = None,
+                 simple_keys: Optional[List[Tuple[int, date]]] = None, simple: bool = True) -> None:
+        """Remplace les résumés ciblés par leur recalcul (INSERT ... SELECT)"""
+        dialect = connection.dialect.name
+        columns = ["employee_id", "week_start_date"] + VALUE_COLUMNS
+
+        if week_ids is None:
+            connection.execute(delete(WeekSummary).where(WeekSummary.week_id.isnot(None)))
+        elif week_ids:
+            connection.execute(delete(WeekSummary).where(WeekSummary.week_id.in_(week_ids)))
+        if week_ids is None or week_ids:
+            connection.execute(WeekSummary.__table__.insert().from_select(
+                ["week_id"] + columns, SummaryService.week_summaries_query(week_ids)
+            ))
+
+        if not simple or simple_keys == []:
+            return
+        simple_rows = WeekSummary.week_id.is_(None)
+        if simple_keys is not None:
+            simple_rows &= or_(*(
+                (WeekSummary.employee_id == employee_id) & (WeekSummary.week_start_date == start)
+                for employee_id, start in simple_keys
+            ))
+        connection.execute(delete(WeekSummary).where(simple_rows))
+        connection.execute(WeekSummary.__table__.insert().from_select(
+            columns, SummaryService.simple_summaries_query(dialect, simple_keys)
+        ))
+
+    @staticmethod
+    def rebuild(db: Session, week_ids: Optional[Iterable[int]] = None) -> None:
+        """Recalcule les résumés (tous, ou seulement ceux des semaines données)
+
+        À appeler après des écritures de créneaux faites hors de l'ORM, dans
+        la transaction en cours.
+        """
+        if week_ids is None:
+            SummaryService._rebuild(db.connection())
+        else:
+            SummaryService._rebuild(db.connection(), sorted(set(week_ids)), simple=False)
+
+    @staticmethod
+    def check(db: Session, repair: bool = False) -> SummaryCheck:
+        """Compare la table des résumés à un recalcul complet en SQL
+
+        Les lignes absentes, différentes ou sans créneau correspondant sont
+        comptées ; `repair` reconstruit alors toute la table.
+        """
+        dialect = db.get_bind().dialect.name
+        expected: Dict[SummaryKey, tuple] = {}
+        for week_id, *values in db.execute(SummaryService.week_summaries_query()):
+            expected[("week", week_id)] = tuple(values)
+        for employee_id, start, *values in db.execute(SummaryService.simple_summaries_query(dialect)):
+            expected[("simple", employee_id, start)] = (employee_id, start, *values)
+
+        stored: Dict[SummaryKey, tuple] = {}
+        stored_columns = [getattr(WeekSummary, column) for column in ["employee_id", "week_start_date"] + VALUE_COLUMNS]
+        for week_id, *values in db.execute(select(WeekSummary.week_id, *stored_columns)):
+            key = ("week", week_id) if week_id is not None else ("simple", values[0], values[1])
+            stored[key] = tuple(values)
+
+        missing = sum(1 for key in expected if key not in stored)
+        orphaned = sum(1 for key in stored if key not in expected)
+        stale = sum(1 for key, values in expected.items() if key in stored and stored[key] != values)
+
+        repaired = False
+        if repair and (missing or orphaned or stale):
+            SummaryService.rebuild(db)
+            db.commit()
+            repaired = True
+            print(f"🔧 Résumés reconstruits ({missing} manquants, {stale} incorrects, {orphaned} orphelins)")
+
+        return SummaryCheck(checked=len(expected), missing=missing, stale=stale,
+                            orphaned=orphaned, repaired=repaired)
+
+    # Maintenance incrémentale
+
+    @staticmethod
+    def _delta(values: dict, day: int, duration: int, sign: int) -> List[int]:
+        delta = [0] * len(VALUE_COLUMNS)
+        delta[day] = sign * duration
+        offset = _CATEGORY_OFFSETS.get(values["category"])
+        if offset is not None:
+            delta[offset] = sign * duration
+        delta[_TOTAL_OFFSET] = sign * duration
+        delta[_COUNT_OFFSET] = sign
+        return delta
+
+    @staticmethod
+    def slot_contribution(obj, values: dict, sign: int) -> Tuple[SummaryKey, List[int]]:
+        """Clé de résumé et delta d'un créneau (sign=1 ajout, -1 retrait)"""
+        if isinstance(obj, Slot):
+            return ("week", values["week_id"]), SummaryService._delta(
+                values, values["day_index"], values["duration_min"], sign)
+        return ("simple", values["employee_id"], _monday(values["date"])), SummaryService._delta(
+            values, values["day_of_week"], values["end_time"] - values["start_time"], sign)
+
+    @staticmethod
+    def apply_deltas(connection, deltas: Dict[SummaryKey, List[int]]) -> None:
+        """Ajoute les deltas aux lignes de résumé (créées au besoin), en une requête par type de ligne"""
+        dialect_insert = _dialect_insert(connection)
+
+        week_ids = [key[1] for key in deltas if key[0] == "week"]
+        weeks = {}
+        if week_ids:
+            weeks = {row.id: row for row in connection.execute(
+                select(Week.id, Week.employee_id, Week.week_start_date).where(Week.id.in_(week_ids))
+            )}
+        week_rows, simple_rows = [], []
+        for key, delta in deltas.items():
+            values = dict(zip(VALUE_COLUMNS, delta))
+            if key[0] == "week":
+                week = weeks.get(key[1])
+                if week is not None:  # Semaine supprimée dans le même flush
+                    week_rows.append({"week_id": week.id, "employee_id": week.employee_id,
+                                      "week_start_date": week.week_start_date, **values})
+            else:
+                simple_rows.append({"week_id": None, "employee_id": key[1], "week_start_date": key[2], **values})
+
+        def upsert(**conflict):
+            statement = dialect_insert(WeekSummary)
+            return statement.on_conflict_do_update(**conflict, set_={
+                column: getattr(WeekSummary, column) + statement.excluded[column] for column in VALUE_COLUMNS
+            })
+
+        if week_rows:
+            connection.execute(upsert(index_elements=["week_id"]), week_rows)
+        if simple_rows:
+            connection.execute(upsert(index_elements=["employee_id", "week_start_date"],
+                                      index_where=WeekSummary.week_id.is_(None)), simple_rows)
+            # Une semaine simple sans créneau n'a pas de résumé
+            connection.execute(delete(WeekSummary).where(
+                WeekSummary.week_id.is_(None), WeekSummary.slot_count <= 0,
+                WeekSummary.employee_id.in_({row["employee_id"] for row in simple_rows})
+            ))
+
+
+def _values(obj, fields, previous: bool) -> Optional[dict]:
+    """Valeurs des champs d'un objet, avant (previous) ou après le flush ; None si inconnues"""
+    state = inspect(obj)
+    values = {}
+    for field in fields:
+        if previous:
+            history = state.attrs[field].history
+            if history.deleted:
+                value = history.deleted[0]
+            elif history.unchanged:
+                value = history.unchanged[0]
+            elif not history.added and field in state.dict:
+                value = state.dict[field]
+            else:
+                value = _UNKNOWN  # Ancienne valeur non chargée
+        else:
+            value = state.dict.get(field, _UNKNOWN)
+        if value is _UNKNOWN or value is None:
+            return None
+        values[field] = value
+    return values
+
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_flushed_slots(session: Session, flush_context) -> None:
+    deltas: Dict[SummaryKey, List[int]] = defaultdict(lambda: [0] * len(VALUE_COLUMNS))
+    rebuild_weeks, rebuild_simple, rebuild_all = set(), set(), False
+    deleted_weeks, moved_weeks = set(), []
+
+    def add(obj, values, sign):
+        key, delta = SummaryService.slot_contribution(obj, values, sign)
+        deltas[key] = [a + b for a, b in zip(deltas[key], delta)]
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Week):
+            if obj in session.new:
+                deltas[("week", obj.id)]  # Ligne à zéro pour une nouvelle semaine
+            elif obj in session.deleted:
+                deleted_weeks.add(obj.id)
+            elif _changed(obj, ("employee_id", "week_start_date")):
+                moved_weeks.append({"row_week_id": obj.id, "row_employee_id": obj.employee_id,
+                                    "row_week_start_date": obj.week_start_date})
+            continue
+        if isinstance(obj, Slot):
+            fields = _SLOT_FIELDS
+        elif isinstance(obj, SimpleSlot):
+            fields = _SIMPLE_SLOT_FIELDS
+        else:
+            continue
+
+        if obj in session.new:
+            previous, current = None, _values(obj, fields, previous=False)
+            known = current is not None
+        elif obj in session.deleted:
+            previous, current = _values(obj, fields, previous=True), None
+            known = previous is not None
+        elif _changed(obj, fields):
+            previous, current = _values(obj, fields, previous=True), _values(obj, fields, previous=False)
+            known = previous is not None and current is not None
+        else:
+            continue
+
+        if known:
+            if previous is not None:
+                add(obj, previous, -1)
+            if current is not None:
+                add(obj, current, 1)
+        elif current is not None and isinstance(obj, Slot) and not _changed(obj, ("week_id",)):
+            rebuild_weeks.add(current["week_id"])  # Ancien état inconnu : recalcul de la semaine
+        elif current is not None and isinstance(obj, SimpleSlot) and not _changed(obj, ("employee_id", "date")):
+            rebuild_simple.add((current["employee_id"], _monday(current["date"])))
+        else:
+            rebuild_all = True
+
+    if not (deltas or deleted_weeks or moved_weeks or rebuild_all or rebuild_weeks or rebuild_simple):
+        return
+
+    connection = session.connection()
+    for week_id in deleted_weeks:
+        deltas.pop(("week", week_id), None)
+    if deleted_weeks:
+        connection.execute(delete(WeekSummary).where(WeekSummary.week_id.in_(deleted_weeks)))
+    if moved_weeks:
+        table = WeekSummary.__table__
+        connection.execute(update(table).where(table.c.week_id == bindparam("row_week_id")).values(
+            employee_id=bindparam("row_employee_id"), week_start_date=bindparam("row_week_start_date")
+        ), moved_weeks)
+    if rebuild_all:
+        print("⚠️ Résumés de semaine recalculés (état précédent d'un créneau inconnu)")
+        SummaryService._rebuild(connection)
+        return
+    if deltas:
+        SummaryService.apply_deltas(connection, deltas)
+    if rebuild_weeks or rebuild_simple:
+        SummaryService._rebuild(connection, sorted(rebuild_weeks - deleted_weeks), sorted(rebuild_simple))
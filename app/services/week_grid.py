@@ -0,0 +1,97 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+from app.models.slot import Slot
+from app.services.calculation_service import CATEGORY_CODES
+
+QUARTER_MIN = 15
+CELLS_PER_DAY = 1440 // QUARTER_MIN  # 96 quarts d'heure
+EMPTY_CELL = ord('.')
+
+
+class WeekGrid:
+    """Semaine représentée en 7×96 quarts d'heure
+
+    Chaque jour est un entier dont le bit i indique si le quart d'heure i est
+    occupé ; un bytearray parallèle stocke le code catégorie de chaque cellule.
+    Les créneaux non alignés sont étendus aux quarts d'heure qu'ils touchent.
+    """
+
+    def __init__(self):
+        self.days: List[int] = [0] * 7
+        self.categories = bytearray([EMPTY_CELL]) * (7 * CELLS_PER_DAY)
+
+    @staticmethod
+    def cell_range(start_min: int, end_min: int) -> Tuple[int, int]:
+        """Cellules [first, last) couvertes par l'intervalle de minutes"""
+        first = max(start_min, 0) // QUARTER_MIN
+        last = min(-(-end_min // QUARTER_MIN), CELLS_PER_DAY)
+        return first, max(first, last)
+
+    @staticmethod
+    def mask(start_min: int, end_min: int) -> int:
+        """Masque de bits des cellules couvertes par [start_min, end_min)"""
+        first, last = WeekGrid.cell_range(start_min, end_min)
+        return ((1 << (last - first)) - 1) << first
+
+    @staticmethod
+    def runs(mask: int) -> Iterator[Tuple[int, int]]:
+        """Plages de bits consécutifs (première cellule, longueur) d'un masque"""
+        while mask:
+            first = (mask & -mask).bit_length() - 1
+            run = mask >> first
+            length = (~run & (run + 1)).bit_length() - 1
+            yield first, length
+            mask &= ~(((1 << length) - 1) << first)
+
+    @classmethod
+    def from_slots(cls, slots: Iterable[Slot]) -> "WeekGrid":
+        """Construit la grille à partir des créneaux d'une semaine (objets ou lignes)"""
+        grid = cls()
+        for slot in slots:
+            grid.add(slot.day_index, slot.start_min, slot.duration_min, slot.category)
+        return grid
+
+    def add(self, day_index: int, start_min: int, duration_min: int, category: str) -> None:
+        """Marque les cellules d'un créneau comme occupées"""
+        first, last = self.cell_range(start_min, start_min + duration_min)
+        self.days[day_index] |= self.mask(start_min, start_min + duration_min)
+        offset = day_index * CELLS_PER_DAY
+        self.categories[offset + first:offset + last] = category.encode()[:1] * (last - first)
+
+    def overlaps(self, day_index: int, start_min: int, duration_min: int) -> bool:
+        """Vrai si l'intervalle touche une cellule déjà occupée"""
+        return bool(self.days[day_index] & self.mask(start_min, start_min + duration_min))
+
+    def occupancy(self, day_index: int) -> int:
+        """Minutes occupées dans la journée"""
+        return self.days[day_index].bit_count() * QUARTER_MIN
+
+    def free_gaps(self, day_index: int, start_min: int = 0, end_min: int = 1440,
+                  min_duration: int = QUARTER_MIN) -> List[Tuple[int, int]]:
+        """Plages libres (début, durée) en minutes dans la fenêtre donnée"""
+        free = ~self.days[day_index] & self.mask(start_min, end_min)
+        return [
+            (first * QUARTER_MIN, length * QUARTER_MIN)
+            for first, length in self.runs(free)
+            if length * QUARTER_MIN >= min_duration
+        ]
+
+    def category_minutes(self) -> Dict[str, int]:
+        """Minutes occupées par catégorie sur la semaine, en quarts d'heure
+
+        Occupation de la grille (arrondie au quart d'heure, chevauchements
+        comptés une fois), pas les totaux d'heures : ceux-ci viennent des
+        résumés de semaine et de `CalculationService`, à la minute près.
+        """
+        return {code: self.categories.count(code.encode()) * QUARTER_MIN for code in CATEGORY_CODES}
+
+    def to_dict(self) -> Dict:
+        """Sérialisation compacte : une chaîne de 96 codes catégorie par jour"""
+        return {
+            "resolution_min": QUARTER_MIN,
+            "days": [
+                self.categories[day * CELLS_PER_DAY:(day + 1) * CELLS_PER_DAY].decode()
+                for day in range(7)
+            ],
+            "occupancy": [self.occupancy(day) for day in range(7)],
+            "categories": self.category_minutes(),
+        }
@@ -1,29 +1,38 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.orm import Session, joinedload, selectinload
 from datetime import date
 from app.models.week import Week
 from app.models.slot import Slot
 from app.models.note import Note
-from app.schemas.week import WeekCreate, WeekCreateSimple, WeekUpdate, WeekResponse
-from app.schemas.slot import SlotCreate, SlotUpdate
+from app.models.employee import Employee
+from app.models.week_kind import WeekKindEnum
+from app.schemas.week import WeekCreate, WeekCreateSimple, WeekUpdate, WeekResponse, WeekInstantiate, WeekInstantiateResult
+from app.schemas.slot import SlotCreate, SlotUpdate, SlotBatch
+from app.schemas.common import WeekTotals, CategoryRepartition
 from app.services.calculation_service import CalculationService
+from app.services.week_grid import WeekGrid
+from app.services.interval_index import IntervalIndex
+from app.services.cache_service import CacheService
+from app.services.change_log_service import ChangeLogService
+from app.services.reference_service import ReferenceService
+from app.services.summary_service import SummaryService
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_YIELD_PER = 500
 
 
 class WeekService:
     
     @staticmethod
-    def get_week_with_details(db: Session, week_id: int) -> Optional[WeekResponse]:
-        """Récupère une semaine avec tous ses détails et calculs"""
-        week = db.query(Week).filter(Week.id == week_id).first()
-        if not week:
-            return None
-        
-        slots = db.query(Slot).filter(Slot.week_id == week_id).all()
-        note = db.query(Note).filter(Note.week_id == week_id).first()
-        
-        # Calculs automatiques
-        totals = CalculationService.calculate_week_totals(slots)
-        repartition = CalculationService.calculate_category_repartition(slots)
+    def _build_week_response(week: Week, slots: List[Slot], note: Optional[Note],
+                             calculations: Optional[Tuple[WeekTotals, CategoryRepartition]] = None) -> WeekResponse:
+        """Assemble une WeekResponse à partir des lignes déjà chargées"""
+        if calculations:
+            totals, repartition = calculations
+        else:
+            totals = CalculationService.calculate_week_totals(slots)
+            repartition = CalculationService.calculate_category_repartition(slots)
         
         return WeekResponse(
             week=week,
@@ -34,44 +43,210 @@ class WeekService:
         )
     
     @staticmethod
-    def get_weeks(db: Session, employee_id: Optional[int] = None, 
-                  kind: Optional[str] = None, vacation: Optional[str] = None,
-                  week_start: Optional[date] = None) -> List[WeekResponse]:
-        """Récupère les semaines selon les filtres"""
-        query = db.query(Week)
+    def get_week_with_details(db: Session, week_id: int) -> Optional[WeekResponse]:
+        """Récupère une semaine avec tous ses détails et calculs
+        
+        Les totaux viennent du résumé maintenu de la semaine (`week_summaries`),
+        chargé avec elle ; à défaut ils sont recalculés depuis les créneaux.
+        """
+        week = db.query(Week).options(joinedload(Week.summary)).filter(Week.id == week_id).first()
+        if not week:
+            return None
+        
+        slots = db.query(Slot).filter(Slot.week_id == week_id).all()
+        note = db.query(Note).filter(Note.week_id == week_id).first()
         
+        return WeekService._build_week_response(week, slots, note, WeekService._summary_calculations(week))
+    
+    @staticmethod
+    def _summary_calculations(week: Week) -> Optional[Tuple[WeekTotals, CategoryRepartition]]:
+        """Totaux et répartition tirés du résumé chargé de la semaine, s'il existe"""
+        return SummaryService.calculations(week.summary) if week.summary is not None else None
+    
+    @staticmethod
+    def get_week_json(db: Session, week_id: int, revision: int) -> Optional[bytes]:
+        """Réponse sérialisée d'une semaine, servie depuis le cache si possible
+        
+        `revision` est la révision lue avant la construction (celle de l'ETag) :
+        le contenu construit ensuite est au moins aussi récent.
+        """
+        payload = CacheService.get_week(week_id, revision)
+        if payload is None:
+            week = WeekService.get_week_with_details(db, week_id)
+            if not week:
+                return None
+            payload = week.model_dump_json().encode()
+            CacheService.set_week(week_id, revision, payload)
+        return payload
+    
+    @staticmethod
+    def get_week_revision(db: Session, week_id: int) -> Optional[int]:
+        """Révision courante d'une semaine (None si elle n'existe pas)"""
+        return db.query(Week.revision).filter(Week.id == week_id).scalar()
+    
+    @staticmethod
+    def week_etag(week_id: int, revision: int) -> str:
+        """ETag faible d'une semaine, dérivé de son compteur de révision"""
+        return f'W/"week-{week_id}-r{revision}"'
+    
+    @staticmethod
+    def get_week_etag(db: Session, week_id: int) -> Optional[str]:
+        """ETag faible d'une semaine, dérivé de son compteur de révision"""
+        revision = WeekService.get_week_revision(db, week_id)
+        if revision is None:
+            return None
+        return WeekService.week_etag(week_id, revision)
+    
+    @staticmethod
+    def revision_bump(week_id: int):
+        """Requête incrémentant la révision d'une semaine"""
+        return update(Week).where(Week.id == week_id).values(
+            revision=Week.revision + 1
+        ).execution_options(synchronize_session=False)
+    
+    @staticmethod
+    def _bump_revision(db: Session, week_id: int):
+        """Incrémente la révision d'une semaine (dans la transaction en cours)"""
+        db.execute(WeekService.revision_bump(week_id))
+    
+    @staticmethod
+    def week_filters(employee_id: Optional[int] = None, kind_id: Optional[int] = None,
+                     vacation_id: Optional[int] = None, week_start: Optional[date] = None,
+                     date_from: Optional[date] = None, date_to: Optional[date] = None) -> list:
+        """Conditions de filtrage des semaines (types et périodes par ID)"""
+        conditions = []
         if employee_id:
-            query = query.filter(Week.employee_id == employee_id)
-        if kind:
-            # Jointure avec week_kind pour filtrer par type
-            query = query.join(Week.kind).filter(Week.kind.has(kind=kind))
-        if vacation:
-            # Jointure avec vacation_period pour filtrer par période
-            query = query.join(Week.vacation).filter(Week.vacation.has(period=vacation))
+            conditions.append(Week.employee_id == employee_id)
+        if kind_id is not None:
+            conditions.append(Week.kind_id == kind_id)
+        if vacation_id is not None:
+            conditions.append(Week.vacation_id == vacation_id)
         if week_start:
-            query = query.filter(Week.week_start_date == week_start)
+            conditions.append(Week.week_start_date == week_start)
+        if date_from:
+            conditions.append(Week.week_start_date >= date_from)
+        if date_to:
+            conditions.append(Week.week_start_date <= date_to)
+        return conditions
+    
+    @staticmethod
+    def weeks_query(employee_id: Optional[int] = None, kind_id: Optional[int] = None,
+                    vacation_id: Optional[int] = None, week_start: Optional[date] = None,
+                    date_from: Optional[date] = None, date_to: Optional[date] = None,
+                    after: Optional[Tuple[date, int]] = None, limit: Optional[int] = None):
+        """Requête des semaines filtrées, créneaux et notes chargés par lots (selectin)
+        
+        Le résumé de chaque semaine est chargé par jointure, dans la même requête.
+        Les types et périodes sont filtrés par ID (voir `ReferenceService.resolve`),
+        sans jointure ni sous-requête sur les tables de référence. Les semaines
+        sont triées par (week_start_date, id) ; `after` reprend après cette clé
+        (pagination par curseur, sans OFFSET).
+        """
+        query = select(Week).options(
+            selectinload(Week.slots),
+            selectinload(Week.notes),
+            joinedload(Week.summary)
+        ).filter(
+            *WeekService.week_filters(employee_id, kind_id, vacation_id, week_start, date_from, date_to)
+        ).order_by(Week.week_start_date, Week.id)
+        
+        if after:
+            query = query.filter(tuple_(Week.week_start_date, Week.id) > tuple_(*after))
+        if limit:
+            query = query.limit(limit)
+        
+        return query
+    
+    @staticmethod
+    def _build_week_responses(weeks: List[Week]) -> List[WeekResponse]:
+        """Assemble les réponses de semaines dont créneaux, notes et résumés sont chargés"""
+        calculations = {
+            week.id: WeekService._summary_calculations(week) for week in weeks if week.summary is not None
+        }
         
-        weeks = query.all()
+        # Semaines sans résumé : calculs en une seule passe sur leurs créneaux
+        missing = [week for week in weeks if week.summary is None]
+        if missing:
+            columns = CalculationService.slots_to_columns(
+                slot for week in missing for slot in week.slots
+            )
+            calculations.update(CalculationService.calculate_batch_totals(
+                *columns, expected_weeks=[week.id for week in missing]
+            ))
         
-        # Construire les réponses complètes
+        # Construire les réponses complètes en mémoire
         results = []
         for week in weeks:
-            slots = db.query(Slot).filter(Slot.week_id == week.id).all()
-            note = db.query(Note).filter(Note.week_id == week.id).first()
-            
-            totals = CalculationService.calculate_week_totals(slots)
-            repartition = CalculationService.calculate_category_repartition(slots)
-            
-            results.append(WeekResponse(
-                week=week,
-                slots=slots,
-                notes=note,
-                totals=totals,
-                repartition=repartition
+            note = min(week.notes, key=lambda n: n.id) if week.notes else None
+            results.append(WeekService._build_week_response(
+                week, week.slots, note, calculations[week.id]
             ))
         
         return results
     
+    @staticmethod
+    def get_weeks(db: Session, employee_id: Optional[int] = None, 
+                  kind: Optional[str] = None, vacation: Optional[str] = None,
+                  week_start: Optional[date] = None, date_from: Optional[date] = None,
+                  date_to: Optional[date] = None, after: Optional[Tuple[date, int]] = None,
+                  limit: Optional[int] = None) -> List[WeekResponse]:
+        """Récupère les semaines selon les filtres
+        
+        Les créneaux et notes sont chargés par lots (selectin) : le nombre de
+        requêtes est constant quel que soit le nombre de semaines retournées.
+        """
+        reference_ids = ReferenceService.resolve(db, kind, vacation)
+        if reference_ids is None:
+            return []
+        query = WeekService.weeks_query(employee_id, *reference_ids, week_start,
+                                        date_from, date_to, after, limit)
+        weeks = db.execute(query).scalars().all()
+        return WeekService._build_week_responses(weeks)
+    
+    @staticmethod
+    def iter_weeks_ndjson(db: Session, employee_id: Optional[int] = None,
+                          kind: Optional[str] = None, vacation: Optional[str] = None,
+                          week_start: Optional[date] = None, date_from: Optional[date] = None,
+                          date_to: Optional[date] = None, after: Optional[Tuple[date, int]] = None,
+                          limit: Optional[int] = None) -> Iterator[bytes]:
+        """Produit les semaines en NDJSON, une WeekResponse par ligne
+        
+        Les semaines sont lues par lots de STREAM_YIELD_PER (curseur serveur),
+        créneaux et notes chargés par lot : la mémoire et le délai avant le
+        premier octet ne dépendent pas du nombre de semaines.
+        """
+        reference_ids = ReferenceService.resolve(db, kind, vacation)
+        if reference_ids is None:
+            return
+        query = WeekService.weeks_query(employee_id, *reference_ids, week_start,
+                                        date_from, date_to, after, limit)
+        result = db.execute(query.execution_options(yield_per=STREAM_YIELD_PER))
+        for weeks in result.scalars().partitions():
+            yield b"".join([
+                response.model_dump_json().encode() + b"\n"
+                for response in WeekService._build_week_responses(weeks)
+            ])
+            WeekService.expunge_weeks(db, weeks)
+    
+    @staticmethod
+    def expunge_weeks(db, weeks: List[Week]) -> None:
+        """Libère un lot de semaines lues en flux (créneaux et notes en cascade)"""
+        for week in weeks:
+            if week.summary is not None:
+                db.expunge(week.summary)  # Relation en lecture seule : pas de cascade
+            db.expunge(week)
+    
+    @staticmethod
+    def get_week_grid(db: Session, week_id: int) -> Optional[WeekGrid]:
+        """Construit la grille en quarts d'heure d'une semaine"""
+        if not db.query(Week.id).filter(Week.id == week_id).first():
+            return None
+        
+        rows = db.query(Slot.day_index, Slot.start_min, Slot.duration_min, Slot.category).filter(
+            Slot.week_id == week_id
+        ).all()
+        return WeekGrid.from_slots(rows)
+    
     @staticmethod
     def create_week(db: Session, week_data: WeekCreate) -> Week:
         """Crée une nouvelle semaine"""
@@ -84,32 +259,23 @@ class WeekService:
     @staticmethod
     def create_week_simple(db: Session, week_data: WeekCreateSimple) -> Week:
         """Crée une nouvelle semaine avec conversion automatique des strings vers IDs"""
-        # Mapping des strings vers IDs
-        kind_mapping = {
-            'type': 1,
-            'current': 2,
-            'next': 3,
-            'vacation': 4
-        }
+        # Conversion des noms vers les IDs via le registre de référence
+        kind_id = ReferenceService.kind_id(db, week_data.kind)
+        if kind_id is None:
+            kind_id = ReferenceService.kind_id(db, WeekKindEnum.CURRENT.value)  # Par défaut 'current'
         
-        vacation_mapping = {
-            'Toussaint': 1,
-            'Noel': 2,
-            'Paques': 3,
-            'Ete': 4
-        }
-        
-        # Conversion vers le format attendu par la base
         week_dict = {
             'employee_id': week_data.employee_id,
-            'kind_id': kind_mapping.get(week_data.kind, 2),  # Default to 'current'
+            'kind_id': kind_id,
             'week_start_date': week_data.week_start_date,
             'meta': week_data.meta
         }
         
-        # Ajouter vacation_id si spécifié
-        if week_data.vacation and week_data.vacation in vacation_mapping:
-            week_dict['vacation_id'] = vacation_mapping[week_data.vacation]
+        # Ajouter vacation_id si la période existe
+        if week_data.vacation:
+            vacation_id = ReferenceService.vacation_id(db, week_data.vacation)
+            if vacation_id is not None:
+                week_dict['vacation_id'] = vacation_id
         
         db_week = Week(**week_dict)
         db.add(db_week)
@@ -127,9 +293,11 @@ class WeekService:
         update_data = week_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_week, field, value)
+        db_week.revision = Week.revision + 1
         
         db.commit()
         db.refresh(db_week)
+        CacheService.invalidate_week(week_id)
         
         return WeekService.get_week_with_details(db, week_id)
     
@@ -141,20 +309,26 @@ class WeekService:
         if not week:
             return None
         
-        # Récupérer les créneaux existants pour vérifier les chevauchements
-        existing_slots = db.query(Slot).filter(Slot.week_id == slot_data.week_id).all()
+        # Récupérer les créneaux existants du même jour pour vérifier les chevauchements
+        existing_slots = db.query(Slot).filter(
+            Slot.week_id == slot_data.week_id,
+            Slot.day_index == slot_data.day_index
+        ).all()
         
         # Créer un objet temporaire pour la vérification
         temp_slot = Slot(**slot_data.dict())
         
         # Vérifier les chevauchements
-        if CalculationService.check_slot_overlap(existing_slots, temp_slot):
-            raise ValueError("Slot overlap detected")
+        conflicts = CalculationService.find_slot_conflicts(existing_slots, temp_slot)
+        if conflicts:
+            raise ValueError(f"Slot overlap detected with {CalculationService.format_conflicts(conflicts)}")
         
         db_slot = Slot(**slot_data.dict())
         db.add(db_slot)
+        WeekService._bump_revision(db, slot_data.week_id)
         db.commit()
         db.refresh(db_slot)
+        CacheService.invalidate_week(db_slot.week_id)
         return db_slot
     
     @staticmethod
@@ -168,25 +342,34 @@ class WeekService:
         update_data = slot_update.dict(exclude_unset=True)
         if any(field in update_data for field in ['day_index', 'start_min', 'duration_min']):
             # Appliquer temporairement les modifications
-            temp_slot = Slot(**db_slot.__dict__)
+            temp_slot = Slot(
+                week_id=db_slot.week_id,
+                day_index=db_slot.day_index,
+                start_min=db_slot.start_min,
+                duration_min=db_slot.duration_min
+            )
             for field, value in update_data.items():
                 setattr(temp_slot, field, value)
             
-            # Récupérer les autres créneaux
+            # Récupérer les autres créneaux du jour visé
             other_slots = db.query(Slot).filter(
                 Slot.week_id == db_slot.week_id,
+                Slot.day_index == temp_slot.day_index,
                 Slot.id != slot_id
             ).all()
             
-            if CalculationService.check_slot_overlap(other_slots, temp_slot):
-                raise ValueError("Slot overlap detected")
+            conflicts = CalculationService.find_slot_conflicts(other_slots, temp_slot)
+            if conflicts:
+                raise ValueError(f"Slot overlap detected with {CalculationService.format_conflicts(conflicts)}")
         
         # Appliquer les modifications
         for field, value in update_data.items():
             setattr(db_slot, field, value)
+        WeekService._bump_revision(db, db_slot.week_id)
         
         db.commit()
         db.refresh(db_slot)
+        CacheService.invalidate_week(db_slot.week_id)
         return db_slot
     
     @staticmethod
@@ -196,6 +379,186 @@ class WeekService:
         if not db_slot:
             return False
         
+        week_id = db_slot.week_id
         db.delete(db_slot)
+        WeekService._bump_revision(db, week_id)
+        db.commit()
+        CacheService.invalidate_week(week_id)
+        return True
+    
+    @staticmethod
+    def apply_slot_batch(db: Session, week_id: int, batch: SlotBatch) -> Optional[WeekResponse]:
+        """Applique un lot de créations/modifications/suppressions de créneaux
+        
+        Toutes les opérations sont validées ensemble contre l'état final de la
+        semaine puis appliquées en un seul commit ; rien n'est écrit si une
+        opération est invalide.
+        """
+        week = db.query(Week).filter(Week.id == week_id).first()
+        if not week:
+            return None
+        
+        slots = {slot.id: slot for slot in db.query(Slot).filter(Slot.week_id == week_id).all()}
+        
+        touched_ids = [op.id for op in batch.update] + list(batch.delete)
+        unknown = [slot_id for slot_id in touched_ids if slot_id not in slots]
+        if unknown:
+            raise ValueError(f"Slots not found in week {week_id}: {unknown}")
+        if len(set(touched_ids)) != len(touched_ids):
+            raise ValueError("A slot cannot appear in several operations of the same batch")
+        
+        # Appliquer en mémoire (autoflush désactivé : rien n'est envoyé avant le commit)
+        changed = []
+        for op in batch.update:
+            db_slot = slots[op.id]
+            for field, value in op.dict(exclude_unset=True, exclude={'id'}).items():
+                setattr(db_slot, field, value)
+            changed.append(db_slot)
+        
+        for slot_id in batch.delete:
+            db.delete(slots.pop(slot_id))
+        
+        for slot_data in batch.create:
+            db_slot = Slot(week_id=week_id, **slot_data.dict())
+            db.add(db_slot)
+            changed.append(db_slot)
+        
+        # Vérifier les chevauchements de l'état final en une passe
+        index = IntervalIndex.for_slots(list(slots.values()) + changed[len(batch.update):])
+        errors = []
+        for db_slot in changed:
+            conflicts = [
+                other for other in index.conflicts(*IntervalIndex.slot_interval(db_slot))
+                if other is not db_slot
+            ]
+            if conflicts:
+                errors.append(f"'{db_slot.title}' overlaps {CalculationService.format_conflicts(conflicts)}")
+        
+        if errors:
+            db.rollback()
+            raise ValueError(f"Slot overlap detected: {'; '.join(errors)}")
+        
+        WeekService._bump_revision(db, week_id)
         db.commit()
-        return True
\ No newline at end of file
+        CacheService.invalidate_week(week_id)
+        return WeekService.get_week_with_details(db, week_id)
+    
+    @staticmethod
+    def instantiate_weeks(db: Session, request: WeekInstantiate) -> WeekInstantiateResult:
+        """Génère des semaines à partir d'une semaine type
+        
+        Les semaines, créneaux et notes sont insérés par lots (executemany)
+        sans passer par des objets ORM, en un seul commit. Les semaines cibles
+        déjà existantes sont ignorées.
+        """
+        if any(week_start.weekday() != 0 for week_start in request.week_starts):
+            raise ValueError("Target week starts must be Mondays")
+        
+        target_kinds = {kind.value for kind in WeekKindEnum} - {WeekKindEnum.TYPE.value}
+        kind_id = None
+        if request.kind in target_kinds:
+            kind_id = ReferenceService.kind_id(db, request.kind)
+        if kind_id is None:
+            raise ValueError(f"Invalid target week kind: {request.kind}")
+        
+        vacation_id = None
+        if request.vacation:
+            vacation_id = ReferenceService.vacation_id(db, request.vacation)
+            if vacation_id is None:
+                raise ValueError(f"Invalid vacation period: {request.vacation}")
+        
+        employee_ids = request.employee_ids
+        if employee_ids is None:
+            employee_ids = [row.id for row in db.query(Employee.id).filter(Employee.active == True).all()]
+        
+        # Semaine type à copier pour chaque employé
+        type_query = db.query(Week).filter(Week.kind_id == ReferenceService.kind_id(db, WeekKindEnum.TYPE.value))
+        if request.template_week_id is not None:
+            template = type_query.filter(Week.id == request.template_week_id).first()
+            if not template:
+                raise ValueError(f"Type week {request.template_week_id} not found")
+            templates = {employee_id: template for employee_id in employee_ids}
+        else:
+            templates = {}
+            for week in type_query.filter(Week.employee_id.in_(employee_ids)).order_by(Week.week_start_date):
+                templates[week.employee_id] = week  # La plus récente l'emporte
+        
+        # Semaines cibles déjà présentes
+        existing = set(db.query(Week.employee_id, Week.week_start_date).filter(
+            Week.employee_id.in_(templates.keys()),
+            Week.kind_id == kind_id,
+            (Week.vacation_id == vacation_id) if vacation_id else Week.vacation_id.is_(None),
+            Week.week_start_date.in_(request.week_starts)
+        ).all())
+        
+        week_rows = [
+            {
+                'employee_id': employee_id,
+                'kind_id': kind_id,
+                'vacation_id': vacation_id,
+                'week_start_date': week_start,
+                'meta': dict(template.meta or {}) if request.copy_meta else {}
+            }
+            for employee_id, template in templates.items()
+            for week_start in request.week_starts
+            if (employee_id, week_start) not in existing
+        ]
+        skipped = len(templates) * len(request.week_starts) - len(week_rows)
+        if not week_rows:
+            return WeekInstantiateResult(created=[], skipped=skipped, slots_created=0)
+        
+        created = db.execute(
+            insert(Week).returning(Week.id, Week.employee_id, Week.week_start_date),
+            week_rows
+        ).all()
+        
+        # Créneaux et notes des semaines types, chargés en une requête chacun
+        template_ids = {template.id for template in templates.values()}
+        template_slots: dict = {}
+        for row in db.query(Slot.week_id, Slot.day_index, Slot.start_min, Slot.duration_min,
+                            Slot.title, Slot.category, Slot.comment).filter(Slot.week_id.in_(template_ids)):
+            template_slots.setdefault(row.week_id, []).append(row)
+        
+        slot_rows = [
+            {
+                'week_id': week.id,
+                'day_index': slot.day_index,
+                'start_min': slot.start_min,
+                'duration_min': slot.duration_min,
+                'title': slot.title,
+                'category': slot.category,
+                'comment': slot.comment
+            }
+            for week in created
+            for slot in template_slots.get(templates[week.employee_id].id, [])
+        ]
+        if slot_rows:
+            db.execute(insert(Slot), slot_rows)
+        
+        if request.copy_notes:
+            template_notes = {
+                note.week_id: note
+                for note in db.query(Note).filter(Note.week_id.in_(template_ids)).order_by(Note.id.desc())
+            }
+            note_rows = [
+                {
+                    'week_id': week.id,
+                    'hours_total': note.hours_total,
+                    'comments': note.comments,
+                    'last_edit_by': note.last_edit_by
+                }
+                for week in created
+                for note in [template_notes.get(templates[week.employee_id].id)]
+                if note
+            ]
+            if note_rows:
+                db.execute(insert(Note), note_rows)
+        
+        SummaryService.rebuild(db, [week.id for week in created])
+        ChangeLogService.record(db, "weeks", [week.id for week in created])
+        db.commit()
+        
+        weeks = db.query(Week).filter(Week.id.in_([week.id for week in created])).order_by(
+            Week.employee_id, Week.week_start_date
+        ).all()
+        return WeekInstantiateResult(created=weeks, skipped=skipped, slots_created=len(slot_rows))
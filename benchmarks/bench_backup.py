@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'export NDJSON gzip et de sa restauration (objectif : 1M de créneaux)
+
+Utilise BENCH_DATABASE_URL (base jetable, les tables y sont créées),
+par défaut une base SQLite en fichier temporaire. BENCH_SLOTS règle le volume.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import resource
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import *
+from app.services.backup_service import BackupService
+from app.services.backup_store import BackupStore
+
+SLOTS = int(os.getenv("BENCH_SLOTS", "1000000"))
+SLOTS_PER_WEEK = 50
+EMPLOYEES = 100
+
+
+def seed(db):
+    db.add_all([WeekKind(id=1, kind="type"), WeekKind(id=2, kind="current"),
+                WeekKind(id=3, kind="next"), WeekKind(id=4, kind="vacation")])
+    db.execute(insert(Employee), [{"id": i + 1, "slug": f"bench-{i}", "fullname": f"Bench {i}", "active": True}
+                                  for i in range(EMPLOYEES)])
+    weeks = SLOTS // SLOTS_PER_WEEK
+    db.execute(insert(Week), [{"id": w + 1, "employee_id": w % EMPLOYEES + 1, "kind_id": 2,
+                               "week_start_date": date(2020, 1, 6) + timedelta(weeks=w // EMPLOYEES),
+                               "meta": {}, "revision": 0} for w in range(weeks)])
+    batch = []
+    for i in range(SLOTS):
+        batch.append({"week_id": i // SLOTS_PER_WEEK + 1, "day_index": i % 7,
+                      "start_min": 480 + (i % SLOTS_PER_WEEK // 7) * 60, "duration_min": 60,
+                      "title": f"Créneau {i}", "category": "o", "comment": None})
+        if len(batch) == 50000:
+            db.execute(insert(Slot), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Slot), batch)
+    db.commit()
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{tmpdir}/bench_backup.db")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        start = time.perf_counter()
+        seed(db)
+        print(f"Insertion de {SLOTS} créneaux : {time.perf_counter() - start:.1f}s")
+
+    path = os.path.join(tmpdir, "export.ndjson.gz")
+    with Session() as db:
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        _, size = BackupService.write_export(db, path)
+        elapsed = time.perf_counter() - start
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"Export : {elapsed:.1f}s ({SLOTS / elapsed:,.0f} créneaux/s), "
+          f"{size / 1024 / 1024:.1f} Mo gzip, hausse du pic RSS {(rss_after - rss_before) / 1024:.1f} Mo")
+
+    store = BackupStore(os.path.join(tmpdir, "store"))
+    with Session() as db:
+        for label, incremental in (("Snapshot initial", False), ("Snapshot sans changement", False),
+                                   ("Incrémental après 1 modification", True)):
+            if incremental:
+                db.get(Slot, 1).title = "Modifié"
+                db.commit()
+            start = time.perf_counter()
+            manifest = store.create_snapshot(db, incremental=incremental)
+            print(f"{label} : {time.perf_counter() - start:.2f}s, {manifest['rows']} lignes, "
+                  f"{manifest['bytes_written'] / 1024 / 1024:.2f} Mo écrits")
+
+    with Session() as db, BackupService.open_backup(path) as backup_file:
+        start = time.perf_counter()
+        counts = BackupService.restore(db, backup_file)
+        elapsed = time.perf_counter() - start
+    print(f"Restauration : {elapsed:.1f}s ({sum(counts.values()) / elapsed:,.0f} lignes/s)")
+    Base.metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark des calculs de totaux : boucles par créneau vs calcul par lots
+
+« sommes NumPy » est la passe groupée seule (`batch_minutes`) ; « par lots »
+y ajoute la construction des objets WeekTotals / CategoryRepartition de
+chaque semaine, que les boucles par semaine construisent aussi.
+"""
+
+import os
+import random
+import sys
+import time
+from collections import defaultdict, namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.calculation_service import CalculationService, CATEGORY_CODES
+
+# Objet léger exposant les mêmes attributs qu'un Slot
+FakeSlot = namedtuple("FakeSlot", ["week_id", "day_index", "start_min", "duration_min", "category"])
+
+SLOTS_PER_WEEK = 40
+
+
+def generate_slots(count: int):
+    rng = random.Random(42)
+    return [
+        FakeSlot(
+            week_id=i // SLOTS_PER_WEEK,
+            day_index=rng.randrange(7),
+            start_min=rng.randrange(0, 1440, 15),
+            duration_min=rng.randrange(15, 240, 15),
+            category=rng.choice(CATEGORY_CODES),
+        )
+        for i in range(count)
+    ]
+
+
+def run_per_week(slots):
+    by_week = defaultdict(list)
+    for slot in slots:
+        by_week[slot.week_id].append(slot)
+    for week_slots in by_week.values():
+        CalculationService.calculate_week_totals(week_slots)
+        CalculationService.calculate_category_repartition(week_slots)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    for count in (10_000, 1_000_000):
+        slots = generate_slots(count)
+        per_week, _ = timed(run_per_week, slots)
+        to_columns, columns = timed(CalculationService.slots_to_columns, slots)
+        sums, _ = timed(CalculationService.batch_minutes, *columns)
+        batch, _ = timed(CalculationService.calculate_batch_totals, *columns)
+        print(f"{count:>9} créneaux | par semaine: {per_week:8.3f}s "
+              f"| colonnes: {to_columns:8.3f}s | sommes NumPy: {sums:8.3f}s | par lots: {batch:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'export Excel des semaines (openpyxl write-only) sur une année
+
+Mesure la durée, la taille du fichier et le pic de mémoire résidente (RSS)
+du processus d'export, lancé à part pour que la création des données ne
+compte pas dans le pic. Utilise BENCH_DATABASE_URL (base jetable, les tables
+y sont créées), par défaut une base SQLite en fichier temporaire.
+BENCH_EMPLOYEES règle le volume.
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import *
+from app.services.export_service import ExportService
+from app.services.summary_service import SummaryService
+
+EMPLOYEES = int(os.getenv("BENCH_EMPLOYEES", "100"))
+WEEKS = 52
+SLOTS_PER_WEEK = 20
+FIRST_MONDAY = date(2024, 9, 2)
+
+
+def seed(db):
+    categories = "apecolms"
+    db.add_all([WeekKind(id=1, kind="type"), WeekKind(id=2, kind="current")])
+    db.execute(insert(Employee), [{"id": i + 1, "slug": f"bench-{i}", "fullname": f"Bench {i}", "active": True}
+                                  for i in range(EMPLOYEES)])
+    week_rows = [{"id": w * EMPLOYEES + e + 1, "employee_id": e + 1, "kind_id": 2,
+                  "week_start_date": FIRST_MONDAY + timedelta(weeks=w), "meta": {}, "revision": 0}
+                 for w in range(WEEKS) for e in range(EMPLOYEES)]
+    db.execute(insert(Week), week_rows)
+    db.execute(insert(Slot), [{"week_id": week["id"], "day_index": s % 7, "start_min": 480 + (s // 7) * 120,
+                               "duration_min": 90, "title": f"Créneau {s}", "category": categories[s % 8],
+                               "comment": None}
+                              for week in week_rows for s in range(SLOTS_PER_WEEK)])
+    db.execute(insert(Note), [{"week_id": week["id"], "hours_total": 30} for week in week_rows])
+    SummaryService.rebuild(db)
+    db.commit()
+
+
+def rss_mb(field: str) -> float:
+    """VmRSS (courante) ou VmHWM (pic) du processus, en Mo"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Hors Linux : pic seulement (ru_maxrss en octets sous macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def export(url: str):
+    """Processus fils : un export de la saison complète"""
+    Session = sessionmaker(bind=create_engine(url))
+    baseline = rss_mb("VmRSS")
+    with Session() as db, tempfile.TemporaryFile() as output:
+        start = time.perf_counter()
+        weeks = ExportService.write_weeks_xlsx(db, output, date_from=FIRST_MONDAY,
+                                               date_to=FIRST_MONDAY + timedelta(weeks=WEEKS))
+        elapsed = time.perf_counter() - start
+        size = output.tell()
+    print(f"{weeks} semaines exportées en {elapsed:.1f} s, fichier {size / 2**20:.1f} Mo, "
+          f"RSS {baseline:.0f} Mo avant export, pic {rss_mb('VmHWM'):.0f} Mo")
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--export":
+        export(sys.argv[2])
+        return
+
+    tmpdir = tempfile.mkdtemp()
+    url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{tmpdir}/bench_export.db")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        seed(db)
+    print(f"Données : {EMPLOYEES} employés × {WEEKS} semaines × {SLOTS_PER_WEEK} créneaux")
+
+    subprocess.run([sys.executable, os.path.abspath(__file__), "--export", url], check=True)
+
+
+if __name__ == "__main__":
+    main()
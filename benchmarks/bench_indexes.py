@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark des index des chemins critiques du planning
+
+Remplit BENCH_DATABASE_URL (base jetable, les tables y sont recréées ;
+SQLite en mémoire par défaut) puis mesure les requêtes de WeekService,
+SimplePlanningService et EmployeeService sans puis avec les index, en
+affichant les plans d'exécution.
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import *
+from app.models.simple_slot import SimpleSlot
+
+EMPLOYEES = 200
+WEEKS_PER_EMPLOYEE = 150
+SLOTS_PER_WEEK = 30
+REPEAT = 50
+
+INDEXES = [
+    ("slots", "ix_slots_week_day_start"),
+    ("notes", "ix_notes_week_id"),
+    ("weeks", "ix_weeks_employee_start"),
+    ("employees", "ix_employees_active_id"),
+    ("simple_slots", "ix_simple_slots_employee_date_start"),
+    ("simple_slots", "ix_simple_slots_updated_at"),
+]
+
+# Mêmes filtres que les services
+QUERIES = {
+    "slots d'une semaine": select(Slot).where(Slot.week_id == 4242),
+    "note d'une semaine": select(Note).where(Note.week_id == 4242),
+    "semaines d'un employé": select(Week).where(Week.employee_id == 42).order_by(Week.week_start_date),
+    "employés actifs": select(Employee).where(Employee.active == True).limit(100),
+    "planning simple (semaine)": select(SimpleSlot).where(
+        SimpleSlot.employee_id == 42,
+        SimpleSlot.date >= date(2024, 3, 4),
+        SimpleSlot.date <= date(2024, 3, 10)
+    ).order_by(SimpleSlot.date, SimpleSlot.start_time),
+}
+
+
+def seed(engine):
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(WeekKind), [{"id": 1, "kind": "type"}, {"id": 2, "kind": "current"}])
+        conn.execute(insert(Employee), [
+            {"id": i, "slug": f"bench-{i}", "fullname": f"Bench {i}", "active": i % 5 != 0}
+            for i in range(1, EMPLOYEES + 1)
+        ])
+        weeks, slots, notes, simple_slots = [], [], [], []
+        week_id = 0
+        for employee_id in range(1, EMPLOYEES + 1):
+            for w in range(WEEKS_PER_EMPLOYEE):
+                week_id += 1
+                monday = date(2022, 1, 3) + timedelta(weeks=w)
+                weeks.append({"id": week_id, "employee_id": employee_id, "kind_id": 2,
+                              "week_start_date": monday, "meta": {}})
+                notes.append({"week_id": week_id, "comments": "bench"})
+                for s in range(SLOTS_PER_WEEK):
+                    slots.append({"week_id": week_id, "day_index": s % 7, "start_min": 480 + (s // 7) * 60,
+                                  "duration_min": 60, "title": "Bench", "category": "o"})
+                    simple_slots.append({"employee_id": employee_id, "date": monday + timedelta(days=s % 7),
+                                         "day_of_week": s % 7, "start_time": 480 + (s // 7) * 60,
+                                         "end_time": 540 + (s // 7) * 60, "title": "Bench",
+                                         "category": rng.choice("apecolms")})
+        conn.execute(insert(Week), weeks)
+        conn.execute(insert(Note), notes)
+        conn.execute(insert(Slot), slots)
+        conn.execute(insert(SimpleSlot), simple_slots)
+    print(f"Données : {len(weeks)} semaines, {len(slots)} créneaux, {len(simple_slots)} créneaux simples")
+
+
+def explain(conn, query):
+    sql = str(query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    return [" ".join(str(col) for col in row) for row in conn.execute(text(prefix + sql))]
+
+
+def measure(engine, label):
+    print(f"\n=== {label} ===")
+    with engine.connect() as conn:
+        for name, query in QUERIES.items():
+            start = time.perf_counter()
+            for _ in range(REPEAT):
+                conn.execute(query).fetchall()
+            elapsed = (time.perf_counter() - start) / REPEAT * 1000
+            print(f"{name:<28} {elapsed:8.3f} ms")
+            for line in explain(conn, query):
+                print(f"    {line}")
+
+
+def set_indexes(engine, create: bool):
+    tables = {table.name: table for table in Base.metadata.sorted_tables}
+    for table_name, index_name in INDEXES:
+        index = next(i for i in tables[table_name].indexes if i.name == index_name)
+        if create:
+            index.create(bind=engine, checkfirst=True)
+        else:
+            index.drop(bind=engine, checkfirst=True)
+
+
+def main():
+    engine = create_engine(os.getenv("BENCH_DATABASE_URL", "sqlite://"))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    set_indexes(engine, create=False)
+    seed(engine)
+
+    measure(engine, "Sans index")
+    set_indexes(engine, create=True)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    measure(engine, "Avec index")
+
+    Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la génération de semaines depuis les semaines types
+
+Utilise BENCH_DATABASE_URL (base jetable, les tables y sont créées),
+par défaut une base SQLite en mémoire.
+"""
+
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import *
+from app.schemas.week import WeekInstantiate
+from app.services.week_service import WeekService
+
+EMPLOYEES = 40
+SLOTS_PER_TYPE_WEEK = 40
+WEEKS = 12
+
+
+def seed(db):
+    db.add_all([WeekKind(id=1, kind="type"), WeekKind(id=2, kind="current"),
+                WeekKind(id=3, kind="next"), WeekKind(id=4, kind="vacation")])
+    for i in range(EMPLOYEES):
+        employee = Employee(slug=f"bench-{i}", fullname=f"Bench {i}", active=True)
+        db.add(employee)
+        db.flush()
+        week = Week(employee_id=employee.id, kind_id=1, week_start_date=date(2024, 1, 1), meta={})
+        db.add(week)
+        db.flush()
+        for j in range(SLOTS_PER_TYPE_WEEK):
+            db.add(Slot(week_id=week.id, day_index=j % 7, start_min=480 + (j // 7) * 60,
+                        duration_min=60, title=f"Créneau {j}", category="o"))
+    db.commit()
+
+
+def main():
+    engine = create_engine(os.getenv("BENCH_DATABASE_URL", "sqlite://"))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    seed(db)
+
+    monday = date.today() - timedelta(days=date.today().weekday())
+    request = WeekInstantiate(week_starts=[monday + timedelta(weeks=i) for i in range(1, WEEKS + 1)])
+
+    start = time.perf_counter()
+    result = WeekService.instantiate_weeks(db, request)
+    elapsed = time.perf_counter() - start
+    print(f"{len(result.created)} semaines, {result.slots_created} créneaux générés en {elapsed:.3f}s")
+
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
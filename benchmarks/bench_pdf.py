@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'impression PDF d'une semaine pour toute l'équipe
+
+Compare le rendu dans la requête, le rendu dans le pool de processus et la
+réimpression servie par le cache de pages (une semaine modifiée). Utilise
+BENCH_DATABASE_URL (base jetable, les tables y sont créées), par défaut une
+base SQLite en fichier temporaire. BENCH_EMPLOYEES règle le volume.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import sessionmaker
+from app.config import settings
+from app.database import Base
+from app.models import *
+from app.services.cache_service import CacheService
+from app.services.pdf_service import PdfService
+from app.services.summary_service import SummaryService
+
+EMPLOYEES = int(os.getenv("BENCH_EMPLOYEES", "50"))
+SLOTS_PER_WEEK = 25
+MONDAY = date(2024, 9, 2)
+
+
+def seed(db):
+    categories = "apecolms"
+    db.add_all([WeekKind(id=1, kind="type"), WeekKind(id=2, kind="current")])
+    db.execute(insert(Employee), [{"id": i + 1, "slug": f"bench-{i}", "fullname": f"Bench {i}", "active": True}
+                                  for i in range(EMPLOYEES)])
+    db.execute(insert(Week), [{"id": e + 1, "employee_id": e + 1, "kind_id": 2, "week_start_date": MONDAY,
+                               "meta": {}, "revision": 0} for e in range(EMPLOYEES)])
+    db.execute(insert(Slot), [{"week_id": e + 1, "day_index": s % 7, "start_min": 480 + (s // 7) * 150,
+                               "duration_min": 120, "title": f"Créneau {s}", "category": categories[s % 8],
+                               "comment": None}
+                              for e in range(EMPLOYEES) for s in range(SLOTS_PER_WEEK)])
+    SummaryService.rebuild(db)
+    db.commit()
+
+
+def timed(db, label: str):
+    conditions = PdfService.week_conditions(db, week_start=MONDAY)
+    output = BytesIO()
+    start = time.perf_counter()
+    pages, rendered = PdfService.write_weeks_pdf(db, output, conditions)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:8.1f} ms  ({pages} pages, {rendered} rendues, "
+          f"{len(output.getvalue()) / 1024:.0f} Ko)")
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{tmpdir}/bench_pdf.db")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        seed(db)
+    print(f"Données : {EMPLOYEES} employés × 1 semaine × {SLOTS_PER_WEEK} créneaux, "
+          f"{settings.pdf_workers} processus de rendu")
+
+    with Session() as db:
+        settings.pdf_pool_min_pages = EMPLOYEES + 1
+        CacheService.clear()
+        timed(db, "Rendu dans la requête")
+
+        settings.pdf_pool_min_pages = 1
+        CacheService.clear()
+        timed(db, "Pool (démarrage des processus)")
+        CacheService.clear()
+        timed(db, "Pool (processus démarrés)")
+
+        timed(db, "Réimpression (cache)")
+        db.execute(update(Week).where(Week.id == 1).values(revision=Week.revision + 1))
+        db.commit()
+        timed(db, "Réimpression (1 semaine modifiée)")
+    PdfService.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark du rapport d'heures agrégé en SQL (plusieurs années de plannings)
+
+Utilise BENCH_DATABASE_URL (base jetable, les tables y sont créées),
+par défaut une base SQLite en fichier temporaire. BENCH_YEARS règle le volume.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import *
+from app.models.simple_slot import SimpleSlot
+from app.services.report_service import ReportService
+from app.services.summary_service import SummaryService
+
+YEARS = int(os.getenv("BENCH_YEARS", "5"))
+EMPLOYEES = 100
+SLOTS_PER_WEEK = 20
+SIMPLE_SLOTS_PER_DAY = 2
+FIRST_MONDAY = date(2020, 1, 6)
+
+
+def seed(db):
+    weeks = YEARS * 52
+    db.add_all([WeekKind(id=1, kind="type"), WeekKind(id=2, kind="current")])
+    db.execute(insert(Employee), [{"id": i + 1, "slug": f"bench-{i}", "fullname": f"Bench {i}", "active": True}
+                                  for i in range(EMPLOYEES)])
+    week_rows = [{"id": w * EMPLOYEES + e + 1, "employee_id": e + 1, "kind_id": 2,
+                  "week_start_date": FIRST_MONDAY + timedelta(weeks=w), "meta": {}, "revision": 0}
+                 for w in range(weeks) for e in range(EMPLOYEES)]
+    db.execute(insert(Week), week_rows)
+    categories = "apecolms"
+    batch = []
+    for week in week_rows:
+        for s in range(SLOTS_PER_WEEK):
+            batch.append({"week_id": week["id"], "day_index": s % 7, "start_min": 480 + (s // 7) * 120,
+                          "duration_min": 90, "title": "Créneau", "category": categories[s % 8], "comment": None})
+        if len(batch) >= 50000:
+            db.execute(insert(Slot), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Slot), batch)
+    db.execute(insert(Note), [{"week_id": week["id"], "hours_total": 30} for week in week_rows])
+
+    batch = []
+    for day in range(weeks * 7):
+        current = FIRST_MONDAY + timedelta(days=day)
+        for e in range(EMPLOYEES):
+            for s in range(SIMPLE_SLOTS_PER_DAY):
+                batch.append({"employee_id": e + 1, "date": current, "day_of_week": current.weekday(),
+                              "start_time": 600 + s * 120, "end_time": 660 + s * 120, "title": "Cours",
+                              "category": categories[(day + s) % 8]})
+        if len(batch) >= 50000:
+            db.execute(insert(SimpleSlot), batch)
+            batch = []
+    if batch:
+        db.execute(insert(SimpleSlot), batch)
+    # Insertions en Core : résumés de semaine calculés en une fois
+    start = time.perf_counter()
+    SummaryService.rebuild(db)
+    print(f"Résumés de semaine reconstruits en {time.perf_counter() - start:.1f} s")
+    db.commit()
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{tmpdir}/bench_reports.db")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    start = time.perf_counter()
+    with Session() as db:
+        seed(db)
+    print(f"Données : {YEARS} ans, {EMPLOYEES} employés ({time.perf_counter() - start:.1f} s)")
+
+    last_day = FIRST_MONDAY + timedelta(weeks=YEARS * 52) - timedelta(days=1)
+    cases = [
+        ("Trimestre, tous les employés", date(2022, 9, 1), date(2022, 12, 20), None, "month"),
+        ("Toutes les années, tous les employés", FIRST_MONDAY, last_day, None, "month"),
+        ("Toutes les années, un employé, par semaine", FIRST_MONDAY, last_day, 1, "week"),
+    ]
+    with Session() as db:
+        for label, date_from, date_to, employee_id, period in cases:
+            ReportService.hours_report(db, date_from, date_to, employee_id, period)
+            start = time.perf_counter()
+            report = ReportService.hours_report(db, date_from, date_to, employee_id, period)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<45} {elapsed * 1000:8.0f} ms ({len(report.employees)} employés)")
+
+
+if __name__ == "__main__":
+    main()
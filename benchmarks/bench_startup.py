@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage à froid : temps jusqu'à la première requête servie
+
+Lance uvicorn plusieurs fois sur la même base (BENCH_DATABASE_URL, par défaut
+un fichier SQLite temporaire) : le premier démarrage initialise la base, les
+suivants correspondent à un redémarrage ou à l'ajout d'un worker.
+FAST_STARTUP=false mesure l'ancien comportement.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOOTS = int(os.getenv("BENCH_BOOTS", "5"))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot(env: dict) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/v1/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def measure_hook(url: str):
+    """Requêtes et durée de l'initialisation seule, chemin complet puis rapide"""
+    sys.path.append(ROOT)
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    import app.main  # Charge tous les modèles
+    from app.config import settings
+    from app.services.init_service import InitService
+
+    engine = create_engine(url)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    Session = sessionmaker(bind=engine)
+    for fast in (False, True):
+        settings.fast_startup = fast
+        with Session() as db:
+            statements.clear()
+            start = time.perf_counter()
+            InitService.init_reference_data(db)
+            elapsed = time.perf_counter() - start
+        print(f"  init_reference_data ({'rapide' if fast else 'complet'}) : "
+              f"{len(statements)} requêtes, {elapsed * 1000:.1f} ms")
+
+
+def main():
+    url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench_startup.db")
+    env = dict(os.environ, DATABASE_URL=url)
+    mode = "rapide" if env.get("FAST_STARTUP", "true").lower() == "true" else "complet"
+    times = [boot(env) for _ in range(BOOTS)]
+    print(f"Démarrage {mode} : premier {times[0] * 1000:.0f} ms, "
+          f"suivants {min(times[1:]) * 1000:.0f}-{max(times[1:]) * 1000:.0f} ms")
+    measure_hook(url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark du listing des semaines : liste JSON complète contre flux NDJSON
+
+Mesure le délai avant le premier octet et le pic mémoire (tracemalloc) pour
+plusieurs volumes. Utilise BENCH_DATABASE_URL (base jetable, les tables y
+sont créées), par défaut une base SQLite en fichier temporaire.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import *
+from app.schemas.week import WeekResponse
+from app.services.week_service import WeekService
+
+SIZES = [int(size) for size in os.getenv("BENCH_WEEKS", "1000,5000").split(",")]
+SLOTS_PER_WEEK = 20
+EMPLOYEES = 50
+
+
+def seed(db, weeks):
+    db.add_all([WeekKind(id=1, kind="type"), WeekKind(id=2, kind="current")])
+    db.execute(insert(Employee), [{"id": i + 1, "slug": f"bench-{i}", "fullname": f"Bench {i}", "active": True}
+                                  for i in range(EMPLOYEES)])
+    db.execute(insert(Week), [{"id": w + 1, "employee_id": w % EMPLOYEES + 1, "kind_id": 2,
+                               "week_start_date": date(2000, 1, 3) + timedelta(weeks=w // EMPLOYEES),
+                               "meta": {}, "revision": 0} for w in range(weeks)])
+    db.execute(insert(Slot), [{"week_id": w + 1, "day_index": s % 7, "start_min": 480 + (s // 7) * 60,
+                               "duration_min": 60, "title": f"Créneau {s}", "category": "o", "comment": None}
+                              for w in range(weeks) for s in range(SLOTS_PER_WEEK)])
+    db.execute(insert(Note), [{"week_id": w + 1, "comments": "Note"} for w in range(weeks)])
+    db.commit()
+
+
+def measure(produce):
+    """Délai avant le premier octet, durée totale et pic mémoire d'un générateur d'octets"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in produce():
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, total, peak, size
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{tmpdir}/bench_weeks_stream.db")
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine)
+    adapter = TypeAdapter(list[WeekResponse])
+
+    for weeks in SIZES:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        with Session() as db:
+            seed(db, weeks)
+
+        # Chemin JSON : liste complète puis validation/sérialisation (response_model)
+        with Session() as db:
+            first, total, peak, size = measure(
+                lambda: [adapter.dump_json(adapter.validate_python(WeekService.get_weeks(db)))]
+            )
+        print(f"{weeks:>6} semaines  JSON   : premier octet {first * 1000:8.0f} ms, "
+              f"total {total * 1000:8.0f} ms, pic {peak / 2**20:7.1f} Mo, {size / 2**20:.1f} Mo")
+
+        with Session() as db:
+            first, total, peak, size = measure(lambda: WeekService.iter_weeks_ndjson(db))
+        print(f"{weeks:>6} semaines  NDJSON : premier octet {first * 1000:8.0f} ms, "
+              f"total {total * 1000:8.0f} ms, pic {peak / 2**20:7.1f} Mo, {size / 2**20:.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
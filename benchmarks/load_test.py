@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test de charge : débit de l'API avec N clients concurrents
+
+Lancer l'API (sync puis ASYNC_DATABASE=true) et comparer :
+    BENCH_BASE_URL=http://localhost:8000 python benchmarks/load_test.py
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+BASE_URL = os.getenv("BENCH_BASE_URL", "http://localhost:8000")
+CLIENTS = int(os.getenv("BENCH_CLIENTS", "200"))
+DURATION = float(os.getenv("BENCH_DURATION", "20"))
+EMPLOYEE_ID = int(os.getenv("BENCH_EMPLOYEE_ID", "1"))
+WEEK_START = os.getenv("BENCH_WEEK_START", "2024-01-01")
+
+PATHS = [
+    "/api/v1/employees/",
+    f"/api/v1/weeks/?employee_id={EMPLOYEE_ID}",
+    f"/api/v1/planning/week?employee_id={EMPLOYEE_ID}&week_start={WEEK_START}",
+]
+
+
+async def worker(client: httpx.AsyncClient, deadline: float, latencies: list, errors: list):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = PATHS[i % len(PATHS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def main():
+    limits = httpx.Limits(max_connections=CLIENTS, max_keepalive_connections=CLIENTS)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=30) as client:
+        latencies, errors = [], []
+        deadline = time.perf_counter() + DURATION
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client, deadline, latencies, errors) for _ in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{CLIENTS} clients, {elapsed:.1f}s : {len(latencies)} requêtes, {len(latencies) / elapsed:.0f} req/s")
+    print(f"latence p50 {statistics.median(latencies) * 1000:.1f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms, erreurs {len(errors)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
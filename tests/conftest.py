@@ -26,8 +26,21 @@ def override_get_db():
 app.dependency_overrides[get_db] = override_get_db
 
 
+def _configure_jobs():
+    from app.services.job_service import JobService
+    JobService.configure(TestingSessionLocal)
+
+
+_configure_jobs()
+
+
 @pytest.fixture
 def db():
+    from app.services.cache_service import CacheService
+    from app.services.reference_service import ReferenceService
+
+    CacheService.clear()
+    ReferenceService.clear()
     Base.metadata.create_all(bind=engine)
     db = TestingSessionLocal()
     try:
@@ -50,4 +63,39 @@ def sample_employee(db):
     db.add(employee)
     db.commit()
     db.refresh(employee)
-    return employee
\ No newline at end of file
+    return employee
+
+@pytest.fixture
+def query_counter():
+    """Compte les requêtes SQL exécutées sur la base de test"""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def wait_for_job(client):
+    """Attend la fin d'une tâche de fond et renvoie son état final"""
+    import time
+    from app.config import settings
+
+    headers = {"Authorization": f"Bearer {settings.backup_secret}"}
+
+    def wait(job, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            state = client.get(f"/api/v1/backup/jobs/{job['id']}", headers=headers).json()
+            if state["finished_at"] or time.monotonic() > deadline:
+                return state
+            time.sleep(0.02)
+
+    return wait
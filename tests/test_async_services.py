@@ -0,0 +1,82 @@
+import pytest
+import pytest_asyncio
+from datetime import date
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.database import Base
+from app.models.employee import Employee
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.schemas.employee import EmployeeCreate
+from app.schemas.simple_slot import SimpleSlotCreate
+from app.schemas.slot import SlotCreate, SlotUpdate
+from app.services.async_employee_service import AsyncEmployeeService
+from app.services.async_simple_planning_service import AsyncSimplePlanningService
+from app.services.async_week_service import AsyncWeekService
+from app.services.cache_service import CacheService
+
+
+@pytest_asyncio.fixture
+async def async_db():
+    engine = create_async_engine("sqlite+aiosqlite:///./test_async.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    CacheService.clear()
+    session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        await session.close()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_async_week_service(async_db):
+    """Lecture et écriture de créneaux avec la session asynchrone"""
+    employee = await AsyncEmployeeService.create(async_db, EmployeeCreate(slug="async", fullname="Async User"))
+    assert [e.slug for e in await AsyncEmployeeService.get_all(async_db)] == ["async"]
+
+    async_db.add(WeekKind(id=2, kind="current"))
+    week = Week(employee_id=employee.id, kind_id=2, week_start_date=date(2024, 1, 1), meta={})
+    async_db.add(week)
+    await async_db.commit()
+
+    slot = await AsyncWeekService.create_slot(async_db, SlotCreate(
+        week_id=week.id, day_index=0, start_min=540, duration_min=120, title="Ouverture", category="o"))
+    with pytest.raises(ValueError):
+        await AsyncWeekService.create_slot(async_db, SlotCreate(
+            week_id=week.id, day_index=0, start_min=600, duration_min=60, title="Conflit", category="a"))
+
+    await AsyncWeekService.update_slot(async_db, slot.id, SlotUpdate(duration_min=60))
+    details = await AsyncWeekService.get_week_with_details(async_db, week.id)
+    assert details.totals.week_total == 1.0
+
+    weeks = await AsyncWeekService.get_weeks(async_db, employee_id=employee.id)
+    assert weeks[0].model_dump() == details.model_dump()
+    lines = [chunk async for chunk in AsyncWeekService.iter_weeks_ndjson(async_db, employee_id=employee.id)]
+    assert b"".join(lines) == details.model_dump_json().encode() + b"\n"
+    assert await AsyncWeekService.get_week_etag(async_db, week.id) == f'W/"week-{week.id}-r2"'
+
+    assert await AsyncWeekService.delete_slot(async_db, slot.id)
+    assert (await AsyncWeekService.get_week_with_details(async_db, week.id)).slots == []
+
+
+@pytest.mark.asyncio
+async def test_async_simple_planning_service(async_db):
+    """Planning simple avec la session asynchrone"""
+    slot = await AsyncSimplePlanningService.create_slot(async_db, SimpleSlotCreate(
+        employee_id=1, date=date(2024, 1, 2), day_of_week=1, start_time=540, end_time=600,
+        title="Ouverture", category="o"))
+
+    planning = await AsyncSimplePlanningService.get_week_planning(async_db, 1, date(2024, 1, 1))
+    assert [s.id for s in planning.slots] == [slot.id]
+
+    with pytest.raises(ValueError):
+        await AsyncSimplePlanningService.create_slot(async_db, SimpleSlotCreate(
+            employee_id=1, date=date(2024, 1, 2), day_of_week=1, start_time=570, end_time=630,
+            title="Conflit", category="a"))
+
+    assert await AsyncSimplePlanningService.delete_slot(async_db, slot.id)
+    planning = await AsyncSimplePlanningService.get_week_planning(async_db, 1, date(2024, 1, 1))
+    assert planning.slots == []
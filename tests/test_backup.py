@@ -0,0 +1,110 @@
+import gzip
+import json
+from datetime import date
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.models.employee import Employee
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.models.slot import Slot
+from app.services.backup_service import BACKUP_SCHEMA_VERSION
+
+
+def _auth():
+    return {"Authorization": f"Bearer {settings.backup_secret}"}
+
+
+def test_export_streams_gzip_ndjson(client: TestClient, db, sample_employee):
+    """Export NDJSON : en-tête versionné puis une section par table"""
+    db.add(WeekKind(id=1, kind="type"))
+    week = Week(employee_id=sample_employee.id, kind_id=1, week_start_date=date(2024, 1, 1), meta={})
+    db.add(week)
+    db.flush()
+    db.add_all([Slot(week_id=week.id, day_index=d, start_min=480, duration_min=60,
+                     title=f"Créneau {d}", category="o") for d in range(3)])
+    db.commit()
+
+    response = client.get("/api/v1/backup/export", headers=_auth())
+    assert response.status_code == 200
+    assert response.headers["x-backup-schema-version"] == str(BACKUP_SCHEMA_VERSION)
+
+    lines = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+    assert lines[0]["schema_version"] == BACKUP_SCHEMA_VERSION
+
+    sections, current = {}, None
+    for line in lines[1:]:
+        if isinstance(line, dict):
+            current = sections.setdefault(line["table"], {"columns": line["columns"], "rows": []})
+        else:
+            current["rows"].append(dict(zip(current["columns"], line)))
+
+    assert list(sections) == lines[0]["tables"]
+    assert sections["week_kind"]["rows"] == [{"id": 1, "kind": "type"}]
+    assert sections["weeks"]["rows"][0]["week_start_date"] == "2024-01-01"
+    assert [row["title"] for row in sections["slots"]["rows"]] == ["Créneau 0", "Créneau 1", "Créneau 2"]
+    assert sections["simple_slots"]["rows"] == []
+
+
+def test_export_requires_backup_token(client: TestClient, db):
+    response = client.get("/api/v1/backup/export", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+
+
+def test_restore_round_trip(client: TestClient, db, sample_employee, tmp_path, monkeypatch,
+                            wait_for_job):
+    """Un export restauré remplace les données, identifiants compris"""
+    monkeypatch.setattr(settings, "backup_dir", str(tmp_path))
+    db.add(WeekKind(id=1, kind="type"))
+    week = Week(employee_id=sample_employee.id, kind_id=1, week_start_date=date(2024, 1, 1), meta={"open": "8h"})
+    db.add(week)
+    db.flush()
+    db.add(Slot(week_id=week.id, day_index=0, start_min=480, duration_min=60, title="Accueil", category="a"))
+    db.commit()
+    backup = client.get("/api/v1/backup/export", headers=_auth()).content
+    etag = client.get(f"/api/v1/weeks/{week.id}").headers["ETag"]
+
+    # Modifications postérieures au backup : elles doivent disparaître
+    db.query(Slot).delete()
+    db.add(Employee(slug="after", fullname="After Backup", active=True))
+    db.commit()
+
+    response = client.post("/api/v1/backup/restore", headers=_auth(),
+                           files={"file": ("backup.ndjson.gz", backup, "application/gzip")})
+    assert response.status_code == 202
+    job = wait_for_job(response.json())
+    assert job["status"] == "succeeded"
+    assert job["result"]["restored"]["slots"] == 1
+    assert job["rows"] == 4  # type de semaine, employé, semaine, créneau
+
+    db.expire_all()
+    assert [e.slug for e in db.query(Employee).all()] == ["test"]
+    slot = db.query(Slot).one()
+    assert (slot.week_id, slot.title) == (week.id, "Accueil")
+    assert db.query(Week).one().meta == {"open": "8h"}
+
+    # Révisions décalées : l'ETag servi avant la restauration n'obtient pas de 304
+    assert client.get(f"/api/v1/weeks/{week.id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_restore_invalid_row_rolls_back(client: TestClient, db, sample_employee, tmp_path, monkeypatch,
+                                        wait_for_job):
+    """Une ligne invalide annule toute la restauration"""
+    monkeypatch.setattr(settings, "backup_dir", str(tmp_path))
+    lines = [
+        {"format": "planning-backup", "schema_version": BACKUP_SCHEMA_VERSION, "tables": []},
+        {"table": "employees", "columns": ["id", "slug", "fullname", "active"]},
+        [1, "ok", "Valid Employee", True],
+        {"table": "slots", "columns": ["id", "week_id", "day_index", "start_min", "duration_min",
+                                       "title", "category", "comment"]},
+        [1, 1, 9, 480, 60, "Jour invalide", "o", None],
+    ]
+    payload = "\n".join(json.dumps(line) for line in lines).encode()
+
+    response = client.post("/api/v1/backup/restore", headers=_auth(),
+                           files={"file": ("backup.ndjson", payload, "application/x-ndjson")})
+    job = wait_for_job(response.json())
+    assert job["status"] == "failed"
+    assert "Line 5" in job["error"]
+
+    db.expire_all()
+    assert [e.slug for e in db.query(Employee).all()] == ["test"]
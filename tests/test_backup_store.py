@@ -0,0 +1,227 @@
+import os
+import threading
+from datetime import date
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.models.slot import Slot
+from app.models.simple_slot import SimpleSlot
+from app.models.change_log import ChangeLog
+from app.schemas.slot import SlotUpdate
+from app.schemas.simple_slot import SimpleSlotCreate
+from app.services.backup_store import BackupStore
+from app.services.week_service import WeekService
+from app.services.simple_planning_service import SimplePlanningService
+from tests.conftest import TestingSessionLocal
+
+
+def _seed(db, employee, slots=25):
+    db.add(WeekKind(id=1, kind="type"))
+    week = Week(employee_id=employee.id, kind_id=1, week_start_date=date(2024, 1, 1), meta={})
+    db.add(week)
+    db.flush()
+    db.add_all([Slot(week_id=week.id, day_index=i % 7, start_min=480 + (i // 7) * 60, duration_min=60,
+                     title=f"Créneau {i}", category="o") for i in range(slots)])
+    db.commit()
+
+
+def test_unchanged_chunks_are_written_once(db, sample_employee, tmp_path):
+    """Un snapshot sans modification n'écrit aucun bloc"""
+    _seed(db, sample_employee)
+    store = BackupStore(str(tmp_path), chunk_rows=10)
+
+    first = store.create_snapshot(db)
+    assert first["rows"] == 1 + 1 + 1 + 25  # type, employé, semaine, créneaux
+    assert first["bytes_written"] > 0
+
+    second = store.create_snapshot(db)
+    assert second["bytes_written"] == 0
+
+    # Une modification ne réécrit que le bloc de la ligne (ids 11 à 19)
+    objects = store.stats()["objects"]
+    db.query(Slot).filter(Slot.id == 15).update({Slot.title: "Modifié"})
+    db.commit()
+    store.create_snapshot(db)
+    assert store.stats()["objects"] == objects + 1
+    assert len(store.list_snapshots()) == 3
+
+
+def test_snapshot_restore_and_verify(db, sample_employee, tmp_path):
+    _seed(db, sample_employee)
+    store = BackupStore(str(tmp_path), chunk_rows=10)
+    snapshot_id = store.create_snapshot(db)["id"]
+
+    db.query(Slot).delete()
+    db.commit()
+    assert store.restore(db, snapshot_id)["slots"] == 25
+    db.expire_all()
+    assert db.query(Slot).count() == 25
+
+    assert store.verify(snapshot_id)["ok"]
+    manifest = store.get_manifest(snapshot_id)
+    digest = manifest["tables"][4]["chunks"][0]["hash"]
+    with open(store._object_path(digest), "wb") as damaged:
+        damaged.write(b"not zlib")
+    result = store.verify(snapshot_id)
+    assert not result["ok"]
+    assert result["corrupt"] == [digest]
+    assert store.verify("../../etc/passwd") is None
+
+
+def test_retention_keeps_latest_per_period(db, tmp_path):
+    """Rétention quotidienne/hebdomadaire/mensuelle et suppression des blocs orphelins"""
+    store = BackupStore(str(tmp_path))
+    os.makedirs(store.snapshots_dir)
+    ids = ["20240101_020000_000000", "20240102_020000_000000", "20240102_030000_000000",
+           "20240110_020000_000000", "20240205_020000_000000", "20240206_020000_000000"]
+    orphan, _ = store.put_object(b"orphan")
+    shared, _ = store.put_object(b"shared")
+    for snapshot_id in ids:
+        with open(store._manifest_path(snapshot_id), "w") as manifest:
+            manifest.write('{"id": "%s", "tables": [{"table": "slots", "columns": [], '
+                           '"chunks": [{"hash": "%s", "rows": 1, "size": 6}]}]}' % (snapshot_id, shared))
+
+    result = store.apply_retention(keep_daily=2, keep_weekly=3, keep_monthly=2)
+    # Jours : 06/02, 05/02 ; semaines : S6, S2, S1 (dernier = 02/01 03h) ; mois : 02, 01 (10/01)
+    assert result["kept"] == ["20240102_030000_000000", "20240110_020000_000000",
+                              "20240205_020000_000000", "20240206_020000_000000"]
+    assert result["deleted"] == ["20240101_020000_000000", "20240102_020000_000000"]
+    assert result["objects_deleted"] == 1
+    assert store.get_object(shared) == b"shared"
+    assert not os.path.exists(store._object_path(orphan))
+
+
+def test_concurrent_backups_keep_their_chunks(db, sample_employee, tmp_path):
+    """Le ramasse-miettes d'un backup ne supprime pas les blocs d'un backup encore en cours"""
+    _seed(db, sample_employee)
+    first = BackupStore(str(tmp_path), chunk_rows=10)
+    second = BackupStore(str(tmp_path), chunk_rows=7)  # Autre découpage : d'autres blocs
+    paused, resume = threading.Event(), threading.Event()
+    put_object = first.put_object
+
+    def slow_put_object(data):
+        stored = put_object(data)
+        if "Créneau".encode() in data:  # Bloc de créneaux, découpé autrement par le second
+            paused.set()
+            resume.wait(5)
+        return stored
+
+    first.put_object = slow_put_object
+    snapshot_ids = []
+
+    def backup(store):
+        session = TestingSessionLocal()
+        try:
+            snapshot_ids.append(store.create_snapshot(session)["id"])
+            store.collect_garbage()  # Comme après la rétention (qui ne garderait ici que le dernier)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=backup, args=(store,)) for store in (first, second)]
+    threads[0].start()
+    assert paused.wait(5)  # Bloc écrit, manifeste pas encore écrit
+    threads[1].start()
+    threads[1].join(0.5)  # Le second backup attend la fin du premier pour son nettoyage
+    resume.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(snapshot_ids) == 2
+    for snapshot_id in snapshot_ids:
+        assert first.verify(snapshot_id)["ok"]
+
+
+def test_backup_endpoint_writes_snapshot(client: TestClient, db, sample_employee, tmp_path, monkeypatch,
+                                        wait_for_job):
+    monkeypatch.setattr(settings, "backup_dir", str(tmp_path))
+    headers = {"Authorization": f"Bearer {settings.backup_secret}"}
+
+    job = wait_for_job(client.post("/api/v1/backup/backup", headers=headers).json())
+    assert job["status"] == "succeeded"
+    snapshot_id = job["result"]["snapshot"]["id"]
+
+    listing = client.get("/api/v1/backup/snapshots", headers=headers).json()
+    assert [s["id"] for s in listing["snapshots"]] == [snapshot_id]
+    assert listing["store"]["objects"] > 0
+
+    verified = client.get(f"/api/v1/backup/snapshots/{snapshot_id}/verify", headers=headers).json()
+    assert verified["ok"]
+    assert client.get("/api/v1/backup/snapshots/20000101_000000_000000/verify",
+                      headers=headers).status_code == 404
+
+
+def test_incremental_chain_restore(db, sample_employee, tmp_path):
+    """Un incrémental n'exporte que les semaines modifiées et se rejoue sur son parent"""
+    _seed(db, sample_employee, slots=10)
+    other = Week(employee_id=sample_employee.id, kind_id=1, week_start_date=date(2024, 1, 8), meta={})
+    db.add(other)
+    db.commit()
+    simple = SimplePlanningService.create_slot(db, SimpleSlotCreate(
+        employee_id=1, date=date(2024, 1, 2), day_of_week=1, start_time=480, end_time=540,
+        title="Simple", category="o"))
+
+    store = BackupStore(str(tmp_path), chunk_rows=10)
+    full = store.create_snapshot(db, incremental=True)
+    assert full["type"] == "full"
+    assert db.query(ChangeLog).count() == 0  # Journal antérieur au snapshot complet purgé
+
+    WeekService.update_slot(db, 1, SlotUpdate(title="Modifié"))
+    WeekService.delete_slot(db, 2)
+    SimplePlanningService.delete_slot(db, simple.id)
+    incremental = store.create_snapshot(db, incremental=True)
+
+    assert incremental["type"] == "incremental"
+    assert incremental["parent"] == full["id"]
+    sections = {section["table"]: sum(c["rows"] for c in section["chunks"]) for section in incremental["tables"]}
+    assert sections["weeks"] == 1
+    assert sections["slots"] == 9
+    assert sections["employees"] == 0
+    assert incremental["replaced"]["slots"]["ids"] == [1]
+    assert incremental["deleted"]["simple_slots"] == [simple.id]
+    assert db.query(ChangeLog).count() > 0  # Un incrémental ne purge pas
+
+    # Rejouer la chaîne sur une base vidée
+    db.query(Slot).delete()
+    db.commit()
+    store.restore(db, incremental["id"])
+    db.expire_all()
+    assert db.query(Slot).count() == 9
+    assert db.get(Slot, 1).title == "Modifié"
+    assert db.get(Slot, 2) is None
+    assert db.query(SimpleSlot).count() == 0
+    assert db.query(Week).count() == 2
+    assert [entry.table_name for entry in db.query(ChangeLog)] == ["*"]
+
+    # Après une restauration, le journal n'est plus fiable : nouveau snapshot complet
+    assert store.create_snapshot(db, incremental=True)["type"] == "full"
+
+
+def test_incremental_includes_long_transactions(db, sample_employee, tmp_path):
+    """Une transaction ouverte avant un incrémental et validée après part dans le suivant"""
+    _seed(db, sample_employee, slots=3)
+    store = BackupStore(str(tmp_path))
+    store.create_snapshot(db, incremental=True)
+
+    writer = TestingSessionLocal()
+    try:
+        writer.get(Slot, 1).title = "Transaction longue"
+        writer.flush()  # Numéro de changement réservé, pas encore validé
+
+        pending = store.create_snapshot(db, incremental=True)
+        assert pending["replaced"]["slots"]["ids"] == []
+
+        writer.commit()
+    finally:
+        writer.close()
+
+    latest = store.create_snapshot(db, incremental=True)
+    assert latest["parent"] == pending["id"]
+    assert latest["replaced"]["slots"]["ids"] == [1]
+
+
+def test_max_chain_forces_full_snapshot(db, sample_employee, tmp_path):
+    _seed(db, sample_employee, slots=3)
+    store = BackupStore(str(tmp_path))
+    types = [store.create_snapshot(db, incremental=True, max_chain=2)["type"] for _ in range(4)]
+    assert types == ["full", "incremental", "incremental", "full"]
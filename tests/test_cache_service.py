@@ -0,0 +1,78 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from app.models.slot import Slot
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.services.cache_service import CacheService, LRUCacheBackend
+
+
+def test_lru_eviction_and_budget():
+    """Le cache évince l'entrée la moins récemment utilisée"""
+    cache = LRUCacheBackend(max_entries=2, max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"5678")
+    assert cache.get("a") == b"1234"
+
+    cache.set("c", b"90")  # Évince "b", le moins récemment utilisé
+    assert cache.get("b") is None
+    assert cache.get("c") == b"90"
+
+    cache.set("d", b"12345")  # Dépasse le budget en octets
+    stats = cache.stats()
+    assert stats["bytes"] <= 10
+    assert stats["evictions"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+    cache.set("big", b"x" * 11)
+    assert cache.get("big") is None
+
+
+def test_week_detail_cache_invalidation(client: TestClient, db, sample_employee):
+    """La lecture est servie depuis le cache et invalidée par les écritures"""
+    db.add(WeekKind(id=2, kind="current"))
+    week = Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 1, 1), meta={})
+    db.add(week)
+    db.commit()
+    week_id = week.id
+
+    first = client.get(f"/api/v1/weeks/{week_id}")
+    assert first.status_code == 200
+    hits = CacheService.stats()["hits"]
+    assert client.get(f"/api/v1/weeks/{week_id}").json() == first.json()
+    assert CacheService.stats()["hits"] == hits + 1
+
+    slot = {"week_id": week_id, "day_index": 0, "start_min": 540, "duration_min": 60,
+            "title": "Ouverture", "category": "o"}
+    slot_id = client.post(f"/api/v1/weeks/{week_id}/slots", json=slot).json()["id"]
+    assert len(client.get(f"/api/v1/weeks/{week_id}").json()["slots"]) == 1
+
+    client.patch(f"/api/v1/weeks/{week_id}/slots/{slot_id}", json={"duration_min": 120})
+    assert client.get(f"/api/v1/weeks/{week_id}").json()["totals"]["week_total"] == 2.0
+
+    client.delete(f"/api/v1/weeks/{week_id}/slots/{slot_id}")
+    assert client.get(f"/api/v1/weeks/{week_id}").json()["slots"] == []
+
+    client.put(f"/api/v1/weeks/{week_id}", json={"meta": {"opening_hours": "9-22"}})
+    assert client.get(f"/api/v1/weeks/{week_id}").json()["week"]["meta"] == {"opening_hours": "9-22"}
+
+
+def test_week_cache_is_keyed_by_revision(client: TestClient, db, sample_employee):
+    """Une réponse mise en cache pour une révision n'est jamais servie pour une autre"""
+    db.add(WeekKind(id=2, kind="current"))
+    week = Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 1, 1), meta={})
+    db.add(week)
+    db.commit()
+    week_id = week.id
+    client.get(f"/api/v1/weeks/{week_id}")
+
+    # Lecteur lent : construit avant l'écriture, il range son résultat après l'invalidation
+    client.post(f"/api/v1/weeks/{week_id}/slots", json={
+        "week_id": week_id, "day_index": 0, "start_min": 540, "duration_min": 60,
+        "title": "Ouverture", "category": "o"})
+    CacheService.set_week(week_id, 0, b'{"stale": true}')
+
+    response = client.get(f"/api/v1/weeks/{week_id}")
+    assert response.headers["etag"] == f'W/"week-{week_id}-r1"'
+    assert len(response.json()["slots"]) == 1
+    assert CacheService.get_week(week_id, 0) is None  # Remplacée par la révision 1
@@ -76,4 +76,32 @@ def test_get_category_legend():
     for cat in expected_categories:
         assert cat in legend
         assert 'label' in legend[cat]
-        assert 'color' in legend[cat]
\ No newline at end of file
+        assert 'color' in legend[cat]
+
+def test_calculate_batch_totals_matches_per_week():
+    """Le calcul par lots donne les mêmes résultats que les calculs par semaine"""
+    slots_by_week = {
+        1: [
+            Slot(week_id=1, day_index=0, start_min=540, duration_min=120, title="Admin", category="a"),
+            Slot(week_id=1, day_index=2, start_min=600, duration_min=45, title="Rangement", category="m"),
+        ],
+        2: [
+            Slot(week_id=2, day_index=6, start_min=480, duration_min=90, title="Ouverture", category="o"),
+            Slot(week_id=2, day_index=6, start_min=600, duration_min=30, title="Divers", category=None),
+        ],
+        3: [],
+    }
+    all_slots = [slot for slots in slots_by_week.values() for slot in slots]
+
+    columns = CalculationService.slots_to_columns(all_slots)
+    results = CalculationService.calculate_batch_totals(*columns, expected_weeks=slots_by_week.keys())
+
+    assert set(results) == {1, 2, 3}
+    for week_id, slots in slots_by_week.items():
+        totals, repartition = results[week_id]
+        expected_totals = CalculationService.calculate_week_totals(slots)
+        assert totals.per_day == pytest.approx(expected_totals.per_day)
+        assert totals.week_total == pytest.approx(expected_totals.week_total)
+        assert totals.indetermine == pytest.approx(expected_totals.indetermine)
+        assert repartition.model_dump() == pytest.approx(
+            CalculationService.calculate_category_repartition(slots).model_dump())
@@ -0,0 +1,59 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from app.models.simple_slot import SimpleSlot
+from app.models.slot import Slot
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.services.coverage_service import CoverageService
+
+
+def test_build_coverage_counts_each_employee_once():
+    """Un employé compte une fois par quart d'heure, même avec des créneaux qui se chevauchent"""
+    rows = [
+        (1, 0, 540, 660, "o"),
+        (1, 0, 600, 630, "a"),  # Chevauche le créneau précédent
+        (2, 0, 600, 610, "o"),  # Non aligné : étendu au quart d'heure
+    ]
+    coverage = CoverageService.build_coverage(rows, [(540, 720)] + [None] * 6, min_staff=1)
+
+    monday = coverage["staff"][0]
+    assert monday[35:45] == [0, 1, 1, 1, 1, 2, 1, 1, 1, 0]
+    assert coverage["categories"]["a"][0][40:43] == [1, 1, 0]
+    assert [(i.start_min, i.end_min, i.staff) for i in coverage["understaffed"]] == [(660, 720, 0)]
+
+
+def test_parse_opening_hours():
+    assert CoverageService.parse_opening_hours("9-22") == [(540, 1320)] * 7
+    assert CoverageService.parse_opening_hours({"0": "9h30-12h", "6": "10:00-18:00"}) == \
+        [(570, 720), None, None, None, None, None, (600, 1080)]
+    assert CoverageService.parse_opening_hours("fermé") is None
+
+
+def test_coverage_endpoint(client: TestClient, db, sample_employee):
+    """Les créneaux SimpleSlot et Slot de tous les employés sont cumulés, hors semaines types"""
+    monday = date(2024, 3, 4)
+    db.add_all([WeekKind(id=1, kind="type"), WeekKind(id=2, kind="current")])
+    week = Week(employee_id=sample_employee.id, kind_id=2, week_start_date=monday, meta={"opening_hours": "9-12"})
+    template = Week(employee_id=sample_employee.id, kind_id=1, week_start_date=monday, meta={})
+    db.add_all([week, template])
+    db.flush()
+    db.add(Slot(week_id=week.id, day_index=1, start_min=540, duration_min=120, title="Ouverture", category="o"))
+    db.add(Slot(week_id=template.id, day_index=1, start_min=540, duration_min=180, title="Type", category="o"))
+    db.add(SimpleSlot(employee_id=99, date=date(2024, 3, 5), day_of_week=1, start_time=600, end_time=720,
+                      title="Cours", category="e"))
+    db.commit()
+
+    response = client.get("/api/v1/planning/coverage", params={"week_start": "2024-03-04"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["opening_hours"][1] == [540, 720]
+    assert data["staff"][1][36:48] == [1, 1, 1, 1, 2, 2, 2, 2, 1, 1, 1, 1]
+    assert set(data["categories"]) == {"e", "o"}
+    assert {(i["day_index"], i["start_min"], i["end_min"]) for i in data["understaffed"]} == \
+        {(day, 540, 720) for day in (0, 2, 3, 4, 5, 6)}
+
+    response = client.get("/api/v1/planning/coverage", params={"week_start": "2024-03-04", "min_staff": 2})
+    assert [(i["start_min"], i["end_min"], i["staff"]) for i in response.json()["understaffed"] if i["day_index"] == 1] == \
+        [(540, 600, 1), (660, 720, 1)]
+
+    assert client.get("/api/v1/planning/coverage", params={"week_start": "2024-03-05"}).status_code == 400
@@ -0,0 +1,61 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+
+
+def test_week_conditional_get(client: TestClient, db, sample_employee, query_counter):
+    """304 sans chargement des créneaux tant que la semaine ne change pas"""
+    db.add(WeekKind(id=2, kind="current"))
+    week = Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 1, 1), meta={})
+    db.add(week)
+    db.commit()
+    week_id = week.id
+
+    response = client.get(f"/api/v1/weeks/{week_id}")
+    etag = response.headers["ETag"]
+    assert etag.startswith("W/")
+
+    query_counter.clear()
+    response = client.get(f"/api/v1/weeks/{week_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert len(query_counter) == 1
+
+    slot = {"week_id": week_id, "day_index": 0, "start_min": 540, "duration_min": 60,
+            "title": "Ouverture", "category": "o"}
+    client.post(f"/api/v1/weeks/{week_id}/slots", json=slot)
+
+    response = client.get(f"/api/v1/weeks/{week_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["slots"]) == 1
+
+
+def test_planning_conditional_get(client: TestClient, db):
+    """Le planning simple renvoie 304 puis un nouvel ETag après modification"""
+    params = {"employee_id": 1, "week_start": "2024-01-01"}
+    etag = client.get("/api/v1/planning/week", params=params).headers["ETag"]
+
+    response = client.get("/api/v1/planning/week", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    slot = {"employee_id": 1, "date": "2024-01-02", "day_of_week": 1, "start_time": 540,
+            "end_time": 600, "title": "Ouverture", "category": "o"}
+    slot_id = client.post("/api/v1/planning/slots", json=slot).json()["id"]
+    response = client.get("/api/v1/planning/week", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    created_etag = response.headers["ETag"]
+    assert created_etag != etag
+
+    # Une modification dans la même seconde change aussi l'ETag
+    client.put(f"/api/v1/planning/slots/{slot_id}", json={"title": "Fermeture"})
+    response = client.get("/api/v1/planning/week", params=params, headers={"If-None-Match": created_etag})
+    assert response.status_code == 200
+    assert response.json()["slots"][0]["title"] == "Fermeture"
+    created_etag = response.headers["ETag"]
+
+    client.delete(f"/api/v1/planning/slots/{slot_id}")
+    response = client.get("/api/v1/planning/week", params=params, headers={"If-None-Match": created_etag})
+    assert response.status_code == 200
+    assert response.json()["slots"] == []
@@ -0,0 +1,50 @@
+from datetime import date, datetime
+from decimal import Decimal
+from io import BytesIO
+from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+from app.models.note import Note
+from app.models.slot import Slot
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+
+
+def test_export_weeks_xlsx(client: TestClient, db, sample_employee):
+    """Le classeur contient la grille colorée, les totaux et la répartition des semaines filtrées"""
+    db.add(WeekKind(id=2, kind="current"))
+    weeks = [Week(employee_id=sample_employee.id, kind_id=2, week_start_date=start, meta={})
+             for start in (date(2024, 9, 2), date(2025, 9, 1))]
+    db.add_all(weeks)
+    db.flush()
+    db.add_all([
+        Slot(week_id=weeks[0].id, day_index=0, start_min=720, duration_min=60, title="Admin", category="a"),
+        Slot(week_id=weeks[0].id, day_index=0, start_min=540, duration_min=90, title="Ouverture", category="o"),
+        Slot(week_id=weeks[1].id, day_index=3, start_min=600, duration_min=60, title="Cours", category="e"),
+        Note(week_id=weeks[0].id, hours_total=Decimal("3.00")),
+        Note(week_id=weeks[0].id, hours_total=Decimal("1.00")),  # Seule la première note compte
+    ])
+    db.commit()
+
+    response = client.get("/api/v1/weeks/export.xlsx", params={"employee_id": sample_employee.id, "season": 2024})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="planning_test_2024-2025.xlsx"'
+
+    workbook = load_workbook(BytesIO(response.content))
+    assert workbook.sheetnames == ["Planning", "Totaux", "Légende"]
+
+    planning = list(workbook["Planning"].iter_rows(values_only=True))
+    assert len(planning) == 1 + 7  # Une seule semaine dans la saison 2024-2025
+    assert planning[1][:6] == ("Test User", datetime(2024, 9, 2), "Lundi", 2.5, "09:00-10:30 Ouverture",
+                               "12:00-13:00 Admin")
+    assert workbook["Planning"]["E2"].fill.start_color.rgb.endswith("FF2D2D")
+
+    header, row = list(workbook["Totaux"].iter_rows(values_only=True))
+    assert row[header.index("Total")] == 2.5
+    assert row[header.index("Ouverture")] == 1.5
+    assert row[header.index("Heures notées")] == 3.0
+
+    everything = client.get("/api/v1/weeks/export.xlsx")
+    assert len(list(load_workbook(BytesIO(everything.content))["Totaux"].iter_rows())) == 3
+
+    assert client.get("/api/v1/weeks/export.xlsx", params={"employee_id": 999}).status_code == 404
+    assert client.get("/api/v1/weeks/export.xlsx", params={"season": 2024, "from": "2024-01-01"}).status_code == 400
@@ -0,0 +1,47 @@
+from app.models.week_kind import WeekKind
+from app.models.vacation_period import VacationPeriod
+from app.models.app_metadata import AppMetadata
+from app.services import reference_service
+from app.services.init_service import InitService, INIT_MARKER_KEY
+from app.services.reference_service import ReferenceService
+
+
+def test_init_then_fast_path(db, query_counter):
+    """Premier démarrage : tables et données ; ensuite une seule requête"""
+    db.add(WeekKind(id=1, kind="type"))  # Données partielles déjà présentes
+    db.commit()
+
+    InitService.init_reference_data(db)
+    assert [k.kind.value for k in db.query(WeekKind).order_by(WeekKind.id)] == ["type", "current", "next", "vacation"]
+    assert db.query(VacationPeriod).count() == 4
+    assert db.get(AppMetadata, INIT_MARKER_KEY).value == InitService.init_marker()
+
+    query_counter.clear()
+    InitService.init_reference_data(db)
+    assert len(query_counter) == 1
+
+
+def test_stale_marker_reinitializes(db):
+    db.add(AppMetadata(key=INIT_MARKER_KEY, value="obsolete"))
+    db.commit()
+    assert not InitService.is_initialized(db)
+
+    InitService.init_reference_data(db)
+    assert InitService.is_initialized(db)
+    assert db.query(WeekKind).count() == 4
+
+
+def test_unknown_reference_names_do_not_reload_each_time(db, query_counter, monkeypatch):
+    """Un nom inconnu recharge le registre au plus une fois par intervalle"""
+    InitService.init_reference_data(db)
+    assert ReferenceService.kind_id(db, "inconnu") is None
+
+    query_counter.clear()
+    assert ReferenceService.kind_id(db, "inconnu") is None
+    assert ReferenceService.vacation_id(db, "Inconnue") is None
+    assert ReferenceService.kind_id(db, "current") is not None
+    assert query_counter == []
+
+    monkeypatch.setattr(reference_service, "MISS_REFRESH_SECONDS", 0)
+    assert ReferenceService.kind_id(db, "inconnu") is None
+    assert len(query_counter) == 2  # Types et périodes rechargés
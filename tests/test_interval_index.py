@@ -0,0 +1,79 @@
+import pytest
+import random
+from datetime import date
+from app.models.slot import Slot
+from app.models.simple_slot import SimpleSlot
+from app.schemas.simple_slot import SimpleSlotCreate
+from app.services.calculation_service import CalculationService
+from app.services.interval_index import IntervalIndex
+from app.services.simple_planning_service import SimplePlanningService
+
+
+def _brute_force_conflicts(slots, new_slot):
+    """Référence : parcours linéaire de tous les créneaux"""
+    new_end = new_slot.start_min + new_slot.duration_min
+    return [
+        slot for slot in slots
+        if slot.day_index == new_slot.day_index
+        and new_slot.start_min < slot.start_min + slot.duration_min
+        and new_end > slot.start_min
+    ]
+
+
+def test_conflicts_match_brute_force():
+    """L'index renvoie exactement les créneaux trouvés par le parcours linéaire"""
+    rng = random.Random(1234)
+    # Créneaux qui peuvent se chevaucher entre eux (données historiques)
+    slots = [
+        Slot(id=i, week_id=1, day_index=rng.randrange(7), start_min=rng.randrange(0, 1380, 15),
+             duration_min=rng.randrange(15, 300, 15), title=f"Slot {i}", category="o")
+        for i in range(300)
+    ]
+    index = IntervalIndex.for_slots(slots)
+
+    for _ in range(500):
+        probe = Slot(week_id=1, day_index=rng.randrange(7), start_min=rng.randrange(0, 1425, 15),
+                     duration_min=rng.randrange(15, 180, 15), title="Probe", category="p")
+        expected = _brute_force_conflicts(slots, probe)
+        found = index.conflicts(*IntervalIndex.slot_interval(probe))
+
+        assert sorted(s.id for s in found) == sorted(s.id for s in expected)
+        assert CalculationService.check_slot_overlap(slots, probe) == bool(expected)
+
+
+def test_conflicts_bounds_and_exclusion():
+    """Les intervalles adjacents ne se chevauchent pas et l'exclusion est respectée"""
+    slots = [
+        Slot(id=1, week_id=1, day_index=0, start_min=540, duration_min=60, title="A", category="o"),
+        Slot(id=2, week_id=1, day_index=0, start_min=600, duration_min=60, title="B", category="o"),
+        Slot(id=3, week_id=2, day_index=0, start_min=540, duration_min=60, title="C", category="o"),
+    ]
+    index = IntervalIndex.for_slots(slots)
+
+    assert index.conflicts((1, 0), 480, 540) == []
+    assert index.conflicts((1, 0), 660, 720) == []
+    assert [s.title for s in index.conflicts((1, 0), 570, 630)] == ["A", "B"]
+    assert [s.title for s in index.conflicts((1, 0), 570, 630, exclude_id=1)] == ["B"]
+    assert index.conflicts((1, 1), 0, 1440) == []
+
+    assert index.remove((1, 0), slots[0])
+    assert [s.title for s in index.conflicts((1, 0), 570, 630)] == ["B"]
+
+
+def test_simple_planning_reports_all_conflicts(db):
+    """La création d'un créneau liste tous les créneaux en conflit"""
+    day = date(2024, 1, 1)
+    for title, start, end in [("Matin", 480, 600), ("Midi", 600, 720), ("Soir", 1020, 1140)]:
+        db.add(SimpleSlot(employee_id=1, date=day, day_of_week=0, start_time=start,
+                          end_time=end, title=title, category="o"))
+    db.commit()
+
+    slot = SimpleSlotCreate(employee_id=1, date=day, day_of_week=0, start_time=540,
+                            end_time=660, title="Nouveau", category="a")
+    with pytest.raises(ValueError) as exc_info:
+        SimplePlanningService.create_slot(db, slot)
+
+    message = str(exc_info.value)
+    assert "'Matin'" in message
+    assert "'Midi'" in message
+    assert "'Soir'" not in message
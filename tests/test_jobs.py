@@ -0,0 +1,59 @@
+import threading
+import time
+from app.services.job_service import JobService
+
+
+def test_job_cancellation(client, db):
+    """Une tâche s'arrête au prochain point de progression après l'annulation"""
+    started = threading.Event()
+    proceed = threading.Event()
+
+    def task(db, job):
+        started.set()
+        proceed.wait(5)
+        for _ in range(1000):
+            job.advance(rows=1, bytes=10)
+        return {"done": True}
+
+    job = JobService.submit("test", task)
+    assert started.wait(5)
+    assert JobService.get(job.id).status == "running"
+    JobService.cancel(job.id)
+    proceed.set()
+
+    for _ in range(250):
+        if job.finished_at:
+            break
+        time.sleep(0.02)
+    assert job.status == "cancelled"
+    assert job.rows == 1
+    assert job.result is None
+
+
+def test_jobs_run_one_at_a_time(client, db, wait_for_job):
+    """Une tâche attend la fin de la précédente avant de démarrer"""
+    proceed = threading.Event()
+    first = JobService.submit("test", lambda db, job: {"done": proceed.wait(5)})
+    second = JobService.submit("test", lambda db, job: {"first": first.status})
+
+    time.sleep(0.1)
+    assert second.status == "pending"
+    proceed.set()
+    assert wait_for_job({"id": second.id})["result"] == {"first": "succeeded"}
+
+
+def test_job_failure_is_reported(client, db, wait_for_job):
+    def task(db, job):
+        raise RuntimeError("boom")
+
+    job = JobService.submit("test", task)
+    state = wait_for_job({"id": job.id})
+    assert state["status"] == "failed"
+    assert state["error"] == "boom"
+
+
+def test_unknown_job(client):
+    from app.config import settings
+    headers = {"Authorization": f"Bearer {settings.backup_secret}"}
+    assert client.get("/api/v1/backup/jobs/missing", headers=headers).status_code == 404
+    assert client.post("/api/v1/backup/jobs/missing/cancel", headers=headers).status_code == 404
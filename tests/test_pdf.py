@@ -0,0 +1,78 @@
+import re
+from datetime import date
+from io import BytesIO
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.models.employee import Employee
+from app.models.slot import Slot
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.services import pdf_render
+from app.services.pdf_service import PdfService
+
+
+def _page_count(document: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b", document))
+
+
+def test_print_weeks_pdf_uses_page_cache(client: TestClient, db, sample_employee):
+    """Une page par semaine ; seules les semaines modifiées sont rendues à nouveau"""
+    other = Employee(slug="autre", fullname="Autre Employé", active=True)
+    db.add_all([WeekKind(id=2, kind="current"), other])
+    db.flush()
+    weeks = [Week(employee_id=employee_id, kind_id=2, week_start_date=start, meta={})
+             for employee_id, start in ((sample_employee.id, date(2024, 9, 2)), (other.id, date(2024, 9, 2)),
+                                        (sample_employee.id, date(2024, 9, 9)))]
+    db.add_all(weeks)
+    db.flush()
+    db.add_all([
+        Slot(week_id=weeks[0].id, day_index=0, start_min=540, duration_min=90, title="Ouverture", category="o"),
+        Slot(week_id=weeks[0].id, day_index=0, start_min=570, duration_min=60, title="Cours", category="e"),
+        Slot(week_id=weeks[1].id, day_index=4, start_min=1140, duration_min=180, title="Soirée", category="l"),
+    ])
+    db.commit()
+
+    response = client.get("/api/v1/weeks/print.pdf", params={"week_start": "2024-09-02"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-disposition"] == 'inline; filename="planning_2024-09-02.pdf"'
+    assert response.content.startswith(b"%PDF")
+    assert _page_count(response.content) == 2
+
+    conditions = PdfService.week_conditions(db, week_start=date(2024, 9, 2))
+    assert PdfService.write_weeks_pdf(db, BytesIO(), conditions) == (2, 0)  # Tout vient du cache
+
+    client.patch(f"/api/v1/weeks/{weeks[1].id}/slots/{weeks[1].slots[0].id}", json={"duration_min": 60})
+    assert PdfService.write_weeks_pdf(db, BytesIO(), conditions) == (2, 1)
+
+    one = client.get("/api/v1/weeks/print.pdf", params={"employee_id": sample_employee.id})
+    assert _page_count(one.content) == 2
+
+    assert client.get("/api/v1/weeks/print.pdf", params={"employee_id": 999}).status_code == 404
+    assert client.get("/api/v1/weeks/print.pdf", params={"week_start": "2023-01-02"}).status_code == 404
+    assert client.get("/api/v1/weeks/print.pdf", params={"kind": "inconnu"}).status_code == 404
+
+
+def test_print_weeks_pdf_page_limit(client: TestClient, db, sample_employee, monkeypatch):
+    """Au-delà de PDF_MAX_PAGES semaines, l'impression est refusée"""
+    db.add(WeekKind(id=2, kind="current"))
+    db.add_all([Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 9, 2 + 7 * i), meta={})
+                for i in range(3)])
+    db.commit()
+    monkeypatch.setattr(settings, "pdf_max_pages", 2)
+    assert client.get("/api/v1/weeks/print.pdf").status_code == 400
+
+
+def test_render_pages_in_process_pool(monkeypatch):
+    """Le pool de processus rend les mêmes pages que le rendu dans la requête"""
+    legend = {"o": ("Ouverture", "#FF2D2D")}
+    pages = [{"employee": f"Employé {i}", "week_start": date(2024, 9, 2),
+              "slots": [(i % 7, 540, 90, "Ouverture", "o")], "per_day": [1.5] + [0.0] * 6,
+              "week_total": 1.5, "indetermine": 0.0, "repartition": [("o", 1.5)]} for i in range(3)]
+    monkeypatch.setattr(settings, "pdf_workers", 1)
+    monkeypatch.setattr(settings, "pdf_pool_min_pages", 2)
+    try:
+        assert PdfService.render_pages(pages, legend) == pdf_render.render_pages(pages, legend)
+        assert PdfService._executor is not None
+    finally:
+        PdfService.shutdown()
@@ -0,0 +1,53 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from app.models.simple_slot import SimpleSlot
+from tests.conftest import TestingSessionLocal
+
+
+def _create_slot(client, title, start_time):
+    slot = {"employee_id": 1, "date": "2024-01-02", "day_of_week": 1, "start_time": start_time,
+            "end_time": start_time + 60, "title": title, "category": "o"}
+    return client.post("/api/v1/planning/slots", json=slot).json()["id"]
+
+
+def test_changes_since_cursor(client: TestClient, db):
+    """Synchronisation incrémentale : créneaux modifiés et suppressions"""
+    old_id = _create_slot(client, "Ancien", 480)
+    kept_id = _create_slot(client, "Modifié", 600)
+    deleted_id = _create_slot(client, "Supprimé", 720)
+    client.delete(f"/api/v1/planning/slots/{deleted_id}")
+
+    full = client.get("/api/v1/planning/changes").json()
+    assert {s["id"] for s in full["slots"]} == {old_id, kept_id}
+    assert [t["slot_id"] for t in full["deleted"]] == [deleted_id]
+    assert full["cursor"] == 4  # 3 créations et 1 suppression
+
+    client.put(f"/api/v1/planning/slots/{kept_id}", json={"title": "Modifié deux fois"})
+    changes = client.get("/api/v1/planning/changes", params={"since": full["cursor"]}).json()
+    assert [s["title"] for s in changes["slots"]] == ["Modifié deux fois"]
+    assert changes["deleted"] == []
+
+    # Rien de nouveau depuis le dernier curseur
+    latest = client.get("/api/v1/planning/changes", params={"since": changes["cursor"]}).json()
+    assert latest == {"cursor": changes["cursor"], "slots": [], "deleted": []}
+
+
+def test_changes_follow_commit_order(client: TestClient, db):
+    """Une transaction longue validée après la lecture d'un curseur n'est pas perdue"""
+    _create_slot(client, "Avant", 480)
+
+    writer = TestingSessionLocal()
+    try:
+        writer.add(SimpleSlot(employee_id=1, date=date(2024, 1, 3), day_of_week=2, start_time=600,
+                              end_time=660, title="Transaction longue", category="e"))
+        writer.flush()  # Numéro réservé, pas encore validé
+
+        pending = client.get("/api/v1/planning/changes").json()
+        assert [s["title"] for s in pending["slots"]] == ["Avant"]
+
+        writer.commit()
+    finally:
+        writer.close()
+
+    changes = client.get("/api/v1/planning/changes", params={"since": pending["cursor"]}).json()
+    assert [s["title"] for s in changes["slots"]] == ["Transaction longue"]
@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.models.note import Note
+from app.models.simple_slot import SimpleSlot
+from app.models.slot import Slot
+from app.models.vacation_period import VacationPeriod
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+
+
+def test_hours_report(client: TestClient, db, sample_employee):
+    """Les heures sont agrégées par mois, par vacances et comparées aux notes"""
+    employee_id = sample_employee.id
+    db.add_all([WeekKind(id=1, kind="type"), WeekKind(id=2, kind="current"), WeekKind(id=4, kind="vacation"),
+                VacationPeriod(id=3, period="Toussaint")])
+    september = Week(employee_id=employee_id, kind_id=2, week_start_date=date(2024, 9, 30), meta={})
+    toussaint = Week(employee_id=employee_id, kind_id=4, vacation_id=3, week_start_date=date(2024, 10, 21), meta={})
+    template = Week(employee_id=employee_id, kind_id=1, week_start_date=date(2024, 10, 7), meta={})
+    db.add_all([september, toussaint, template])
+    db.flush()
+    db.add_all([
+        Slot(week_id=september.id, day_index=0, start_min=540, duration_min=120, title="Ouverture", category="o"),
+        Slot(week_id=september.id, day_index=2, start_min=540, duration_min=60, title="Admin", category="a"),
+        Slot(week_id=toussaint.id, day_index=0, start_min=540, duration_min=240, title="Stage", category="e"),
+        Slot(week_id=template.id, day_index=0, start_min=540, duration_min=600, title="Type", category="o"),
+        Note(week_id=september.id, hours_total=Decimal("2.50")),
+        SimpleSlot(employee_id=employee_id, date=date(2024, 10, 2), day_of_week=2, start_time=600, end_time=690,
+                   title="Cours", category="e"),
+    ])
+    db.commit()
+
+    response = client.get("/api/v1/reports/hours", params={"from": "2024-09-01", "to": "2024-10-31"})
+    assert response.status_code == 200
+    [report] = response.json()["employees"]
+    assert report["hours"] == 8.5
+    assert report["categories"] == {"a": 1.0, "e": 5.5, "o": 2.0}
+    assert report["noted_hours"] == 2.5
+    assert report["difference"] == 0.5
+    # Le créneau simple du 2 octobre compte dans la semaine du lundi 30 septembre
+    assert [(p["period"], p["hours"]) for p in report["periods"]] == [("2024-09", 4.5), ("2024-10", 4.0)]
+    assert [(p["period"], p["hours"], p["noted_hours"]) for p in report["vacations"]] == [("Toussaint", 4.0, None)]
+
+    weekly = client.get("/api/v1/reports/hours", params={"from": "2024-09-01", "to": "2024-10-31", "period": "week"})
+    assert [(p["period"], p["hours"]) for p in weekly.json()["employees"][0]["periods"]] == \
+        [("2024-09-30", 4.5), ("2024-10-21", 4.0)]
+
+    assert client.get("/api/v1/reports/hours", params={"from": "2024-10-31", "to": "2024-09-01"}).status_code == 400
+    assert client.get("/api/v1/reports/hours", params={"from": "2024-09-01", "to": "2024-10-31",
+                                                       "period": "year"}).status_code == 400
+
+
+def test_hours_report_counts_one_note_per_week(client: TestClient, db, sample_employee):
+    """Une semaine à plusieurs notes compte une fois, avec sa première note (comme l'API)"""
+    db.add(WeekKind(id=2, kind="current"))
+    week = Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 9, 30), meta={})
+    unnoted = Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 10, 7), meta={})
+    db.add_all([week, unnoted])
+    db.flush()
+    db.add_all([
+        Slot(week_id=week.id, day_index=0, start_min=540, duration_min=120, title="Ouverture", category="o"),
+        Note(week_id=week.id, hours_total=Decimal("2.00")),
+        Note(week_id=week.id, hours_total=Decimal("1.00")),
+        # Première note sans heures : semaine non notée, la note suivante est ignorée
+        Slot(week_id=unnoted.id, day_index=0, start_min=540, duration_min=60, title="Ouverture", category="o"),
+        Note(week_id=unnoted.id, hours_total=None),
+        Note(week_id=unnoted.id, hours_total=Decimal("5.00")),
+    ])
+    db.commit()
+
+    response = client.get("/api/v1/reports/hours", params={"from": "2024-09-01", "to": "2024-10-31"})
+    [report] = response.json()["employees"]
+    assert report["hours"] == 3.0
+    assert report["noted_hours"] == 2.0
+    assert report["difference"] == 0.0
+    assert client.get(f"/api/v1/weeks/{week.id}").json()["notes"]["hours_total"] == "2.00"
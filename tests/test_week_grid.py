@@ -0,0 +1,76 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from app.models.slot import Slot
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.services.calculation_service import CalculationService
+from app.services.week_grid import WeekGrid
+
+
+def _sample_slots():
+    return [
+        Slot(day_index=0, start_min=540, duration_min=120, title="Ouverture", category="o"),  # 9h-11h
+        Slot(day_index=0, start_min=720, duration_min=60, title="Admin", category="a"),       # 12h-13h
+        Slot(day_index=2, start_min=600, duration_min=45, title="Rangement", category="m"),   # 10h-10h45
+    ]
+
+
+def test_grid_overlap_and_occupancy():
+    """Chevauchements et occupation calculés sur les bits"""
+    grid = WeekGrid.from_slots(_sample_slots())
+
+    assert grid.overlaps(0, 600, 60)
+    assert not grid.overlaps(0, 660, 60)
+    assert not grid.overlaps(1, 540, 120)
+    assert grid.occupancy(0) == 180
+    assert grid.occupancy(2) == 45
+
+
+def test_grid_free_gaps():
+    """Plages libres dans une fenêtre d'ouverture"""
+    grid = WeekGrid.from_slots(_sample_slots())
+
+    assert grid.free_gaps(0, 480, 840) == [(480, 60), (660, 60), (780, 60)]
+    assert grid.free_gaps(0, 480, 840, min_duration=90) == []
+    assert grid.free_gaps(1) == [(0, 1440)]
+
+
+def test_grid_category_minutes_match_repartition():
+    """Les minutes par catégorie correspondent à la répartition calculée"""
+    slots = _sample_slots()
+    grid = WeekGrid.from_slots(slots)
+    repartition = CalculationService.calculate_category_repartition(slots)
+
+    for code, minutes in grid.category_minutes().items():
+        assert minutes / 60.0 == getattr(repartition, code)
+
+
+def test_week_grid_endpoints(client: TestClient, db, sample_employee):
+    """Endpoints de grille et de plages libres"""
+    db.add(WeekKind(id=2, kind="current"))
+    week = Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 1, 1), meta={})
+    db.add(week)
+    db.flush()
+    for slot in _sample_slots():
+        slot.week_id = week.id
+        db.add(slot)
+    db.commit()
+
+    response = client.get(f"/api/v1/weeks/{week.id}/grid")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["resolution_min"] == 15
+    assert data["days"][0][36:44] == "oooooooo"
+    assert data["days"][1] == "." * 96
+    assert data["categories"]["m"] == 45
+
+    response = client.get(f"/api/v1/weeks/{week.id}/free-slots",
+                          params={"day_index": 0, "start_min": 480, "end_min": 840})
+    assert response.status_code == 200
+    assert response.json() == [
+        {"day_index": 0, "start_min": 480, "duration_min": 60},
+        {"day_index": 0, "start_min": 660, "duration_min": 60},
+        {"day_index": 0, "start_min": 780, "duration_min": 60},
+    ]
+
+    assert client.get("/api/v1/weeks/9999/grid").status_code == 404
@@ -0,0 +1,241 @@
+from datetime import date, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.models.vacation_period import VacationPeriod
+from app.models.slot import Slot
+from app.models.note import Note
+from tests.conftest import engine
+
+
+def _seed_weeks(db, employee, count, first_week=0):
+    """Crée `count` semaines avec créneaux et note pour l'employé"""
+    if not db.query(WeekKind).count():
+        db.add(WeekKind(id=1, kind="type"))
+        db.add(WeekKind(id=2, kind="current"))
+        db.commit()
+
+    monday = date(2024, 1, 1)
+    for i in range(count):
+        week = Week(
+            employee_id=employee.id,
+            kind_id=2,
+            week_start_date=monday + timedelta(weeks=first_week + i),
+            meta={}
+        )
+        db.add(week)
+        db.flush()
+        db.add(Slot(week_id=week.id, day_index=0, start_min=540, duration_min=120, title="Ouverture", category="o"))
+        db.add(Slot(week_id=week.id, day_index=1, start_min=600, duration_min=60, title="Rangement", category="m"))
+        db.add(Note(week_id=week.id, comments=f"Semaine {i}"))
+    db.commit()
+
+
+def test_get_weeks_constant_query_count(client: TestClient, db, sample_employee, query_counter):
+    """Le listing des semaines fait un nombre constant de requêtes"""
+    employee_id = sample_employee.id
+    _seed_weeks(db, sample_employee, 2)
+    query_counter.clear()
+    response = client.get("/api/v1/weeks/", params={"employee_id": employee_id})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    small_count = len(query_counter)
+
+    _seed_weeks(db, sample_employee, 10, first_week=2)
+    query_counter.clear()
+    response = client.get("/api/v1/weeks/", params={"employee_id": employee_id})
+    assert response.status_code == 200
+    assert len(response.json()) == 12
+    assert len(query_counter) == small_count
+    assert small_count <= 3
+
+
+def test_get_weeks_matches_week_details(client: TestClient, db, sample_employee):
+    """Le listing par lots renvoie les mêmes données que le détail d'une semaine"""
+    _seed_weeks(db, sample_employee, 3)
+
+    listing = client.get("/api/v1/weeks/", params={"kind": "current"}).json()
+    assert len(listing) == 3
+
+    for item in listing:
+        detail = client.get(f"/api/v1/weeks/{item['week']['id']}").json()
+        assert item == detail
+        assert item["totals"]["week_total"] == 3.0
+        assert item["totals"]["indetermine"] == 1.0
+        assert item["notes"]["comments"].startswith("Semaine")
+
+
+def test_slot_batch_single_commit(client: TestClient, db, sample_employee):
+    """Un lot de 50 créneaux est appliqué en un seul appel et un seul commit"""
+    _seed_weeks(db, sample_employee, 1)
+    week = db.query(Week).first()
+    week_id = week.id
+    existing = [slot.id for slot in week.slots]
+
+    batch = {
+        "create": [
+            {"day_index": i % 7, "start_min": 720 + (i // 7) * 15, "duration_min": 15,
+             "title": f"Créneau {i}", "category": "l"}
+            for i in range(50)
+        ],
+        "update": [{"id": existing[0], "start_min": 480}],
+        "delete": [existing[1]],
+    }
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(engine, "commit", on_commit)
+    try:
+        response = client.post(f"/api/v1/weeks/{week_id}/slots:batch", json=batch)
+    finally:
+        event.remove(engine, "commit", on_commit)
+    assert response.status_code == 200
+    assert len(commits) == 1
+
+    data = response.json()
+    assert len(data["slots"]) == 51
+    assert {"start_min": 480, "title": "Ouverture"}.items() <= next(
+        s for s in data["slots"] if s["id"] == existing[0]
+    ).items()
+    assert all(s["id"] != existing[1] for s in data["slots"])
+
+
+def test_slot_batch_rejects_overlaps(client: TestClient, db, sample_employee):
+    """Un lot invalide n'écrit rien et liste les conflits"""
+    _seed_weeks(db, sample_employee, 1)
+    week_id = db.query(Week).first().id
+
+    batch = {
+        "create": [
+            {"day_index": 0, "start_min": 600, "duration_min": 60, "title": "Conflit", "category": "a"},
+            {"day_index": 3, "start_min": 600, "duration_min": 60, "title": "Libre", "category": "a"},
+        ],
+    }
+    response = client.post(f"/api/v1/weeks/{week_id}/slots:batch", json=batch)
+    assert response.status_code == 400
+    assert "'Conflit' overlaps 'Ouverture'" in response.json()["detail"]
+
+    detail = client.get(f"/api/v1/weeks/{week_id}").json()
+    assert len(detail["slots"]) == 2
+
+    response = client.post(f"/api/v1/weeks/{week_id}/slots:batch", json={"delete": [9999]})
+    assert response.status_code == 400
+    assert client.post("/api/v1/weeks/9999/slots:batch", json={}).status_code == 404
+
+
+def test_instantiate_weeks_from_type_week(client: TestClient, db, sample_employee):
+    """Les semaines générées reprennent les créneaux de la semaine type"""
+    db.add(WeekKind(id=1, kind="type"))
+    db.add(WeekKind(id=2, kind="current"))
+    template = Week(employee_id=sample_employee.id, kind_id=1, week_start_date=date(2024, 1, 1),
+                    meta={"opening_hours": "9-22"})
+    db.add(template)
+    db.flush()
+    db.add(Slot(week_id=template.id, day_index=0, start_min=540, duration_min=120, title="Ouverture", category="o"))
+    db.add(Slot(week_id=template.id, day_index=4, start_min=600, duration_min=60, title="Admin", category="a"))
+    db.add(Note(week_id=template.id, comments="Semaine type"))
+    db.commit()
+    employee_id = sample_employee.id
+
+    mondays = [(date(2024, 9, 2) + timedelta(weeks=i)).isoformat() for i in range(12)]
+    payload = {"week_starts": mondays, "employee_ids": [employee_id], "copy_notes": True}
+    response = client.post("/api/v1/weeks/instantiate", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["created"]) == 12
+    assert data["slots_created"] == 24
+    assert data["created"][0]["meta"] == {"opening_hours": "9-22"}
+
+    week = client.get(f"/api/v1/weeks/{data['created'][0]['id']}").json()
+    assert [s["title"] for s in sorted(week["slots"], key=lambda s: s["day_index"])] == ["Ouverture", "Admin"]
+    assert week["notes"]["comments"] == "Semaine type"
+    assert week["totals"]["week_total"] == 3.0
+
+    # Relancer la génération ne crée pas de doublons
+    response = client.post("/api/v1/weeks/instantiate", json=payload)
+    assert response.json()["created"] == []
+    assert response.json()["skipped"] == 12
+
+    payload["week_starts"] = ["2024-09-03"]
+    assert client.post("/api/v1/weeks/instantiate", json=payload).status_code == 400
+
+
+def test_week_kind_filters_use_reference_registry(client: TestClient, db, sample_employee, query_counter):
+    """Les filtres par type utilisent les IDs réels, sans jointure sur week_kind"""
+    db.add(WeekKind(id=10, kind="current"))
+    db.add(WeekKind(id=20, kind="next"))
+    db.add(VacationPeriod(id=7, period="Ete"))
+    db.commit()
+    employee_id = sample_employee.id
+
+    response = client.post("/api/v1/weeks/", json={
+        "employee_id": employee_id, "kind": "next", "vacation": "Ete", "week_start_date": "2024-07-01"
+    })
+    assert response.status_code == 200
+    assert response.json()["week"]["kind_id"] == 20
+    assert response.json()["week"]["vacation_id"] == 7
+
+    query_counter.clear()
+    weeks = client.get("/api/v1/weeks/", params={"kind": "next", "vacation": "Ete"}).json()
+    assert [w["week"]["kind_id"] for w in weeks] == [20]
+    assert not any("week_kind" in statement or "vacation_period" in statement for statement in query_counter)
+    assert client.get("/api/v1/weeks/", params={"kind": "current"}).json() == []
+    assert client.get("/api/v1/weeks/", params={"kind": "unknown"}).json() == []
+
+
+def test_weeks_cursor_pagination(client: TestClient, db, sample_employee):
+    """Les semaines sont paginées par curseur et filtrables par plage de dates"""
+    employee_id = sample_employee.id
+    _seed_weeks(db, sample_employee, 5)
+
+    seen, cursor = [], None
+    while True:
+        params = {"employee_id": employee_id, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/weeks/", params=params)
+        assert response.status_code == 200
+        seen += [w["week"]["week_start_date"] for w in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [(date(2024, 1, 1) + timedelta(weeks=i)).isoformat() for i in range(5)]
+
+    response = client.get("/api/v1/weeks/", params={"from": "2024-01-08", "to": "2024-01-22"})
+    assert [w["week"]["week_start_date"] for w in response.json()] == ["2024-01-08", "2024-01-15", "2024-01-22"]
+    assert client.get("/api/v1/weeks/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_employees_cursor_pagination(client: TestClient, db):
+    """Les employés sont paginés par curseur sur l'ID"""
+    from app.models.employee import Employee
+    db.add_all([Employee(slug=f"e{i}", fullname=f"Employee {i}", active=True) for i in range(5)])
+    db.commit()
+
+    first = client.get("/api/v1/employees/", params={"limit": 3})
+    second = client.get("/api/v1/employees/", params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]})
+    assert [e["slug"] for e in first.json() + second.json()] == [f"e{i}" for i in range(5)]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_get_weeks_ndjson_stream(client: TestClient, db, sample_employee):
+    """Accept: application/x-ndjson renvoie une WeekResponse par ligne, sans pagination"""
+    import json
+    from app.services import week_service
+
+    employee_id = sample_employee.id
+    _seed_weeks(db, sample_employee, 5)
+    expected = client.get("/api/v1/weeks/", params={"employee_id": employee_id}).json()
+
+    week_service.STREAM_YIELD_PER, previous = 2, week_service.STREAM_YIELD_PER  # Plusieurs lots
+    try:
+        response = client.get("/api/v1/weeks/", params={"employee_id": employee_id},
+                              headers={"Accept": "application/x-ndjson"})
+    finally:
+        week_service.STREAM_YIELD_PER = previous
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
@@ -0,0 +1,95 @@
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from app.config import settings
+from app.models.simple_slot import SimpleSlot
+from app.models.week import Week
+from app.models.week_kind import WeekKind
+from app.models.week_summary import WeekSummary
+from app.services.summary_service import SummaryService
+
+
+def _summary(db, **filters) -> WeekSummary:
+    db.expire_all()
+    return db.query(WeekSummary).filter_by(**filters).one()
+
+
+def test_slot_writes_update_summary(client: TestClient, db, sample_employee):
+    """Chaque écriture de créneau applique son delta au résumé de la semaine"""
+    db.add(WeekKind(id=2, kind="current"))
+    week = Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 1, 1), meta={})
+    db.add(week)
+    db.commit()
+    week_id = week.id
+    assert _summary(db, week_id=week_id).slot_count == 0
+
+    slot = {"week_id": week_id, "day_index": 1, "start_min": 540, "duration_min": 90,
+            "title": "Ouverture", "category": "o"}
+    slot_id = client.post(f"/api/v1/weeks/{week_id}/slots", json=slot).json()["id"]
+    client.post(f"/api/v1/weeks/{week_id}/slots", json={**slot, "start_min": 720, "category": "m"})
+    summary = _summary(db, week_id=week_id)
+    assert (summary.day1_min, summary.o_min, summary.m_min, summary.total_min, summary.slot_count) == \
+        (180, 90, 90, 180, 2)
+
+    client.patch(f"/api/v1/weeks/{week_id}/slots/{slot_id}", json={"day_index": 3, "category": "a"})
+    summary = _summary(db, week_id=week_id)
+    assert (summary.day1_min, summary.day3_min, summary.o_min, summary.a_min) == (90, 90, 0, 90)
+
+    client.delete(f"/api/v1/weeks/{week_id}/slots/{slot_id}")
+    summary = _summary(db, week_id=week_id)
+    assert (summary.day3_min, summary.a_min, summary.total_min, summary.slot_count) == (0, 0, 90, 1)
+
+    totals = client.get(f"/api/v1/weeks/{week_id}").json()["totals"]
+    assert totals == {"per_day": [0.0, 1.5, 0.0, 0.0, 0.0, 0.0, 0.0], "week_total": 1.5, "indetermine": 1.5}
+    assert SummaryService.check(db).stale == 0
+
+
+def test_simple_slot_writes_update_summary(client: TestClient, db, sample_employee):
+    """Les créneaux simples sont résumés par employé et par lundi"""
+    slot = {"employee_id": sample_employee.id, "date": "2024-01-03", "day_of_week": 2,
+            "start_time": 600, "end_time": 660, "title": "Cours", "category": "e"}
+    slot_id = client.post("/api/v1/planning/slots", json=slot).json()["id"]
+    summary = _summary(db, employee_id=sample_employee.id, week_start_date=date(2024, 1, 1))
+    assert (summary.week_id, summary.day2_min, summary.e_min, summary.slot_count) == (None, 60, 60, 1)
+
+    # Déplacé dans la semaine suivante
+    slot_row = db.get(SimpleSlot, slot_id)
+    slot_row.date, slot_row.day_of_week = date(2024, 1, 9), 1
+    db.commit()
+    summary = _summary(db, employee_id=sample_employee.id, week_start_date=date(2024, 1, 8))
+    assert (summary.day1_min, summary.e_min) == (60, 60)
+    assert db.query(WeekSummary).count() == 1  # Semaine vidée : plus de résumé
+
+    client.delete(f"/api/v1/planning/slots/{slot_id}")
+    db.expire_all()
+    assert db.query(WeekSummary).count() == 0
+
+
+def test_summary_check_and_repair(client: TestClient, db, sample_employee):
+    """Le vérificateur détecte les résumés faux, absents ou orphelins et les reconstruit"""
+    db.add(WeekKind(id=2, kind="current"))
+    weeks = [Week(employee_id=sample_employee.id, kind_id=2, week_start_date=date(2024, 1, 1 + 7 * i), meta={})
+             for i in range(3)]
+    db.add_all(weeks)
+    db.commit()
+    for week in weeks:
+        client.post(f"/api/v1/weeks/{week.id}/slots", json={
+            "week_id": week.id, "day_index": 0, "start_min": 540, "duration_min": 60,
+            "title": "Ouverture", "category": "o"})
+    client.post("/api/v1/planning/slots", json={
+        "employee_id": sample_employee.id, "date": "2024-02-05", "day_of_week": 0,
+        "start_time": 600, "end_time": 660, "title": "Cours", "category": "e"})
+
+    headers = {"Authorization": f"Bearer {settings.backup_secret}"}
+    clean = client.post("/api/v1/reports/summaries/check", headers=headers).json()
+    assert clean == {"checked": 4, "missing": 0, "stale": 0, "orphaned": 0, "repaired": False}
+
+    db.execute(update(WeekSummary).where(WeekSummary.week_id == weeks[0].id).values(o_min=5))
+    db.query(WeekSummary).filter(WeekSummary.week_id == weeks[1].id).delete()
+    db.add(WeekSummary(employee_id=sample_employee.id, week_start_date=date(2023, 1, 2), slot_count=1))
+    db.commit()
+
+    assert client.post("/api/v1/reports/summaries/check").status_code == 403
+    report = client.post("/api/v1/reports/summaries/check", params={"repair": True}, headers=headers).json()
+    assert report == {"checked": 4, "missing": 1, "stale": 1, "orphaned": 1, "repaired": True}
+    assert SummaryService.check(db).model_dump() == clean